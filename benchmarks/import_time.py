@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Import-time regression guard for the program's entry points.
+
+Runs each entry point's imports in a fresh interpreter under
+``python -X importtime`` and checks that
+
+  * heavy optional modules stay out of entry points that do not need
+    them (e.g. the CLI must not pull in Flask, sklearn or pandas), and
+  * the total import time stays under a per-entry-point budget.
+
+Usage:
+    python benchmarks/import_time.py            # check all entry points
+    python benchmarks/import_time.py --top 15   # also list slowest imports
+    python benchmarks/import_time.py --budget-scale 2  # looser budgets on slow CI
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (statement, forbidden top-level packages, budget in ms)
+ENTRY_POINTS = {
+    "cli": (
+        "import main, src.data.collector, src.analysis.technical, src.forecast.predictor; "
+        "src.forecast.predictor.load_model()",
+        {"flask", "werkzeug", "sklearn", "scipy", "pandas", "streamlit", "joblib"},
+        400,
+    ),
+    "web": (
+        "import main, src.web.app",
+        {"sklearn", "scipy", "pandas", "streamlit"},
+        700,
+    ),
+    "asgi": (
+        "import main, src.web.asgi",
+        {"sklearn", "scipy", "pandas", "streamlit"},
+        900,
+    ),
+}
+
+REPEAT = 3
+
+
+def _run_importtime(statement: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, name) rows for ``statement``."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # The name column keeps its nesting indentation after one separator space
+        rows.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+    return rows
+
+
+def _measure(statement: str, baseline: set[str]) -> tuple[float, set[str], list[tuple[int, str]]]:
+    """Best-of-N total ms for imports not already loaded at startup."""
+    best_ms = float("inf")
+    modules: set[str] = set()
+    slowest: list[tuple[int, str]] = []
+    for _ in range(REPEAT):
+        rows = _run_importtime(statement)
+        # Top-level entries (no indentation) carry the cumulative cost
+        total_us = sum(
+            cumulative for _, cumulative, name in rows
+            if not name.startswith(" ") and name.strip() not in baseline
+        )
+        if total_us / 1000 < best_ms:
+            best_ms = total_us / 1000
+            modules = {name.strip() for _, _, name in rows}
+            slowest = sorted(((s, n.strip()) for s, _, n in rows), reverse=True)
+    return best_ms, modules, slowest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports per entry point")
+    args = parser.parse_args()
+
+    baseline = {name.strip() for _, _, name in _run_importtime("pass")}
+    failures = 0
+
+    for entry, (statement, forbidden, budget_ms) in ENTRY_POINTS.items():
+        total_ms, modules, slowest = _measure(statement, baseline)
+        budget = budget_ms * args.budget_scale
+        leaked = sorted(pkg for pkg in forbidden if pkg in modules)
+        ok = total_ms <= budget and not leaked
+        failures += not ok
+
+        print(f"{entry:<6} {total_ms:8.1f} ms  (budget {budget:.0f} ms)  {'OK' if ok else 'FAIL'}")
+        if leaked:
+            print(f"       unexpected imports: {', '.join(leaked)}")
+        for self_us, name in slowest[:args.top]:
+            print(f"       {self_us / 1000:8.1f} ms  {name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
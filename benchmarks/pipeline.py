@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Throughput benchmarks for the fetch -> analyze -> predict -> serve pipeline.
+
+Every stage runs on synthetic MarketData (``DATA_SOURCE=synthetic``), so
+results need no network and are the same from run to run. Each stage is
+timed at several universe sizes. The best of a few runs is compared
+with the stored baseline, and the script exits with 1 if any stage got
+slower than the tolerance allows.
+
+Stages:
+  fetch                  collector.refresh_multiple (includes synthetic generation)
+  analyze                analyze() per symbol
+  analyze_multiple       analyze_multiple() on the whole universe
+  _rule_based_forecast   _rule_based_forecast() per symbol
+  predict_multiple       predict_multiple() on the whole universe (rule engine)
+  _extract_features      _extract_features() per symbol
+  overview_json          UniverseSnapshot build, overview rows, version tracking and JSON encoding
+  flask_overview         GET /api/overview through the Flask test client
+  flask_analyze          GET /api/analyze through the Flask test client, one per symbol
+  backtest               run_backtest() over BACKTEST_DAYS daily snapshots per symbol
+
+Baselines are machine specific; record one on the machine that runs the
+comparison (e.g. the CI runner) with --save.
+
+--check skips the timings and runs correctness checks instead: the
+vectorized rule engine (_rule_based_forecast_batch, also used by the
+backtester) must return exactly what _rule_based_forecast does, on
+randomized indicator sets that include missing values and every rule
+threshold; and snapshots queued in the history store by a one-shot
+process must be in SQLite after it exits.
+
+Usage:
+    python benchmarks/pipeline.py                       # compare with the stored baseline
+    python benchmarks/pipeline.py --sizes 16,1000       # subset of universe sizes
+    python benchmarks/pipeline.py --stages analyze,predict_multiple
+    python benchmarks/pipeline.py --save                # record a new baseline
+    python benchmarks/pipeline.py --tolerance 0.25      # fail on a 25% slowdown (default 50%)
+    python benchmarks/pipeline.py --check               # correctness checks, no timings
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Offline, deterministic and side-effect free; must be set before src.config loads
+os.environ.update({
+    "DATA_SOURCE": "synthetic",
+    "SYNTHETIC_SEED": "0",
+    "HISTORY_ENABLED": "false",
+    "PREFETCH_ENABLED": "false",
+    "FORECAST_MODE": "rules",
+    "SCREENER_CACHE_PATH": "",
+})
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [16, 1_000, 10_000, 100_000]
+
+# Distinct synthetic symbols; larger universes reuse their indicator sets
+# under new names so 100k symbols fit in memory
+DISTINCT = 4_096
+
+# Stages that issue one request per symbol are capped at this size
+ROUND_TRIP_MAX = 10_000
+
+# Randomized inputs compared by --check
+CHECK_SAMPLES = 20_000
+
+# Values each rule input is compared against (plus equality with its pair)
+CHECK_BOUNDARIES = {
+    "RSI": [30, 50, 70],
+    "Stoch.K": [20, 80],
+    "ADX": [25],
+    "CCI20": [-100, 100],
+}
+
+# Days of snapshots per symbol in the backtest stage, capped at BACKTEST_MAX symbols
+BACKTEST_DAYS = 252
+BACKTEST_MAX = 1_000
+
+# Fast stages are warmed up once, then rerun for at least MIN_RUNS runs
+# and MIN_SECONDS in total; a stage slower than SLOW_RUN_SECONDS runs once
+MIN_RUNS = 5
+MIN_SECONDS = 0.5
+MAX_RUNS = 10_000
+SLOW_RUN_SECONDS = 1.0
+
+_items_cache: list = []
+
+
+def _universe(n: int) -> dict[str, tuple[str, str]]:
+    from src.data.sources import synthetic_universe
+
+    return synthetic_universe(n)
+
+
+def _market_data(n: int) -> dict:
+    """key -> MarketData for an ``n``-symbol universe."""
+    from src.data.collector import refresh_multiple
+
+    if len(_items_cache) < min(n, DISTINCT):
+        distinct = _universe(DISTINCT)
+        _items_cache[:] = list(refresh_multiple(distinct, "1d").values())
+
+    results = {}
+    for i, key in enumerate(_universe(n)):
+        base = _items_cache[i % len(_items_cache)]
+        results[key] = base if i < len(_items_cache) else replace(base, symbol=key, name=key)
+    return results
+
+
+def _install_snapshot(n: int) -> dict[str, tuple[str, str]]:
+    """Put an ``n``-symbol prefetch snapshot in place and expose it as category 'bench'."""
+    from src.data.symbols import SymbolRegistry, set_registry
+    from src.analysis.technical import analyze_multiple
+    from src.forecast.predictor import predict_multiple
+    from src.service import prefetch
+
+    universe = _universe(n)
+    market_data = _market_data(n)
+    analyses = analyze_multiple(market_data)
+    forecasts = predict_multiple(market_data)
+    entries = {
+        key: prefetch.SymbolSnapshot(key, universe[key][0], market_data[key], analyses[key], forecasts[key])
+        for key in market_data
+    }
+    set_registry(SymbolRegistry.from_config({"bench": universe}))
+    prefetch.store.put(prefetch.IntervalSnapshot(interval="1d", updated_at=time.time(), entries=entries))
+    return universe
+
+
+# ── Stages: setup(n) returns the zero-argument callable to time ──
+
+def _stage_fetch(n: int):
+    from src.data.collector import refresh_multiple
+
+    universe = _universe(n)
+    return lambda: refresh_multiple(universe, "1d")
+
+
+def _stage_analyze(n: int):
+    from src.analysis.technical import analyze
+
+    items = list(_market_data(n).values())
+    return lambda: [analyze(data) for data in items]
+
+
+def _stage_analyze_multiple(n: int):
+    from src.analysis.technical import analyze_multiple
+
+    market_data = _market_data(n)
+    return lambda: analyze_multiple(market_data)
+
+
+def _stage_rule_based_forecast(n: int):
+    from src.forecast.predictor import _rule_based_forecast
+
+    items = list(_market_data(n).values())
+    return lambda: [_rule_based_forecast(data) for data in items]
+
+
+def _stage_predict_multiple(n: int):
+    from src.forecast.predictor import predict_multiple
+
+    market_data = _market_data(n)
+    return lambda: predict_multiple(market_data)
+
+
+def _stage_extract_features(n: int):
+    from src.forecast.predictor import _extract_features
+
+    items = list(_market_data(n).values())
+    return lambda: [_extract_features(data) for data in items]
+
+
+def _stage_overview_json(n: int):
+    from src.analysis.technical import analyze_multiple
+    from src.forecast.predictor import predict_multiple
+    from src.service.universe import UniverseSnapshot
+    from src.web.app import _overview_payload
+
+    tv_symbols = {key: tv_symbol for key, (tv_symbol, _) in _universe(n).items()}
+    market_data = _market_data(n)
+    analyses = analyze_multiple(market_data)
+    forecasts = predict_multiple(market_data)
+
+    def run():
+        snapshot = UniverseSnapshot.build(tv_symbols, market_data, analyses, forecasts, "1d")
+        payload, _ = _overview_payload("1d:bench", snapshot.rows(), None, None, snapshot.row_hashes())
+        return json.dumps(payload)
+
+    return run
+
+
+def _stage_flask_overview(n: int):
+    from src.web.app import app
+
+    _install_snapshot(n)
+    client = app.test_client()
+
+    def run():
+        response = client.get("/api/overview?interval=1d&category=bench")
+        assert response.status_code == 200, response.status_code
+        return response.data
+
+    return run
+
+
+def _stage_flask_analyze(n: int):
+    from src.web.app import app
+
+    universe = _install_snapshot(n)
+    client = app.test_client()
+    urls = [f"/api/analyze?interval=1d&symbol={tv_symbol}" for tv_symbol, _ in universe.values()]
+
+    def run():
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+
+    return run
+
+
+def _stage_backtest(n: int):
+    from src.forecast.backtest import SnapshotPanel, run_backtest
+    from src.forecast.predictor import _COL, _build_feature_matrix
+
+    items = list(_market_data(n).values())
+    rng = np.random.default_rng(0)
+    # Each symbol's snapshot repeated daily, with a random walk on the close
+    X = np.repeat(_build_feature_matrix(items), BACKTEST_DAYS, axis=0)
+    walk = np.cumsum(rng.normal(0, 0.02, (len(items), BACKTEST_DAYS)), axis=1).ravel()
+    X[:, _COL["close"]] *= np.exp(walk)
+    panel = SnapshotPanel(
+        tv_symbols=np.repeat(np.array([f"BENCH:{data.symbol}" for data in items]), BACKTEST_DAYS),
+        ts=np.tile(np.arange(BACKTEST_DAYS) * 86400.0, len(items)),
+        X=X,
+        summaries=np.repeat(np.array([data.summary.get("RECOMMENDATION", "NEUTRAL") for data in items]), BACKTEST_DAYS),
+    )
+    return lambda: run_backtest(panel, horizon_days=5)
+
+
+# name -> (setup, largest size it runs at)
+STAGES = {
+    "fetch": (_stage_fetch, None),
+    "analyze": (_stage_analyze, None),
+    "analyze_multiple": (_stage_analyze_multiple, None),
+    "_rule_based_forecast": (_stage_rule_based_forecast, None),
+    "predict_multiple": (_stage_predict_multiple, None),
+    "_extract_features": (_stage_extract_features, None),
+    "overview_json": (_stage_overview_json, None),
+    "flask_overview": (_stage_flask_overview, None),
+    "flask_analyze": (_stage_flask_analyze, ROUND_TRIP_MAX),
+    "backtest": (_stage_backtest, BACKTEST_MAX),
+}
+
+
+def _time(run) -> float:
+    """Best wall time in seconds over repeated runs of ``run``."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run()
+        best = time.perf_counter() - start
+        if best > SLOW_RUN_SECONDS:
+            return best
+
+        # The first run was a warm-up (lazy imports, caches)
+        best = float("inf")
+        runs, total = 0, 0.0
+        while runs < MIN_RUNS or (total < MIN_SECONDS and runs < MAX_RUNS):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            runs += 1
+            total += elapsed
+        return best
+    finally:
+        gc.enable()
+
+
+def _random_market_data(rng: np.random.Generator, base):
+    """``base`` with randomized rule inputs: missing, on a threshold or random."""
+    from src.forecast.predictor import RULE_KEYS, TV_SUMMARY_SCORE
+
+    close = 0.0 if rng.random() < 0.05 else float(rng.uniform(10, 1000))
+    ranges = {
+        "RSI": (0, 100), "Stoch.K": (0, 100), "Stoch.D": (0, 100),
+        "ADX": (0, 60), "ADX+DI": (0, 50), "ADX-DI": (0, 50),
+        "CCI20": (-300, 300), "MACD.macd": (-5, 5), "MACD.signal": (-5, 5),
+    }
+    # Pairs the rules compare; the second key sometimes copies the first
+    pairs = {"MACD.signal": "MACD.macd", "Stoch.D": "Stoch.K", "ADX-DI": "ADX+DI"}
+
+    indicators = dict(base.indicators)
+    for key in RULE_KEYS:
+        draw = rng.random()
+        if draw < 0.15:
+            value = None
+        elif key in pairs and draw < 0.3:
+            value = indicators[pairs[key]]
+        elif key in CHECK_BOUNDARIES and draw < 0.3:
+            value = float(rng.choice(CHECK_BOUNDARIES[key]))
+        elif key in ranges:
+            value = float(rng.uniform(*ranges[key]))
+        else:
+            # EMAs and Bollinger bands: around close, sometimes exactly on it
+            value = close if draw < 0.3 else float(close * rng.uniform(0.9, 1.1))
+        indicators[key] = value
+
+    labels = [*TV_SUMMARY_SCORE, "UNKNOWN"]
+    summary = dict(base.summary, RECOMMENDATION=labels[rng.integers(len(labels))])
+    return replace(base, close=close, indicators=indicators, summary=summary)
+
+
+def check_rule_forecasts(samples: int = CHECK_SAMPLES, seed: int = 0) -> int:
+    """Compare batch and per-symbol rule forecasts; return the mismatch count."""
+    from src.forecast.predictor import _rule_based_forecast, _rule_based_forecast_batch
+
+    rng = np.random.default_rng(seed)
+    bases = list(_market_data(min(samples, DISTINCT)).values())
+    items = [_random_market_data(rng, bases[i % len(bases)]) for i in range(samples)]
+
+    mismatches = 0
+    for data, batch in zip(items, _rule_based_forecast_batch(items)):
+        scalar = _rule_based_forecast(data)
+        if batch != scalar:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {data.symbol}\n  batch:  {batch}\n  scalar: {scalar}")
+    print(f"_rule_based_forecast_batch vs _rule_based_forecast: {samples - mismatches}/{samples} identical")
+    return mismatches
+
+
+# Queues every fetched snapshot in the history store and exits without flushing
+_HISTORY_SCRIPT = """
+from src.data.collector import fetch_multiple
+from src.data.history import get_history_store
+from src.data.symbols import get_registry
+
+symbols = get_registry().symbols()
+store = get_history_store()
+for key, data in fetch_multiple(symbols, "1d").items():
+    store.record(symbols[key][0], "1d", data)
+"""
+
+
+def check_history_flush() -> int:
+    """Run a one-shot process that records history; return the rows it lost."""
+    from src.data.symbols import get_registry
+
+    expected = len(get_registry())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        env = dict(os.environ, HISTORY_ENABLED="true", HISTORY_PATH=path)
+        subprocess.run([sys.executable, "-c", _HISTORY_SCRIPT], cwd=ROOT, env=env, check=True)
+        with sqlite3.connect(path) as conn:
+            written = conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+    print(f"history rows written by a one-shot process: {written}/{expected}")
+    return expected - written
+
+
+def _parse_sizes(value: str) -> list[int]:
+    sizes = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        scale = 1_000 if part.endswith("k") else 1
+        sizes.append(int(float(part.rstrip("k")) * scale))
+    return sizes
+
+
+def _load_baseline() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_parse_sizes, default=DEFAULT_SIZES,
+                        help="Comma-separated universe sizes, e.g. 16,1k,100k")
+    parser.add_argument("--stages", type=str, default=",".join(STAGES),
+                        help=f"Comma-separated stages (default: all of {', '.join(STAGES)})")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown versus the baseline (0.5 = 50%%)")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="Check the vectorized rule forecasts against the scalar path instead of timing")
+    args = parser.parse_args()
+
+    if args.check:
+        failures = check_rule_forecasts() + check_history_flush()
+        return 1 if failures else 0
+
+    stages = [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    baseline = _load_baseline().get("results", {})
+    results: dict[str, dict[str, float]] = {}
+    failures = 0
+
+    for stage in stages:
+        setup, max_size = STAGES[stage]
+        for size in args.sizes:
+            if max_size is not None and size > max_size:
+                continue
+            seconds = _time(setup(size))
+            results.setdefault(stage, {})[str(size)] = seconds
+
+            reference = baseline.get(stage, {}).get(str(size))
+            if reference is None:
+                status = "no baseline"
+            else:
+                ratio = seconds / reference
+                ok = ratio <= 1 + args.tolerance
+                failures += not ok
+                status = f"{ratio:5.2f}x baseline  {'OK' if ok else 'SLOWER'}"
+            print(
+                f"{stage:<22} {size:>7}  {seconds * 1000:10.2f} ms"
+                f"  {seconds / size * 1e6:9.2f} us/symbol  {status}"
+            )
+
+    if args.save:
+        stored = _load_baseline()
+        merged = stored.get("results", {})
+        for stage, by_size in results.items():
+            merged.setdefault(stage, {}).update(by_size)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine(),
+                },
+                "results": merged,
+            }, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {os.path.relpath(BASELINE_PATH, ROOT)}")
+        return 0
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,48 +3,115 @@
 
 Usage:
     python main.py              # Start web dashboard
+    python main.py --server asgi  # Start web dashboard on the async server
     python main.py --cli        # Run CLI analysis
     python main.py --cli -s SPX # Analyze specific symbol
+    python main.py --cli -s SPX --multi  # ... on every timeframe, with a consensus
+    python main.py --cli --workers 4 --symbols-file symbols.csv  # Multiprocess batch scan
+    python main.py --train      # Train forecast model from stored history
+    python main.py --backtest   # Backtest the rule-based forecaster on stored history
 """
 
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
 import logging
+import os
 import sys
 
-from src.config import SYMBOLS, DEFAULT_INTERVAL, FLASK_HOST, FLASK_PORT, FLASK_DEBUG
+from src.config import (
+    INTERVALS, DEFAULT_INTERVAL, FLASK_HOST, FLASK_PORT, FLASK_DEBUG, PREFETCH_ENABLED, WEB_SERVER,
+)
 
 
-def run_cli(symbol_key: str | None, category: str, interval: str) -> None:
+def print_timeframes(tv_symbol: str, display_name: str) -> None:
+    """Print one symbol's analysis on every timeframe and their weighted consensus."""
+    from src.data.collector import fetch_intervals
+    from src.analysis.technical import analyze_timeframes
+    from src.forecast.predictor import predict_timeframes
+
+    data = fetch_intervals(tv_symbol, INTERVALS, display_name)
+    consensus = analyze_timeframes(data)
+    if consensus is None:
+        print("  Failed to fetch data.")
+        sys.exit(1)
+    forecasts = predict_timeframes(data)
+
+    print(f"\n{'=' * 72}")
+    print(f"  {consensus.name} ({consensus.symbol})")
+    print(f"{'=' * 72}")
+    print(f"  {'Interval':<9} {'Price':>12} {'Analysis':<12} {'Trend':<17} {'Forecast':<10} {'Conf':>6}")
+    print(f"{'─' * 72}")
+    for interval, a in consensus.analyses.items():
+        f = forecasts[interval]
+        conf_str = f"{f.confidence * 100:.0f}%"
+        print(f"  {interval:<9} {a.price:>12,.2f} {a.summary_kr:<12} {a.trend:<17} {f.direction_emoji} {f.direction_kr:<8} {conf_str:>6}")
+    print(f"{'─' * 72}")
+    print(f"  Consensus:  {consensus.recommendation_kr} ({consensus.recommendation}, score {consensus.score:+.2f})")
+    print(f"  Trend:      {consensus.trend} (score {consensus.trend_score:+.2f})")
+    print(f"  Agreement:  {consensus.agreement * 100:.0f}%")
+    missing = [interval for interval in INTERVALS if interval not in consensus.analyses]
+    if missing:
+        print(f"  Failed:     {', '.join(missing)}")
+    print(f"{'=' * 72}\n")
+
+
+def _flush_history() -> None:
+    """Write queued history snapshots before a one-shot command returns."""
+    from src.data.history import get_history_store
+
+    store = get_history_store()
+    if store is not None:
+        store.flush()
+
+
+def _load_registry():
+    """The symbol registry, exiting with an error if SYMBOLS_PATH is unreadable or malformed."""
+    from src.data.symbols import get_registry
+
+    try:
+        return get_registry()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def run_cli(symbol_key: str | None, category: str, interval: str, multi: bool = False) -> None:
     """Run analysis in CLI mode and print results."""
     from src.data.collector import fetch_analysis, fetch_multiple
-    from src.analysis.technical import analyze, analyze_multiple
-    from src.forecast.predictor import predict, predict_multiple
+    from src.analysis.technical import analyze
+    from src.forecast.predictor import predict, load_model
+    from src.service.universe import analyze_universe
+
+    load_model()
+
+    registry = _load_registry()
 
     if symbol_key:
-        # Find symbol in config
-        tv_symbol = None
-        display_name = ""
-        for cat_symbols in SYMBOLS.values():
-            if symbol_key.upper() in cat_symbols:
-                tv_symbol, display_name = cat_symbols[symbol_key.upper()]
-                break
-
-        if tv_symbol is None:
+        # Key or EXCHANGE:SYMBOL
+        info = registry.get(symbol_key)
+        if info is None:
             print(f"Error: Unknown symbol '{symbol_key}'")
-            print(f"Available symbols: {', '.join(k for cs in SYMBOLS.values() for k in cs)}")
+            suggestions = registry.search(symbol_key[:2]) or list(registry)[:20]
+            print(f"Available symbols: {', '.join(s.key for s in suggestions)}")
             sys.exit(1)
+        tv_symbol, display_name = info.tv_symbol, info.name
+
+        print(f"\n  Analyzing {display_name} ({info.key})...")
+        if multi:
+            print_timeframes(tv_symbol, display_name)
+            _flush_history()
+            return
 
-        print(f"\n  Analyzing {display_name} ({symbol_key.upper()})...")
         data = fetch_analysis(tv_symbol, interval, display_name)
         if data is None:
             print("  Failed to fetch data.")
             sys.exit(1)
 
         a = analyze(data)
-        f = predict(data)
+        f = predict(data, interval)
 
         print(f"\n{'=' * 60}")
         print(f"  {a.name} ({a.symbol})")
@@ -74,45 +141,170 @@ def run_cli(symbol_key: str | None, category: str, interval: str) -> None:
         print(f"{'=' * 60}\n")
     else:
         # Analyze category or all
-        if category == "all":
-            all_symbols = {}
-            for cat_symbols in SYMBOLS.values():
-                all_symbols.update(cat_symbols)
-        else:
-            all_symbols = SYMBOLS.get(category, {})
-
+        all_symbols = registry.symbols(category)
         if not all_symbols:
             print(f"Error: Unknown category '{category}'")
-            print(f"Available: all, {', '.join(SYMBOLS.keys())}")
+            print(f"Available: all, {', '.join(registry.categories)}")
             sys.exit(1)
 
         print(f"\n  Fetching data for {len(all_symbols)} symbols...")
-        market_data = fetch_multiple(all_symbols, interval)
-        analyses = analyze_multiple(market_data)
-        forecasts = predict_multiple(market_data)
+        universe = analyze_universe(all_symbols, fetch_multiple(all_symbols, interval), interval)
 
         print(f"\n{'=' * 90}")
         print(f"  {'Symbol':<10} {'Name':<20} {'Price':>12} {'Change':>8} {'Analysis':<12} {'Forecast':<10} {'Conf':>6}")
         print(f"{'─' * 90}")
-        for key in analyses:
-            a = analyses[key]
-            f = forecasts[key]
-            change_str = f"{a.change_pct:+.2f}%"
-            conf_str = f"{f.confidence * 100:.0f}%"
-            print(f"  {a.symbol:<10} {a.name:<20} {a.price:>12,.2f} {change_str:>8} {a.summary_kr:<12} {f.direction_emoji} {f.direction_kr:<8} {conf_str:>6}")
+        for row in universe.rows():
+            change_str = f"{row['change_pct']:+.2f}%"
+            conf_str = f"{row['confidence'] * 100:.0f}%"
+            print(f"  {row['symbol']:<10} {row['name']:<20} {row['price']:>12,.2f} {change_str:>8} {row['summary_kr']:<12} {row['direction_emoji']} {row['direction_kr']:<8} {conf_str:>6}")
         print(f"{'=' * 90}")
-        print(f"  Total: {len(analyses)} symbols analyzed\n")
+        print(f"  Total: {len(universe)} symbols analyzed\n")
+
+    _flush_history()
+
+
+def run_batch(category: str, interval: str, workers: int, symbols_file: str | None, as_json: bool) -> None:
+    """Scan a large universe across worker processes, printing rows as chunks finish."""
+    from src.service.batch import read_symbol_file, scan_sharded
+
+    if symbols_file:
+        try:
+            symbols = read_symbol_file(symbols_file)
+            first = next(symbols, None)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if first is None:
+            print(f"Error: No symbols in '{symbols_file}'")
+            sys.exit(1)
+        symbols = itertools.chain([first], symbols)
+    else:
+        registry = _load_registry()
+        if not registry.symbols(category):
+            print(f"Error: Unknown category '{category}'")
+            print(f"Available: all, {', '.join(registry.categories)}")
+            sys.exit(1)
+        symbols = iter(registry.symbols(category).items())
+
+    total = 0
+    failed = 0
+    if not as_json:
+        print(f"\n  Scanning with {workers} worker processes...")
+        print(f"\n{'=' * 90}")
+        print(f"  {'Symbol':<10} {'Name':<20} {'Price':>12} {'Change':>8} {'Analysis':<12} {'Forecast':<10} {'Conf':>6}")
+        print(f"{'─' * 90}")
+    try:
+        # The symbols file is read as chunks are handed out, so a bad record
+        # further down only surfaces here
+        for rows, missing in scan_sharded(symbols, interval, max(1, workers)):
+            failed += len(missing)
+            total += len(rows)
+            for row in rows:
+                if as_json:
+                    print(json.dumps(row, ensure_ascii=False))
+                    continue
+                change_str = f"{row['change_pct']:+.2f}%"
+                conf_str = f"{row['confidence'] * 100:.0f}%"
+                print(f"  {row['symbol']:<10} {row['name'][:20]:<20} {row['price']:>12,.2f} {change_str:>8} {row['summary_kr']:<12} {row['direction_emoji']} {row['direction_kr']:<8} {conf_str:>6}")
+            sys.stdout.flush()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not as_json:
+        print(f"{'=' * 90}")
+        print(f"  Total: {total} symbols analyzed, {failed} failed\n")
+
 
+def run_train(interval: str) -> None:
+    """Train a forecast model from the local indicator history."""
+    from src.forecast.training import train
 
-def run_web() -> None:
-    """Start the Flask web dashboard."""
-    from src.web.app import create_app
+    try:
+        bundle = train(interval=interval)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    accuracy = bundle["holdout_accuracy"]
+    print(f"\n  Trained model {bundle['version']}")
+    print(f"  Samples:          {bundle['samples']}")
+    print(f"  Horizon:          {bundle['horizon_days']} days")
+    if accuracy is not None:
+        print(f"  Holdout accuracy: {accuracy * 100:.1f}%")
+    print()
+
+
+def run_backtest(interval: str) -> None:
+    """Backtest the rule-based forecaster on the local indicator history."""
+    from datetime import datetime
+
+    from src.forecast.backtest import backtest
+
+    try:
+        report = backtest(interval=interval)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    def pct(value: float | None) -> str:
+        return f"{value * 100:6.1f}%" if value is not None else "    n/a"
+
+    period = " ~ ".join(datetime.fromtimestamp(t).strftime("%Y-%m-%d") for t in (report.start, report.end))
+    print(f"\n  Backtest: rule-based forecast, {report.interval}, {report.horizon_days}-day horizon")
+    print(f"  Period:               {period}")
+    print(f"  Forecasts:            {report.samples} ({report.symbols} symbols)")
+    print(f"  Hit rate:             {pct(report.hit_rate)}")
+    print(f"  Directional hit rate: {pct(report.directional_hit_rate)}")
+    print(f"  Signal return:        {pct(report.signal_return)}  (long UP, short DOWN)")
+
+    print(f"\n  {'Direction':<10} {'Count':>9} {'Precision':>10} {'Mean ret':>9} {'Median':>8}")
+    for stats in report.by_direction.values():
+        print(
+            f"  {stats.direction:<10} {stats.count:>9} {pct(stats.precision):>10}"
+            f" {pct(stats.mean_return):>9} {pct(stats.median_return):>8}"
+        )
+
+    print(f"\n  {'Confidence':<12} {'Count':>9} {'Mean conf':>10} {'Hit rate':>9}")
+    for b in report.calibration:
+        print(
+            f"  {b.low:.1f} - {b.high:.1f}   {b.count:>9} {pct(b.mean_confidence):>10} {pct(b.hit_rate):>9}"
+        )
+    print()
+
+
+def run_web(server: str = "flask") -> None:
+    """Start the web dashboard on the Flask dev server or an ASGI server."""
+    if server == "asgi":
+        try:
+            import uvicorn
+            from src.web.asgi import create_asgi_app
+        except ImportError as e:
+            print(f"Error: --server asgi requires starlette, uvicorn and httpx ({e})")
+            sys.exit(1)
+        app = create_asgi_app()
+    else:
+        from src.web.app import create_app
+        app = create_app()
+
+    from src.data.collector import warm_cache_from_history
+    from src.forecast.predictor import load_model
+
+    load_model()
+    warm_cache_from_history()
+
+    # With the debug reloader only the child process serves requests
+    reloader_child = server == "asgi" or not FLASK_DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+    if PREFETCH_ENABLED and reloader_child:
+        from src.service.prefetch import start_scheduler
+        start_scheduler()
 
-    app = create_app()
     print(f"\n  TradingView Economic Forecast Dashboard")
-    print(f"  Starting server at http://{FLASK_HOST}:{FLASK_PORT}")
+    print(f"  Starting {server} server at http://{FLASK_HOST}:{FLASK_PORT}")
     print(f"  Press Ctrl+C to stop\n")
-    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
+    if server == "asgi":
+        uvicorn.run(app, host=FLASK_HOST, port=FLASK_PORT, log_level="info")
+    else:
+        app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
 
 
 def main() -> None:
@@ -134,7 +326,31 @@ def main() -> None:
         help="Interval: 1m, 5m, 15m, 1h, 4h, 1d, 1W, 1M"
     )
     parser.add_argument(
-        "--json", action="store_true", help="Output results as JSON (CLI mode only)"
+        "--multi", action="store_true",
+        help="Analyze the symbol (-s) on every interval with a weighted consensus"
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="Output results as JSON (CLI mode only; one row per line with --workers)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Scan the universe across N worker processes, streaming rows (CLI mode only)"
+    )
+    parser.add_argument(
+        "--symbols-file", type=str, default=None,
+        help="Universe to scan in worker mode: one EXCHANGE:SYMBOL[,name] per line"
+    )
+    parser.add_argument(
+        "--train", action="store_true", help="Train a forecast model from stored history"
+    )
+    parser.add_argument(
+        "--backtest", action="store_true",
+        help="Backtest the rule-based forecaster on stored history (-i interval)"
+    )
+    parser.add_argument(
+        "--server", choices=["flask", "asgi"], default=WEB_SERVER,
+        help="Web server: flask (threaded) or asgi (async, needs starlette/uvicorn/httpx)"
     )
 
     args = parser.parse_args()
@@ -144,10 +360,16 @@ def main() -> None:
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
-    if args.cli:
-        run_cli(args.symbol, args.category, args.interval)
+    if args.train:
+        run_train(args.interval)
+    elif args.backtest:
+        run_backtest(args.interval)
+    elif args.cli and (args.workers or args.symbols_file) and not args.symbol:
+        run_batch(args.category, args.interval, args.workers, args.symbols_file, args.json)
+    elif args.cli:
+        run_cli(args.symbol, args.category, args.interval, args.multi)
     else:
-        run_web()
+        run_web(args.server)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ moving averages, and summary recommendations."""
 from __future__ import annotations
 
 from dataclasses import dataclass
+
+from src import metrics
+from src.config import TIMEFRAME_WEIGHTS
 from src.data.collector import MarketData
 
 
@@ -32,8 +35,17 @@ SIGNAL_SCORE = {
     "STRONG_BUY": 2,
 }
 
+# Trend labels scored like SIGNAL_SCORE; UNKNOWN is left out of consensus
+TREND_SCORE = {
+    "STRONG_DOWNTREND": -2,
+    "DOWNTREND": -1,
+    "SIDEWAYS": 0,
+    "UPTREND": 1,
+    "STRONG_UPTREND": 2,
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Aggregated technical analysis result."""
 
@@ -114,6 +126,12 @@ def analyze(data: MarketData) -> AnalysisResult:
     Returns:
         AnalysisResult with aggregated signals.
     """
+    # Not timed here: per-symbol calls are too cheap for metrics.stage;
+    # callers time whole requests and batches instead
+    return _analyze(data)
+
+
+def _analyze(data: MarketData) -> AnalysisResult:
     summary = data.summary
     osc = data.oscillators
     ma = data.moving_averages
@@ -148,5 +166,100 @@ def analyze(data: MarketData) -> AnalysisResult:
 def analyze_multiple(
     market_data: dict[str, MarketData],
 ) -> dict[str, AnalysisResult]:
-    """Analyze multiple symbols."""
-    return {key: analyze(data) for key, data in market_data.items()}
+    """Analyze multiple symbols (timed once as a whole, not per symbol)."""
+    with metrics.stage("analyze_multiple"):
+        return {key: _analyze(data) for key, data in market_data.items()}
+
+
+@dataclass(slots=True)
+class TimeframeConsensus:
+    """Weighted agreement of one symbol's signals across timeframes.
+
+    ``score`` and ``trend_score`` are weighted means on the -2..2 scale
+    of ``SIGNAL_SCORE`` / ``TREND_SCORE``; ``agreement`` is the weighted
+    share of timeframes whose summary points the same way as the
+    consensus (0..1).
+    """
+
+    symbol: str
+    name: str
+    analyses: dict[str, AnalysisResult]
+    score: float
+    recommendation: str
+    trend_score: float
+    trend: str
+    agreement: float
+
+    @property
+    def recommendation_kr(self) -> str:
+        return RECOMMENDATION_KR.get(self.recommendation, self.recommendation)
+
+
+def _bucket(score: float, labels: list[str]) -> str:
+    """Map a -2..2 score onto five labels ordered bearish -> bullish."""
+    if score >= 1.5:
+        return labels[4]
+    if score >= 0.5:
+        return labels[3]
+    if score <= -1.5:
+        return labels[0]
+    if score <= -0.5:
+        return labels[1]
+    return labels[2]
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def analyze_timeframes(
+    data_by_interval: dict[str, MarketData],
+    weights: dict[str, float] | None = None,
+) -> TimeframeConsensus | None:
+    """Analyze one symbol on several timeframes and weigh them into a consensus.
+
+    Args:
+        data_by_interval: Interval -> MarketData for the same symbol, as
+            returned by ``fetch_intervals``.
+        weights: Interval -> weight; defaults to TIMEFRAME_WEIGHTS.
+
+    Returns:
+        TimeframeConsensus, or None if no interval had data.
+    """
+    if not data_by_interval:
+        return None
+    weights = weights if weights is not None else TIMEFRAME_WEIGHTS
+
+    with metrics.stage("analyze_timeframes"):
+        analyses = {interval: _analyze(data) for interval, data in data_by_interval.items()}
+
+        total = score = 0.0
+        trend_total = trend_score = 0.0
+        for interval, a in analyses.items():
+            weight = weights.get(interval, 1.0)
+            total += weight
+            score += weight * a.summary_score
+            if a.trend in TREND_SCORE:
+                trend_total += weight
+                trend_score += weight * TREND_SCORE[a.trend]
+        score = score / total if total else 0.0
+        trend_score = trend_score / trend_total if trend_total else 0.0
+        recommendation = _bucket(score, RECOMMENDATION_ORDER)
+
+        direction = _sign(SIGNAL_SCORE[recommendation])
+        agreeing = sum(
+            weights.get(interval, 1.0)
+            for interval, a in analyses.items() if _sign(a.summary_score) == direction
+        )
+
+    first = next(iter(analyses.values()))
+    return TimeframeConsensus(
+        symbol=first.symbol,
+        name=first.name,
+        analyses=analyses,
+        score=round(score, 3),
+        recommendation=recommendation,
+        trend_score=round(trend_score, 3),
+        trend=_bucket(trend_score, list(TREND_SCORE)) if trend_total else "UNKNOWN",
+        agreement=round(agreeing / total, 3) if total else 0.0,
+    )
@@ -33,6 +33,10 @@ SYMBOLS = {
     },
 }
 
+# Load the symbol universe from CSV/JSON/Parquet files instead of SYMBOLS
+# (comma-separated paths; see src/data/symbols.py for the format)
+SYMBOLS_PATH = os.getenv("SYMBOLS_PATH", "")
+
 # TradingView screener mappings
 SCREENER_MAP = {
     "SP": "america",
@@ -50,11 +54,72 @@ SCREENER_MAP = {
 INTERVALS = ["1m", "5m", "15m", "1h", "4h", "1d", "1W", "1M"]
 DEFAULT_INTERVAL = "1d"
 
+# Weight of each interval in the multi-timeframe consensus; short
+# timeframes are noisier and count less
+TIMEFRAME_WEIGHTS = {
+    "1m": 0.25,
+    "5m": 0.5,
+    "15m": 0.75,
+    "1h": 1.0,
+    "4h": 1.5,
+    "1d": 2.0,
+    "1W": 2.0,
+    "1M": 1.5,
+}
+
+# Data collection settings
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+FETCH_RATE_LIMIT = float(os.getenv("FETCH_RATE_LIMIT", "5"))  # requests per second
+FETCH_RATE_BURST = int(os.getenv("FETCH_RATE_BURST", "5"))
+# Keep-alive connections per scanner host, and seconds before a scan request times out
+FETCH_POOL_SIZE = int(os.getenv("FETCH_POOL_SIZE", str(FETCH_MAX_WORKERS)))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "10"))
+
+# Learned screener per symbol (empty path keeps it in memory only)
+SCREENER_CACHE_PATH = os.getenv("SCREENER_CACHE_PATH", ".cache/screeners.json")
+SCREENER_NEGATIVE_TTL = int(os.getenv("SCREENER_NEGATIVE_TTL", "900"))
+
+# Market data cache settings (TTL in seconds per interval)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_TTL = {
+    "1m": 20,
+    "5m": 60,
+    "15m": 120,
+    "1h": 300,
+    "4h": 600,
+    "1d": 900,
+    "1W": 3600,
+    "1M": 3 * 3600,
+}
+
+# Background prefetch (refresh cadence in seconds per interval). Only the
+# listed intervals are kept warm; the others are fetched on request
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_INTERVALS = [
+    i.strip() for i in os.getenv("PREFETCH_INTERVALS", DEFAULT_INTERVAL).split(",") if i.strip() in INTERVALS
+]
+PREFETCH_CADENCE = dict(CACHE_TTL)
+
+# Local indicator snapshot history (SQLite)
+HISTORY_ENABLED = os.getenv("HISTORY_ENABLED", "true").lower() == "true"
+HISTORY_PATH = os.getenv("HISTORY_PATH", "data/history.db")
+
+# Where indicator data comes from: "tradingview" (live), "replay" (recorded
+# history, see REPLAY_PATH) or "synthetic" (generated, see SYNTHETIC_SEED)
+DATA_SOURCE = os.getenv("DATA_SOURCE", "tradingview").lower()
+REPLAY_PATH = os.getenv("REPLAY_PATH", HISTORY_PATH)
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "0"))
+
 # Forecast settings
 FORECAST_DAYS = int(os.getenv("FORECAST_DAYS", "30"))
 MODEL_LOOKBACK = int(os.getenv("MODEL_LOOKBACK", "60"))
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+# "auto" uses a trained model when one is saved, "rules" always uses the rule engine
+FORECAST_MODE = os.getenv("FORECAST_MODE", "auto").lower()
 
 # Flask settings
 FLASK_HOST = os.getenv("FLASK_HOST", "0.0.0.0")
 FLASK_PORT = int(os.getenv("FLASK_PORT", "5000"))
 FLASK_DEBUG = os.getenv("FLASK_DEBUG", "false").lower() == "true"
+# "flask" (threaded dev server) or "asgi" (Starlette on uvicorn); see main.py --server
+WEB_SERVER = os.getenv("WEB_SERVER", "flask").lower()
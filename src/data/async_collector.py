@@ -0,0 +1,346 @@
+"""Asyncio TradingView data collection for the ASGI web server.
+
+Mirrors the fetch paths of ``src.data.collector`` without a fetch pool:
+every scan request goes through one shared ``httpx.AsyncClient``
+connection pool. The market data cache, screener memo, rate limiter and
+history store are the collector's own instances, so both servers see the
+same state. Their blocking parts (memo file writes, opening the history
+database) run in ``asyncio.to_thread`` so they never stall the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import AsyncIterator
+
+import httpx
+from tradingview_ta import Interval
+
+from src import metrics
+from src.config import FETCH_POOL_SIZE, FETCH_TIMEOUT
+from src.data.collector import (
+    INTERVAL_MAP,
+    MEMO_FLUSH_INTERVAL,
+    SCREENER_FALLBACKS,
+    MarketData,
+    _build_market_data,
+    _flush_memo,
+    _group_by_screener,
+    _parse_exchange_symbol,
+    _primary_screener,
+    _record_history,
+    _settle_batch,
+    _settle_intervals,
+    _with_name,
+    fallback_hits,
+    get_rate_limiter,
+    market_cache,
+    scan_requests,
+    screener_failures,
+    screener_memo,
+)
+from src.data.scan import (
+    SCAN_HEADERS,
+    parse_scan,
+    parse_scan_intervals,
+    scan_payload,
+    scan_payload_intervals,
+    scan_url,
+)
+from src.data.sources import get_source
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+# (tv_symbol, interval) -> in-flight single-symbol fetch, so concurrent
+# requests for the same symbol share one upstream call
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers=SCAN_HEADERS,
+            timeout=FETCH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=FETCH_POOL_SIZE,
+                max_keepalive_connections=FETCH_POOL_SIZE,
+            ),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client (call on server shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _scan(screener: str, tv_symbols: list[str], tv_interval) -> dict | None:
+    """One scan request for several symbols on one screener.
+
+    Returns a dict of upper-cased 'EXCHANGE:SYMBOL' -> Analysis (or None),
+    or None if the whole request fails. Offline data sources are called
+    directly; they answer from memory.
+    """
+    source = get_source()
+    try:
+        if source.live:
+            with metrics.stage("rate_limit_wait"):
+                await get_rate_limiter().acquire_async()
+        with metrics.stage("scan"):
+            if not source.live:
+                analyses = source.scan(screener, tv_symbols, tv_interval)
+            else:
+                response = await _get_client().post(
+                    scan_url(screener), json=scan_payload(tv_symbols, tv_interval)
+                )
+                response.raise_for_status()
+                analyses = parse_scan(response.json(), screener, tv_interval, tv_symbols)
+    except Exception as e:
+        scan_requests.inc(screener=screener, outcome="error")
+        logger.debug("Scan on screener '%s' failed for %d symbols - %s", screener, len(tv_symbols), e)
+        return None
+    scan_requests.inc(screener=screener, outcome="ok")
+    return analyses
+
+
+async def _scan_intervals(screener: str, tv_symbol: str, tv_intervals: list[str]) -> dict | None:
+    """One scan request for one symbol on several intervals.
+
+    Returns tv_interval -> Analysis (or None), or None if the request fails.
+    """
+    source = get_source()
+    try:
+        if source.live:
+            with metrics.stage("rate_limit_wait"):
+                await get_rate_limiter().acquire_async()
+        with metrics.stage("scan"):
+            if not source.live:
+                analyses = source.scan_intervals(screener, [tv_symbol], tv_intervals)
+            else:
+                response = await _get_client().post(
+                    scan_url(screener), json=scan_payload_intervals([tv_symbol], tv_intervals)
+                )
+                response.raise_for_status()
+                analyses = parse_scan_intervals(response.json(), screener, tv_intervals, [tv_symbol])
+    except Exception as e:
+        scan_requests.inc(screener=screener, outcome="error")
+        logger.debug("Scan on screener '%s' failed for %s on %d intervals - %s", screener, tv_symbol, len(tv_intervals), e)
+        return None
+    scan_requests.inc(screener=screener, outcome="ok")
+    # A source may leave out intervals it has no data for; they count as misses
+    return {tv_interval: analyses.get(tv_interval, {}).get(tv_symbol.upper()) for tv_interval in tv_intervals}
+
+
+async def _fetch_single(
+    tv_symbol: str,
+    interval: str,
+    display_name: str,
+    skip_screener: str | None = None,
+) -> MarketData | None:
+    """Fetch one symbol, walking the screener fallbacks (see ``collector._fetch_single``)."""
+    exchange, symbol = _parse_exchange_symbol(tv_symbol)
+    primary_screener = _primary_screener(tv_symbol)
+    tv_interval = INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY)
+
+    screeners_to_try = screener_memo.candidates(
+        tv_symbol, primary_screener, SCREENER_FALLBACKS.get(primary_screener, [])
+    )
+    if not screeners_to_try:
+        logger.debug("Skipping %s, failed on every screener recently", tv_symbol)
+        return None
+
+    analysis = None
+    for screener in screeners_to_try:
+        if screener == skip_screener:
+            continue
+        analyses = await _scan(screener, [f"{exchange}:{symbol}"], tv_interval)
+        analysis = analyses.get(tv_symbol.upper()) if analyses else None
+        if analysis is not None:
+            screener_memo.record_success(tv_symbol, screener)
+            if screener != primary_screener:
+                fallback_hits.inc(primary=primary_screener, screener=screener)
+            break
+
+    if analysis is None:
+        logger.warning("All screeners failed for %s", tv_symbol)
+        screener_failures.inc()
+        screener_memo.record_failure(tv_symbol)
+        return None
+
+    data = _build_market_data(analysis, exchange, symbol, display_name)
+    if data is not None:
+        await asyncio.to_thread(_record_history, tv_symbol, interval, data)
+    return data
+
+
+async def fetch_analysis(
+    tv_symbol: str,
+    interval: str = "1d",
+    display_name: str = "",
+) -> MarketData | None:
+    """Async ``collector.fetch_analysis``: cached, with concurrent requests coalesced."""
+    key = (tv_symbol, interval)
+    with metrics.stage("fetch_analysis"):
+        data = market_cache.get(key)
+        if data is None:
+            task = _inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(_fetch_single(tv_symbol, interval, display_name))
+                _inflight[key] = task
+                task.add_done_callback(lambda _: _inflight.pop(key, None))
+            # A cancelled caller must not cancel the fetch other callers await
+            data = await asyncio.shield(task)
+            await asyncio.to_thread(_flush_memo)
+            if data is not None:
+                market_cache.put(key, data)
+    return _with_name(data, display_name) if data is not None else None
+
+
+async def _fetch_intervals_single(
+    tv_symbol: str,
+    intervals: list[str],
+    display_name: str,
+) -> tuple[dict[str, MarketData], str | None]:
+    """Async ``collector._fetch_intervals_single``: one request per screener tried."""
+    exchange, _symbol = _parse_exchange_symbol(tv_symbol)
+    primary_screener = _primary_screener(tv_symbol)
+    tv_intervals = list(dict.fromkeys(INTERVAL_MAP.get(i, Interval.INTERVAL_1_DAY) for i in intervals))
+
+    screeners_to_try = screener_memo.candidates(
+        tv_symbol, primary_screener, SCREENER_FALLBACKS.get(primary_screener, [])
+    )
+    if not exchange or not screeners_to_try:
+        return {}, None
+
+    for screener in screeners_to_try:
+        analyses = await _scan_intervals(screener, tv_symbol, tv_intervals)
+        if analyses and any(a is not None for a in analyses.values()):
+            break
+    else:
+        logger.warning("All screeners failed for %s", tv_symbol)
+        screener_failures.inc()
+        screener_memo.record_failure(tv_symbol)
+        return {}, None
+
+    settled = await asyncio.to_thread(_settle_intervals, tv_symbol, intervals, display_name, screener, analyses)
+    return settled, screener
+
+
+async def fetch_intervals(
+    tv_symbol: str,
+    intervals: list[str],
+    display_name: str = "",
+) -> dict[str, MarketData]:
+    """Async ``collector.fetch_intervals``, in ``intervals`` order."""
+    results: dict[str, MarketData] = {}
+    with metrics.stage("fetch_intervals"):
+        missing = []
+        for interval in intervals:
+            data = market_cache.get((tv_symbol, interval))
+            if data is not None:
+                results[interval] = data
+            else:
+                missing.append(interval)
+
+        if missing:
+            fetched, screener = await _fetch_intervals_single(tv_symbol, missing, display_name)
+            retries = [interval for interval in missing if interval not in fetched]
+            retried = await asyncio.gather(
+                *(_fetch_single(tv_symbol, interval, display_name, screener) for interval in retries)
+            )
+            fetched.update((i, d) for i, d in zip(retries, retried) if d is not None)
+            await asyncio.to_thread(_flush_memo)
+            for interval, data in fetched.items():
+                market_cache.put((tv_symbol, interval), data)
+            results.update(fetched)
+
+    return {
+        interval: _with_name(results[interval], display_name)
+        for interval in intervals if interval in results
+    }
+
+
+async def _iter_batch(
+    symbols: dict[str, tuple[str, str]],
+    interval: str,
+) -> AsyncIterator[tuple[str, MarketData]]:
+    """Async ``collector._iter_batch``: one scan per screener, run concurrently.
+
+    Yields (key, MarketData) pairs as each request completes. Requests
+    still running when the consumer stops are cancelled.
+    """
+    tv_interval = INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY)
+    groups, pending = _group_by_screener(symbols)
+
+    def start_single(key: str, skip: str | None) -> asyncio.Task:
+        return asyncio.create_task(_fetch_single(symbols[key][0], interval, symbols[key][1], skip))
+
+    # task -> ("batch", screener) or ("single", key)
+    tasks: dict[asyncio.Task, tuple[str, str]] = {
+        asyncio.create_task(
+            _scan(screener, [symbols[k][0] for k in keys], tv_interval)
+        ): ("batch", screener)
+        for screener, keys in groups.items()
+    }
+    for key, skip in pending.items():
+        tasks[start_single(key, skip)] = ("single", key)
+
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, ref = tasks.pop(task)
+                if kind == "single":
+                    data = task.result()
+                    if data is not None:
+                        yield ref, data
+                    continue
+
+                ready, retry = await asyncio.to_thread(
+                    _settle_batch, symbols, groups[ref], ref, task.result(), interval
+                )
+                for key, skip in retry:
+                    tasks[start_single(key, skip)] = ("single", key)
+                for item in ready:
+                    yield item
+            await asyncio.to_thread(_flush_memo, MEMO_FLUSH_INTERVAL)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.to_thread(_flush_memo)
+
+
+async def iter_multiple(
+    symbols: dict[str, tuple[str, str]],
+    interval: str = "1d",
+) -> AsyncIterator[tuple[str, MarketData]]:
+    """Async ``collector.iter_multiple``: cache hits first, then fetches as they land."""
+    misses: dict[str, tuple[str, str]] = {}
+    for key, (tv_symbol, display_name) in symbols.items():
+        data = market_cache.get((tv_symbol, interval))
+        if data is not None:
+            yield key, _with_name(data, display_name)
+        else:
+            misses[key] = (tv_symbol, display_name)
+
+    async for key, data in _iter_batch(misses, interval):
+        market_cache.put((misses[key][0], interval), data)
+        yield key, data
+
+
+async def fetch_multiple(
+    symbols: dict[str, tuple[str, str]],
+    interval: str = "1d",
+) -> dict[str, MarketData]:
+    """Async ``collector.fetch_multiple``, in the caller's symbol order."""
+    with metrics.stage("fetch_multiple"):
+        fetched = {key: data async for key, data in iter_multiple(symbols, interval)}
+    return {key: fetched[key] for key in symbols if key in fetched}
@@ -0,0 +1,167 @@
+"""In-process TTL/LRU cache for collected market data."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Iterable
+
+
+class MarketDataCache:
+    """Bounded LRU cache with interval-aware TTLs and request coalescing.
+
+    Keys are ``(tv_symbol, interval)`` tuples; the interval selects the
+    TTL from ``ttls``. Concurrent loads of the same key are coalesced so
+    that only one upstream fetch is in flight per key. ``None`` results
+    are never cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttls: dict[str, float],
+        default_ttl: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def ttl_for(self, key: Hashable) -> float:
+        """TTL in seconds for a ``(tv_symbol, interval)`` key."""
+        return self.ttls.get(key[1], self.default_ttl)
+
+    def _lookup(self, key: Hashable, now: float) -> Any:
+        """Return a live entry and mark it recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Any, now: float, ttl: float | None = None) -> None:
+        """Insert an entry, evicting the least recently used. Caller holds the lock."""
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        if value is None or ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key`` or None."""
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, optionally overriding the interval TTL."""
+        with self._lock:
+            self._store(key, value, time.monotonic(), ttl)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or call ``loader`` once to fill it."""
+        return self.get_many_or_load([key], lambda keys: {key: loader()}).get(key)
+
+    def get_many_or_load(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[list[Hashable]], dict[Hashable, Any]],
+    ) -> dict[Hashable, Any]:
+        """Return values for ``keys``, loading all misses with one ``loader`` call.
+
+        Keys already being loaded by another thread are waited on rather
+        than fetched again. Keys the loader could not resolve are omitted
+        from the result.
+        """
+        results: dict[Hashable, Any] = {}
+        owned: dict[Hashable, Future] = {}
+        waiting: dict[Hashable, Future] = {}
+
+        with self._lock:
+            now = time.monotonic()
+            for key in dict.fromkeys(keys):
+                value = self._lookup(key, now)
+                if value is not None:
+                    self.hits += 1
+                    results[key] = value
+                    continue
+                self.misses += 1
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    owned[key] = future
+                else:
+                    self.coalesced += 1
+                    waiting[key] = future
+
+        if owned:
+            try:
+                loaded = loader(list(owned))
+            except BaseException as e:
+                with self._lock:
+                    for key in owned:
+                        self._inflight.pop(key, None)
+                for future in owned.values():
+                    future.set_exception(e)
+                raise
+
+            with self._lock:
+                now = time.monotonic()
+                for key in owned:
+                    self._store(key, loaded.get(key), now)
+                    self._inflight.pop(key, None)
+            for key, future in owned.items():
+                value = loaded.get(key)
+                future.set_result(value)
+                if value is not None:
+                    results[key] = value
+
+        for key, future in waiting.items():
+            try:
+                value = future.result()
+            except Exception:
+                value = None
+            if value is not None:
+                results[key] = value
+
+        return results
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import contextvars
 import logging
+import threading
 import time
-from dataclasses import dataclass
-
-from tradingview_ta import TA_Handler, Interval
-
-from src.config import SCREENER_MAP
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Iterator, Mapping
+
+from tradingview_ta import Interval
+
+from src.config import (
+    SCREENER_MAP,
+    FETCH_MAX_WORKERS,
+    FETCH_RATE_LIMIT,
+    FETCH_RATE_BURST,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL,
+    SCREENER_CACHE_PATH,
+    SCREENER_NEGATIVE_TTL,
+)
+from src import metrics
+from src.data.cache import MarketDataCache
+from src.data.compact import Indicators, Record
+from src.data.ratelimit import TokenBucket
+from src.data.screeners import ScreenerMemo
+from src.data.sources import get_source
+from src.data.symbols import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +52,80 @@ SCREENER_FALLBACKS = {
     "crypto": [],
 }
 
+# Shared by every caller in the process (Flask workers, Streamlit sessions,
+# CLI) so the combined request rate stays under TradingView's limits.
+_rate_limiter = TokenBucket(rate=FETCH_RATE_LIMIT, capacity=FETCH_RATE_BURST)
+
+# Keyed by (tv_symbol, interval); shared by every caller in the process.
+market_cache = MarketDataCache(max_entries=CACHE_MAX_ENTRIES, ttls=CACHE_TTL)
+
+# Which screener actually serves each EXCHANGE:SYMBOL, learned from fetches
+screener_memo = ScreenerMemo(SCREENER_CACHE_PATH, negative_ttl=SCREENER_NEGATIVE_TTL)
+
+# Seconds between screener memo saves while a long batch is running
+MEMO_FLUSH_INTERVAL = 5.0
+
+scan_requests = metrics.counter(
+    "tv_scan_requests_total", "Scan requests by screener and outcome (ok/error)", ["screener", "outcome"]
+)
+fallback_hits = metrics.counter(
+    "tv_screener_fallback_hits_total",
+    "Symbols served by a screener other than their exchange's primary one",
+    ["primary", "screener"],
+)
+screener_failures = metrics.counter(
+    "tv_screener_failures_total", "Symbols that failed on every candidate screener"
+)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def set_rate_limit(rate: float, capacity: float | None = None) -> None:
+    """Replace this process's request rate limiter.
+
+    Used by batch worker processes to take their share of
+    FETCH_RATE_LIMIT. Applies to the sync and async collectors alike.
+    """
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate=rate, capacity=capacity)
+
 
-@dataclass
+def get_rate_limiter() -> TokenBucket:
+    """This process's current request rate limiter (see ``set_rate_limit``)."""
+    return _rate_limiter
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared fetch thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=FETCH_MAX_WORKERS,
+                    thread_name_prefix="tv-fetch",
+                )
+    return _executor
+
+
+def _submit(fn, *args) -> Future:
+    """Run ``fn`` on the fetch pool in a copy of the caller's context.
+
+    Keeps the caller's request trace (see ``src.metrics``) active in the
+    worker thread.
+    """
+    return _get_executor().submit(contextvars.copy_context().run, fn, *args)
+
+
+@dataclass(slots=True)
 class MarketData:
-    """Container for market data from TradingView."""
+    """Container for market data from TradingView.
+
+    ``indicators``, ``oscillators``, ``moving_averages`` and ``summary``
+    accept plain dicts and are stored as compact read-only mappings that
+    share their keys with every other snapshot (see ``src.data.compact``).
+    """
 
     symbol: str
     exchange: str
@@ -47,10 +137,16 @@ class MarketData:
     volume: float
     change: float
     change_pct: float
-    indicators: dict
-    oscillators: dict
-    moving_averages: dict
-    summary: dict
+    indicators: Mapping
+    oscillators: Mapping
+    moving_averages: Mapping
+    summary: Mapping
+
+    def __post_init__(self):
+        self.indicators = Indicators.from_dict(self.indicators)
+        self.oscillators = Record.from_dict(self.oscillators)
+        self.moving_averages = Record.from_dict(self.moving_averages)
+        self.summary = Record.from_dict(self.summary)
 
 
 def _parse_exchange_symbol(tv_symbol: str) -> tuple[str, str]:
@@ -66,7 +162,48 @@ def _get_screener(exchange: str) -> str:
     return SCREENER_MAP.get(exchange, "america")
 
 
-def _safe_get(indicators: dict, key: str, default=0):
+def _primary_screener(tv_symbol: str) -> str:
+    """Screener for a symbol: its registry override, else its exchange's."""
+    info = get_registry().by_tv_symbol(tv_symbol)
+    if info is not None and info.screener:
+        return info.screener
+    return _get_screener(_parse_exchange_symbol(tv_symbol)[0])
+
+
+def _with_name(data: MarketData, display_name: str) -> MarketData:
+    """Return cached data relabelled with the caller's display name."""
+    name = display_name or data.symbol
+    return data if data.name == name else replace(data, name=name)
+
+
+def _record_history(tv_symbol: str, interval: str, data: MarketData) -> None:
+    """Queue a fetched snapshot for the local history store (live sources only)."""
+    from src.data.history import get_history_store
+
+    if not get_source().live:
+        return
+
+    store = get_history_store()
+    if store is not None:
+        store.record(tv_symbol, interval, data)
+
+
+def _flush_memo(min_interval: float = 0.0) -> None:
+    """Persist the screener memo; offline sources never touch the saved file.
+
+    Called once per fetch call or batch, not per symbol; long batches pass
+    MEMO_FLUSH_INTERVAL to save at most that often while they run.
+    """
+    if get_source().live:
+        screener_memo.flush(min_interval)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the market data cache."""
+    return market_cache.stats()
+
+
+def _safe_get(indicators: Mapping, key: str, default=0):
     """Safely get a value from indicators, returning default if None."""
     val = indicators.get(key)
     return val if val is not None else default
@@ -74,51 +211,57 @@ def _safe_get(indicators: dict, key: str, default=0):
 
 def _try_fetch(symbol: str, screener: str, exchange: str, tv_interval):
     """Attempt to fetch analysis with given screener, return Analysis or None."""
-    try:
-        handler = TA_Handler(
-            symbol=symbol,
-            screener=screener,
-            exchange=exchange,
-            interval=tv_interval,
-        )
-        return handler.get_analysis()
-    except Exception as e:
-        logger.debug("Screener '%s' failed for %s:%s - %s", screener, exchange, symbol, e)
-        return None
-
+    tv_symbol = f"{exchange}:{symbol}"
+    analyses = _try_fetch_multiple(screener, [tv_symbol], tv_interval)
+    return analyses.get(tv_symbol.upper()) if analyses else None
 
-def fetch_analysis(
-    tv_symbol: str,
-    interval: str = "1d",
-    display_name: str = "",
-) -> MarketData | None:
-    """Fetch technical analysis data from TradingView.
 
-    Args:
-        tv_symbol: TradingView symbol in 'EXCHANGE:SYMBOL' format.
-        interval: Time interval string (e.g. '1d', '1h').
-        display_name: Human-readable name for the asset.
+def _try_fetch_multiple(screener: str, tv_symbols: list[str], tv_interval) -> dict | None:
+    """Fetch analyses for several symbols on one screener in a single scan request.
 
-    Returns:
-        MarketData instance or None if the fetch fails.
+    Asks the configured data source (by default the live scanner over
+    the pooled transport). Returns a dict of upper-cased
+    'EXCHANGE:SYMBOL' -> Analysis (or None), or None if the whole request
+    fails.
     """
-    exchange, symbol = _parse_exchange_symbol(tv_symbol)
-    primary_screener = _get_screener(exchange)
-    tv_interval = INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY)
+    source = get_source()
+    if source.live:
+        with metrics.stage("rate_limit_wait"):
+            get_rate_limiter().acquire()
+    try:
+        with metrics.stage("scan"):
+            analyses = source.scan(screener, tv_symbols, tv_interval)
+    except Exception as e:
+        scan_requests.inc(screener=screener, outcome="error")
+        logger.debug("Scan on screener '%s' failed for %d symbols - %s", screener, len(tv_symbols), e)
+        return None
+    scan_requests.inc(screener=screener, outcome="ok")
+    return analyses
 
-    # Try primary screener first, then fallbacks
-    screeners_to_try = [primary_screener] + SCREENER_FALLBACKS.get(primary_screener, [])
-    analysis = None
 
-    for screener in screeners_to_try:
-        analysis = _try_fetch(symbol, screener, exchange, tv_interval)
-        if analysis is not None:
-            break
+def _try_fetch_intervals(screener: str, tv_symbol: str, tv_intervals: list[str]) -> dict | None:
+    """Fetch one symbol on several intervals in a single scan request.
 
-    if analysis is None:
-        logger.warning("All screeners failed for %s", tv_symbol)
+    Returns tv_interval -> Analysis (or None), or None if the request fails.
+    """
+    source = get_source()
+    if source.live:
+        with metrics.stage("rate_limit_wait"):
+            get_rate_limiter().acquire()
+    try:
+        with metrics.stage("scan"):
+            analyses = source.scan_intervals(screener, [tv_symbol], tv_intervals)
+    except Exception as e:
+        scan_requests.inc(screener=screener, outcome="error")
+        logger.debug("Scan on screener '%s' failed for %s on %d intervals - %s", screener, tv_symbol, len(tv_intervals), e)
         return None
+    scan_requests.inc(screener=screener, outcome="ok")
+    # A source may leave out intervals it has no data for; they count as misses
+    return {tv_interval: analyses.get(tv_interval, {}).get(tv_symbol.upper()) for tv_interval in tv_intervals}
 
+
+def _build_market_data(analysis, exchange: str, symbol: str, display_name: str) -> MarketData | None:
+    """Convert a tradingview_ta Analysis into MarketData."""
     try:
         indicators = analysis.indicators or {}
         close = _safe_get(indicators, "close", 0)
@@ -150,9 +293,307 @@ def fetch_analysis(
             summary=summary,
         )
     except Exception:
-        logger.exception("Error processing data for %s", tv_symbol)
+        logger.exception("Error processing data for %s:%s", exchange, symbol)
+        return None
+
+
+def _fetch_single(
+    tv_symbol: str,
+    interval: str,
+    display_name: str,
+    skip_screener: str | None = None,
+) -> MarketData | None:
+    """Fetch one symbol, walking the screener fallbacks. Runs on the fetch pool.
+
+    The screener memo puts the known-good screener first and skips
+    symbols that recently failed everywhere. ``skip_screener`` excludes
+    a screener the caller already saw fail for this symbol.
+    """
+    exchange, symbol = _parse_exchange_symbol(tv_symbol)
+    primary_screener = _primary_screener(tv_symbol)
+    tv_interval = INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY)
+
+    # Known-good screener first, then primary and fallbacks
+    screeners_to_try = screener_memo.candidates(
+        tv_symbol, primary_screener, SCREENER_FALLBACKS.get(primary_screener, [])
+    )
+    if not screeners_to_try:
+        logger.debug("Skipping %s, failed on every screener recently", tv_symbol)
         return None
 
+    analysis = None
+    for screener in screeners_to_try:
+        if screener == skip_screener:
+            continue
+        analysis = _try_fetch(symbol, screener, exchange, tv_interval)
+        if analysis is not None:
+            screener_memo.record_success(tv_symbol, screener)
+            if screener != primary_screener:
+                fallback_hits.inc(primary=primary_screener, screener=screener)
+            break
+
+    if analysis is None:
+        logger.warning("All screeners failed for %s", tv_symbol)
+        screener_failures.inc()
+        screener_memo.record_failure(tv_symbol)
+        return None
+
+    data = _build_market_data(analysis, exchange, symbol, display_name)
+    if data is not None:
+        _record_history(tv_symbol, interval, data)
+    return data
+
+
+def fetch_analysis(
+    tv_symbol: str,
+    interval: str = "1d",
+    display_name: str = "",
+) -> MarketData | None:
+    """Fetch technical analysis data from TradingView.
+
+    Args:
+        tv_symbol: TradingView symbol in 'EXCHANGE:SYMBOL' format.
+        interval: Time interval string (e.g. '1d', '1h').
+        display_name: Human-readable name for the asset.
+
+    Returns:
+        MarketData instance or None if the fetch fails.
+    """
+    def load() -> MarketData | None:
+        data = _submit(_fetch_single, tv_symbol, interval, display_name).result()
+        _flush_memo()
+        return data
+
+    with metrics.stage("fetch_analysis"):
+        data = market_cache.get_or_load((tv_symbol, interval), load)
+    return _with_name(data, display_name) if data is not None else None
+
+
+def _fetch_intervals_single(
+    tv_symbol: str,
+    intervals: list[str],
+    display_name: str,
+) -> tuple[dict[str, MarketData], str | None]:
+    """Fetch one symbol on several intervals, walking the screener fallbacks.
+
+    Each candidate screener gets one request covering every interval; the
+    first one that knows the symbol on any interval wins. Runs on the
+    fetch pool.
+
+    Returns (interval -> MarketData, screener that answered or None).
+    """
+    exchange, _symbol = _parse_exchange_symbol(tv_symbol)
+    primary_screener = _primary_screener(tv_symbol)
+    tv_intervals = list(dict.fromkeys(INTERVAL_MAP.get(i, Interval.INTERVAL_1_DAY) for i in intervals))
+
+    screeners_to_try = screener_memo.candidates(
+        tv_symbol, primary_screener, SCREENER_FALLBACKS.get(primary_screener, [])
+    )
+    # Unprefixed symbols cannot go in a scan request; leave them to _fetch_single
+    if not exchange or not screeners_to_try:
+        return {}, None
+
+    for screener in screeners_to_try:
+        analyses = _try_fetch_intervals(screener, tv_symbol, tv_intervals)
+        if analyses and any(a is not None for a in analyses.values()):
+            break
+    else:
+        logger.warning("All screeners failed for %s", tv_symbol)
+        screener_failures.inc()
+        screener_memo.record_failure(tv_symbol)
+        return {}, None
+
+    return _settle_intervals(tv_symbol, intervals, display_name, screener, analyses), screener
+
+
+def _settle_intervals(
+    tv_symbol: str,
+    intervals: list[str],
+    display_name: str,
+    screener: str,
+    analyses: dict,
+) -> dict[str, MarketData]:
+    """Turn a successful multi-interval scan into interval -> MarketData.
+
+    Records the screener in the memo and each snapshot in history.
+    """
+    exchange, symbol = _parse_exchange_symbol(tv_symbol)
+    primary = _primary_screener(tv_symbol)
+    screener_memo.record_success(tv_symbol, screener)
+    if screener != primary:
+        fallback_hits.inc(primary=primary, screener=screener)
+
+    results: dict[str, MarketData] = {}
+    for interval in intervals:
+        analysis = analyses.get(INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY))
+        data = _build_market_data(analysis, exchange, symbol, display_name) if analysis is not None else None
+        if data is not None:
+            _record_history(tv_symbol, interval, data)
+            results[interval] = data
+    return results
+
+
+def fetch_intervals(
+    tv_symbol: str,
+    intervals: list[str],
+    display_name: str = "",
+) -> dict[str, MarketData]:
+    """Fetch one symbol on several intervals at once.
+
+    Cached intervals are served from ``market_cache``; the rest are
+    fetched with one scan request per screener tried, instead of one
+    request per interval. Intervals missing from that response are
+    retried one by one.
+
+    Args:
+        tv_symbol: TradingView symbol in 'EXCHANGE:SYMBOL' format.
+        intervals: Interval strings (e.g. ['1h', '4h', '1d']).
+        display_name: Human-readable name for the asset.
+
+    Returns:
+        Dict of interval -> MarketData for successful fetches, in
+        ``intervals`` order.
+    """
+    cache_keys = {interval: (tv_symbol, interval) for interval in intervals}
+
+    def load(missing: list[tuple[str, str]]) -> dict[tuple[str, str], MarketData]:
+        wanted = [interval for _, interval in missing]
+        fetched, screener = _submit(_fetch_intervals_single, tv_symbol, wanted, display_name).result()
+        retries = {
+            interval: _submit(_fetch_single, tv_symbol, interval, display_name, screener)
+            for interval in wanted if interval not in fetched
+        }
+        for interval, future in retries.items():
+            data = future.result()
+            if data is not None:
+                fetched[interval] = data
+        _flush_memo()
+        return {cache_keys[interval]: data for interval, data in fetched.items()}
+
+    with metrics.stage("fetch_intervals"):
+        cached = market_cache.get_many_or_load(cache_keys.values(), load)
+
+    return {
+        interval: _with_name(cached[ck], display_name)
+        for interval, ck in cache_keys.items() if ck in cached
+    }
+
+
+def _group_by_screener(
+    symbols: dict[str, tuple[str, str]],
+) -> tuple[dict[str, list[str]], dict[str, str | None]]:
+    """Plan a batched fetch: (screener -> keys, keys to fetch one by one).
+
+    Keys are grouped by learned (or primary) screener; symbols without an
+    exchange prefix cannot be batched and go straight to the single-symbol
+    path. Negatively cached symbols are skipped.
+    """
+    groups: dict[str, list[str]] = {}
+    pending: dict[str, str | None] = {}
+    for key, (tv_symbol, _) in symbols.items():
+        exchange, _symbol = _parse_exchange_symbol(tv_symbol)
+        if not exchange:
+            pending[key] = None
+            continue
+        screener = screener_memo.resolve(tv_symbol, _primary_screener(tv_symbol))
+        if screener is not None:
+            groups.setdefault(screener, []).append(key)
+    return groups, pending
+
+
+def _settle_batch(
+    symbols: dict[str, tuple[str, str]],
+    keys: list[str],
+    screener: str,
+    analyses: dict | None,
+    interval: str,
+) -> tuple[list[tuple[str, MarketData]], list[tuple[str, str | None]]]:
+    """Split one screener batch result into (key, MarketData) pairs and retries.
+
+    Retries are (key, screener to skip) pairs for the single-symbol path.
+    """
+    ready: list[tuple[str, MarketData]] = []
+    retry: list[tuple[str, str | None]] = []
+    for key in keys:
+        tv_symbol, display_name = symbols[key]
+        if analyses is None:
+            # Whole request failed; the screener itself is not known bad
+            retry.append((key, None))
+            continue
+        analysis = analyses.get(tv_symbol.upper())
+        data = None
+        if analysis is not None:
+            exchange, symbol = _parse_exchange_symbol(tv_symbol)
+            data = _build_market_data(analysis, exchange, symbol, display_name)
+        if data is None:
+            retry.append((key, screener))
+        else:
+            screener_memo.record_success(tv_symbol, screener)
+            primary = _primary_screener(tv_symbol)
+            if screener != primary:
+                fallback_hits.inc(primary=primary, screener=screener)
+            _record_history(tv_symbol, interval, data)
+            ready.append((key, data))
+    return ready, retry
+
+
+def _iter_batch(
+    symbols: dict[str, tuple[str, str]],
+    interval: str,
+) -> Iterator[tuple[str, MarketData]]:
+    """Fetch several symbols from TradingView, bypassing the cache.
+
+    Symbols are grouped by screener and each group is fetched with a
+    single scan request; the groups run concurrently on the shared fetch
+    pool. Symbols missing from their batch response are retried one by
+    one with screener fallbacks. Every upstream request draws from the
+    process-wide rate limiter.
+
+    Yields (key, MarketData) pairs as soon as each request completes.
+    """
+    tv_interval = INTERVAL_MAP.get(interval, Interval.INTERVAL_1_DAY)
+    groups, pending = _group_by_screener(symbols)
+
+    def submit_single(key: str, skip: str | None) -> Future:
+        return _submit(_fetch_single, symbols[key][0], interval, symbols[key][1], skip)
+
+    # future -> ("batch", screener) or ("single", key)
+    futures: dict[Future, tuple[str, str]] = {
+        _submit(
+            _try_fetch_multiple, screener, [symbols[k][0] for k in keys], tv_interval
+        ): ("batch", screener)
+        for screener, keys in groups.items()
+    }
+    for key, skip in pending.items():
+        futures[submit_single(key, skip)] = ("single", key)
+
+    try:
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, ref = futures.pop(future)
+                if kind == "single":
+                    data = future.result()
+                    if data is not None:
+                        yield ref, data
+                    continue
+
+                ready, retry = _settle_batch(symbols, groups[ref], ref, future.result(), interval)
+                for key, skip in retry:
+                    futures[submit_single(key, skip)] = ("single", key)
+                yield from ready
+            _flush_memo(MEMO_FLUSH_INTERVAL)
+    finally:
+        _flush_memo()
+
+
+def _fetch_batch(
+    symbols: dict[str, tuple[str, str]],
+    interval: str,
+) -> dict[str, MarketData]:
+    """Fetch several symbols from TradingView, bypassing the cache (see ``_iter_batch``)."""
+    return dict(_iter_batch(symbols, interval))
+
 
 def fetch_multiple(
     symbols: dict[str, tuple[str, str]],
@@ -160,6 +601,9 @@ def fetch_multiple(
 ) -> dict[str, MarketData]:
     """Fetch analysis for multiple symbols.
 
+    Cached symbols are served from ``market_cache``; the rest are fetched
+    together in one batched pass (see ``_fetch_batch``).
+
     Args:
         symbols: Mapping of key -> (tv_symbol, display_name).
         interval: Time interval.
@@ -167,11 +611,82 @@ def fetch_multiple(
     Returns:
         Dict of key -> MarketData for successful fetches.
     """
+    cache_keys = {key: (tv_symbol, interval) for key, (tv_symbol, _) in symbols.items()}
+
+    def load(missing: list[tuple[str, str]]) -> dict[tuple[str, str], MarketData]:
+        wanted = set(missing)
+        to_fetch = {key: symbols[key] for key, ck in cache_keys.items() if ck in wanted}
+        fetched = _fetch_batch(to_fetch, interval)
+        return {cache_keys[key]: data for key, data in fetched.items()}
+
+    with metrics.stage("fetch_multiple"):
+        cached = market_cache.get_many_or_load(cache_keys.values(), load)
+
+    # Preserve the caller's symbol order
     results: dict[str, MarketData] = {}
     for key, (tv_symbol, display_name) in symbols.items():
-        data = fetch_analysis(tv_symbol, interval, display_name)
+        data = cached.get(cache_keys[key])
         if data is not None:
-            results[key] = data
-        # Small delay to avoid rate-limiting
-        time.sleep(0.2)
+            results[key] = _with_name(data, display_name)
     return results
+
+
+def iter_multiple(
+    symbols: dict[str, tuple[str, str]],
+    interval: str = "1d",
+) -> Iterator[tuple[str, MarketData]]:
+    """Like ``fetch_multiple`` but yields (key, MarketData) as results arrive.
+
+    Cached symbols are yielded first; the rest follow as each screener
+    batch or fallback request completes.
+    """
+    misses: dict[str, tuple[str, str]] = {}
+    for key, (tv_symbol, display_name) in symbols.items():
+        data = market_cache.get((tv_symbol, interval))
+        if data is not None:
+            yield key, _with_name(data, display_name)
+        else:
+            misses[key] = (tv_symbol, display_name)
+
+    for key, data in _iter_batch(misses, interval):
+        market_cache.put((misses[key][0], interval), data)
+        yield key, data
+
+
+def refresh_multiple(
+    symbols: dict[str, tuple[str, str]],
+    interval: str = "1d",
+) -> dict[str, MarketData]:
+    """Fetch symbols from TradingView ignoring cached entries.
+
+    Fresh results are written back into ``market_cache`` so regular
+    readers pick them up. Used by the background prefetch scheduler.
+    """
+    with metrics.stage("refresh_multiple"):
+        fetched = _fetch_batch(symbols, interval)
+    for key, data in fetched.items():
+        market_cache.put((symbols[key][0], interval), data)
+    return {key: fetched[key] for key in symbols if key in fetched}
+
+
+def warm_cache_from_history() -> int:
+    """Seed ``market_cache`` with history snapshots still within their TTL.
+
+    Lets a restarted process serve recent data without refetching.
+    Returns the number of entries loaded.
+    """
+    from src.data.history import get_history_store
+
+    store = get_history_store()
+    if store is None:
+        return 0
+
+    now = time.time()
+    loaded = 0
+    for interval, ttl in CACHE_TTL.items():
+        for tv_symbol, (ts, data) in store.latest(interval, since=now - ttl).items():
+            market_cache.put((tv_symbol, interval), data, ttl=ttl - (now - ts))
+            loaded += 1
+    if loaded:
+        logger.info("Warmed market data cache with %d snapshots from history", loaded)
+    return loaded
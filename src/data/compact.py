@@ -0,0 +1,195 @@
+"""Compact read-only mappings for per-symbol market data.
+
+Every TradingView snapshot carries the same ~90 indicator columns and the
+same few signal keys. Instead of one dict per symbol, the keys live once
+in an interned ``KeySchema`` and each symbol keeps only its values:
+indicators in a float64 array (missing values as NaN), signal blocks in
+a tuple. Both behave like read-only dicts (``get``, ``[]``, ``in``,
+iteration, ``dict(...)``); indicator values are unboxed to Python
+floats only when read.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+_schemas: dict[tuple[str, ...], "KeySchema"] = {}
+_schemas_lock = threading.Lock()
+
+
+class KeySchema:
+    """An ordered key set shared by every mapping with the same keys."""
+
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def key_schema(keys: Iterable[str]) -> KeySchema:
+    """Return the interned schema for ``keys`` (in order)."""
+    keys = tuple(keys)
+    schema = _schemas.get(keys)
+    if schema is None:
+        with _schemas_lock:
+            schema = _schemas.setdefault(keys, KeySchema(keys))
+    return schema
+
+
+class Indicators(Mapping):
+    """Read-only indicator values backed by a float64 array.
+
+    Keys present with a ``None`` value in the source dict stay present and
+    read back as ``None``, like the dict they replace; numbers read back
+    as floats.
+    """
+
+    __slots__ = ("schema", "_values")
+
+    def __init__(self, schema: KeySchema, values: array):
+        self.schema = schema
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, raw: Mapping) -> Mapping:
+        """Compact an indicator dict; non-numeric dicts become a ``Record``."""
+        if isinstance(raw, (Indicators, Record)):
+            return raw
+        try:
+            values = array("d", [math.nan if v is None else v for v in raw.values()])
+        except TypeError:
+            return Record.from_dict(raw)
+        return cls(key_schema(raw), values)
+
+    def __getitem__(self, key: str) -> float | None:
+        value = self._values[self.schema.index[key]]
+        return None if value != value else value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self.schema.index.get(key)
+        if i is None:
+            return default
+        value = self._values[i]
+        return None if value != value else value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.keys)
+
+    def __len__(self) -> int:
+        return len(self.schema.keys)
+
+    def __repr__(self) -> str:
+        return f"Indicators({dict(self)!r})"
+
+    def __reduce__(self):
+        return _restore_indicators, (self.schema.keys, self._values.tobytes())
+
+    def as_array(self) -> np.ndarray:
+        """Read-only float64 view of the values in schema order, NaN for missing."""
+        view = np.frombuffer(self._values, dtype=np.float64)
+        view.flags.writeable = False
+        return view
+
+
+def _restore_indicators(keys: tuple[str, ...], raw: bytes) -> Indicators:
+    values = array("d")
+    values.frombytes(raw)
+    return Indicators(key_schema(keys), values)
+
+
+def indicator_matrix(indicators: list[Mapping], keys: list[str]) -> np.ndarray:
+    """Stack indicator mappings into an (n, len(keys)) float64 matrix, NaN for missing.
+
+    Rows sharing a schema are gathered with one fancy-index per schema
+    instead of a ``get`` per value.
+    """
+    out = np.full((len(indicators), len(keys)), np.nan)
+    by_schema: dict[int, tuple[KeySchema, list[int]]] = {}
+    for row, ind in enumerate(indicators):
+        if isinstance(ind, Indicators):
+            by_schema.setdefault(id(ind.schema), (ind.schema, []))[1].append(row)
+        else:
+            out[row] = [np.nan if (v := ind.get(key)) is None else v for key in keys]
+
+    for schema, rows in by_schema.values():
+        cols = [j for j, key in enumerate(keys) if key in schema.index]
+        src = [schema.index[keys[j]] for j in cols]
+        values = np.stack([np.frombuffer(indicators[row]._values, dtype=np.float64) for row in rows])
+        out[np.ix_(rows, cols)] = values[:, src]
+    return out
+
+
+class Record(Mapping):
+    """Read-only mapping of arbitrary values over a shared ``KeySchema``.
+
+    Used for the oscillator, moving-average and summary blocks; nested
+    dicts (``COMPUTE``) are compacted too.
+    """
+
+    __slots__ = ("schema", "_values")
+
+    def __init__(self, schema: KeySchema, values: tuple):
+        self.schema = schema
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, raw: Mapping) -> "Record":
+        if isinstance(raw, Record):
+            return raw
+        values = tuple(
+            cls.from_dict(v) if isinstance(v, Mapping) else v for v in raw.values()
+        )
+        return cls(key_schema(raw), values)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self.schema.index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self.schema.index.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.keys)
+
+    def __len__(self) -> int:
+        return len(self.schema.keys)
+
+    def __repr__(self) -> str:
+        return f"Record({dict(self)!r})"
+
+    def __reduce__(self):
+        return _restore_record, (self.schema.keys, self._values)
+
+    def to_dict(self) -> dict:
+        """Plain nested dict copy (e.g. for JSON)."""
+        return {
+            key: value.to_dict() if isinstance(value, Record) else value
+            for key, value in zip(self.schema.keys, self._values)
+        }
+
+
+def _restore_record(keys: tuple[str, ...], values: tuple) -> Record:
+    return Record(key_schema(keys), values)
+
+
+def to_plain(mapping: Mapping) -> dict:
+    """Plain dict copy of a compact (or regular) mapping, nested blocks included."""
+    if isinstance(mapping, Record):
+        return mapping.to_dict()
+    return dict(mapping)
@@ -0,0 +1,360 @@
+"""Append-only local store of fetched indicator snapshots.
+
+Every MarketData fetched from TradingView is recorded in a SQLite
+database (WAL mode) keyed by symbol, interval and timestamp. Writes are
+queued and committed in batches by a background thread so the fetch hot
+path never waits on disk.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from operator import itemgetter
+
+import numpy as np
+
+from src.config import HISTORY_ENABLED, HISTORY_PATH
+from src.data.collector import MarketData
+from src.data.compact import to_plain
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    tv_symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    name TEXT NOT NULL,
+    close REAL,
+    open REAL,
+    high REAL,
+    low REAL,
+    volume REAL,
+    change REAL,
+    change_pct REAL,
+    indicators TEXT NOT NULL,
+    oscillators TEXT NOT NULL,
+    moving_averages TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (tv_symbol, interval, ts)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_interval_ts ON snapshots (interval, ts);
+"""
+
+_COLUMNS = (
+    "tv_symbol, interval, ts, symbol, exchange, name, close, open, high, low, "
+    "volume, change, change_pct, indicators, oscillators, moving_averages, summary"
+)
+
+
+# Text that cannot occur in a JSON array holding only numbers and nulls
+_NON_NUMERIC = ('"', "true", "false", "{")
+
+
+def _number_rows(arrays: list[str], width: int) -> tuple[np.ndarray, list[int]]:
+    """Parse JSON arrays of numbers into a (rows, width) float64 matrix.
+
+    Missing and non-numeric values become NaN. Returns the matrix and the
+    row numbers that held a non-numeric value.
+    """
+    text = ",".join(arrays)
+    if text.count("[") == len(arrays) and not any(token in text for token in _NON_NUMERIC):
+        # Only numbers and nulls: parse all rows in one go
+        flat = np.fromstring(text.replace("[", "").replace("]", "").replace("null", "nan"), sep=",")
+        if flat.size == len(arrays) * width:
+            return flat.reshape(len(arrays), width), []
+
+    values = np.full((len(arrays), width), np.nan)
+    malformed = []
+    for i, array in enumerate(arrays):
+        row = json.loads(array)
+        bad = len(row) != width
+        for j, value in enumerate(row[:width]):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[i, j] = value
+            elif value is not None:
+                bad = True
+        if bad:
+            malformed.append(i)
+    return values, malformed
+
+
+def _to_row(tv_symbol: str, interval: str, ts: float, data: MarketData) -> tuple:
+    return (
+        tv_symbol, interval, ts, data.symbol, data.exchange, data.name,
+        data.close, data.open_price, data.high, data.low,
+        data.volume, data.change, data.change_pct,
+        json.dumps(to_plain(data.indicators)),
+        json.dumps(to_plain(data.oscillators)),
+        json.dumps(to_plain(data.moving_averages)),
+        json.dumps(to_plain(data.summary)),
+    )
+
+
+def _from_row(row: tuple) -> tuple[str, float, MarketData]:
+    (tv_symbol, _interval, ts, symbol, exchange, name, close, open_price, high, low,
+     volume, change, change_pct, indicators, oscillators, moving_averages, summary) = row
+    data = MarketData(
+        symbol=symbol,
+        exchange=exchange,
+        name=name,
+        close=close,
+        open_price=open_price,
+        high=high,
+        low=low,
+        volume=volume,
+        change=change,
+        change_pct=change_pct,
+        indicators=json.loads(indicators),
+        oscillators=json.loads(oscillators),
+        moving_averages=json.loads(moving_averages),
+        summary=json.loads(summary),
+    )
+    return tv_symbol, ts, data
+
+
+class HistoryStore:
+    """SQLite-backed snapshot history with a batched background writer."""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        max_queue: int = 100_000,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ── Writes ──
+
+    def record(self, tv_symbol: str, interval: str, data: MarketData, ts: float | None = None) -> None:
+        """Queue a snapshot for writing. Never blocks; drops if the queue is full or closed."""
+        if self._closed.is_set():
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((tv_symbol, interval, ts if ts is not None else time.time(), data))
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while not (self._closed.is_set() and self._queue.empty()):
+                batch = []
+                deadline = None
+                while len(batch) < self.batch_size:
+                    timeout = self.flush_interval if deadline is None else deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        # flush() or close(): write what we have now
+                        self._queue.task_done()
+                        break
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                if batch:
+                    self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        try:
+            rows = [_to_row(*item) for item in batch]
+            with conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO snapshots ({_COLUMNS}) VALUES ({', '.join('?' * 17)})",
+                    rows,
+                )
+        except Exception:
+            logger.exception("Failed to write %d history snapshots", len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued snapshot has been written."""
+        if self._writer.is_alive():
+            # Wakes the writer instead of waiting out flush_interval
+            self._queue.put(None)
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write every queued snapshot, then stop the writer (idempotent).
+
+        The writer's connection is closed when it stops. Registered with
+        ``atexit`` for the process-wide store, so short-lived processes do
+        not lose queued snapshots.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._queue.put(None)
+        self._writer.join()
+
+    # ── Reads ──
+
+    def query(
+        self,
+        tv_symbol: str,
+        interval: str,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[float, MarketData]]:
+        """Snapshots for one symbol/interval in ``[start, end]``, oldest first."""
+        sql = f"SELECT {_COLUMNS} FROM snapshots WHERE tv_symbol = ? AND interval = ?"
+        params: list = [tv_symbol, interval]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(end)
+        if limit is not None:
+            # Keep the newest ``limit`` rows, still returned oldest first
+            sql = f"SELECT * FROM ({sql} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            params.append(limit)
+        else:
+            sql += " ORDER BY ts"
+        with self._connect() as conn:
+            return [(ts, data) for _, ts, data in map(_from_row, conn.execute(sql, params))]
+
+    def snapshots(self, interval: str) -> list[tuple[str, float, MarketData]]:
+        """Every (tv_symbol, ts, MarketData) recorded for ``interval``, by symbol then time."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM snapshots WHERE interval = ? ORDER BY tv_symbol, ts",
+                (interval,),
+            )
+            return list(map(_from_row, rows))
+
+    def latest(self, interval: str, since: float | None = None) -> dict[str, tuple[float, MarketData]]:
+        """Most recent snapshot per symbol for ``interval`` (optionally newer than ``since``)."""
+        sql = (
+            f"SELECT {_COLUMNS} FROM snapshots s WHERE interval = ? AND ts = "
+            "(SELECT MAX(ts) FROM snapshots WHERE tv_symbol = s.tv_symbol AND interval = s.interval)"
+        )
+        params: list = [interval]
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        with self._connect() as conn:
+            return {tv_symbol: (ts, data) for tv_symbol, ts, data in map(_from_row, conn.execute(sql, params))}
+
+    def indicator_columns(
+        self,
+        interval: str,
+        keys: list[str],
+        start: float | None = None,
+        end: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Every snapshot for ``interval`` as column arrays, by symbol then time.
+
+        For bulk reads (backtests over years of history): SQLite extracts
+        only the ``keys`` indicators, parsing each row's JSON once, and the
+        values are converted to arrays without building a MarketData per
+        row.
+
+        Returns:
+            (tv_symbol, ts, close, summary recommendation, values), where
+            ``values`` is a (rows, len(keys)) float64 matrix, NaN for missing
+            or non-numeric values.
+        """
+        # With a single path json_extract returns the bare value, not an array
+        paths = [f'$."{key}"' for key in keys] * (2 if len(keys) == 1 else 1)
+        sql = (
+            "SELECT tv_symbol, ts, close, json_extract(summary, '$.RECOMMENDATION'), "
+            f"json_extract(indicators, {', '.join('?' * len(paths))}) "
+            "FROM snapshots WHERE interval = ?"
+        )
+        params: list = [*paths, interval]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(end)
+        # Sorted below with numpy: an ORDER BY here sorts the JSON-carrying
+        # rows in a temporary B-tree, which is slower than the query itself
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        n = len(rows)
+        if not n:
+            empty = np.empty(0)
+            return np.empty(0, dtype=str), empty, empty, np.empty(0, dtype=str), np.empty((0, len(keys)))
+        tv_symbols = np.array(list(map(itemgetter(0), rows)))
+        ts = np.fromiter(map(itemgetter(1), rows), dtype=np.float64, count=n)
+        close = np.array(list(map(itemgetter(2), rows)), dtype=np.float64)
+        summaries = np.array(list(map(itemgetter(3), rows)), dtype=str)
+        values, malformed = _number_rows(list(map(itemgetter(4), rows)), len(paths))
+        values = values[:, :len(keys)]
+        if malformed:
+            first = rows[malformed[0]]
+            logger.warning(
+                "%d %s snapshots have non-numeric indicator values, read as missing (first: %s at %s)",
+                len(malformed), interval, first[0], first[1],
+            )
+        order = np.lexsort((ts, tv_symbols))
+        return tv_symbols[order], ts[order], close[order], summaries[order], values[order]
+
+    def symbols(self, interval: str) -> list[str]:
+        """Distinct symbols recorded for ``interval``."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT tv_symbol FROM snapshots WHERE interval = ? ORDER BY tv_symbol",
+                (interval,),
+            )
+            return [row[0] for row in rows]
+
+
+_store: HistoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore | None:
+    """Process-wide history store, or None when HISTORY_ENABLED is off."""
+    global _store
+    if not HISTORY_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = HistoryStore(HISTORY_PATH)
+                atexit.register(_store.close)
+    return _store
@@ -0,0 +1,68 @@
+"""Process-wide rate limiting for upstream TradingView requests."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Every upstream request takes one token, blocking until one is
+    available. A non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _take(self, tokens: float) -> float:
+        """Take ``tokens`` if available. Returns 0, or the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> bool:
+        """Take ``tokens`` from the bucket, waiting for a refill if needed.
+
+        Returns:
+            True once the tokens were taken, False if ``timeout`` expired.
+        """
+        if self.rate <= 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """Like ``acquire``, but waits on the event loop instead of blocking."""
+        import asyncio
+
+        if self.rate <= 0:
+            return
+        while wait := self._take(tokens):
+            await asyncio.sleep(wait)
@@ -0,0 +1,76 @@
+"""TradingView scanner request building and response parsing.
+
+Used by collectors that issue the scan POST themselves instead of going
+through tradingview_ta's helpers; the payload, headers and indicator
+columns match what ``get_multiple_analysis`` sends.
+"""
+
+from __future__ import annotations
+
+from tradingview_ta import __version__ as _tv_version
+from tradingview_ta.main import TradingView, calculate
+
+SCAN_HEADERS = {"User-Agent": f"tradingview_ta/{_tv_version}"}
+
+# Columns requested for every symbol, in response order
+INDICATOR_KEYS = list(TradingView.indicators)
+
+
+def scan_url(screener: str) -> str:
+    """Scanner endpoint for a screener (e.g. 'america', 'crypto')."""
+    return f"{TradingView.scan_url}{screener.lower()}/scan"
+
+
+def scan_payload(tv_symbols: list[str], tv_interval: str) -> dict:
+    """JSON body of a scan request for 'EXCHANGE:SYMBOL' tickers."""
+    return TradingView.data(tv_symbols, tv_interval, INDICATOR_KEYS)
+
+
+def scan_payload_intervals(tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+    """JSON body of one scan request covering several intervals.
+
+    The scanner takes per-interval columns ('RSI|60', 'RSI|240', ...) side
+    by side, so every timeframe comes back in the same response.
+    """
+    payload = scan_payload(tv_symbols, tv_intervals[0])
+    for tv_interval in tv_intervals[1:]:
+        payload["columns"] += scan_payload(tv_symbols, tv_interval)["columns"]
+    return payload
+
+
+def parse_scan(body: dict, screener: str, tv_interval: str, tv_symbols: list[str]) -> dict:
+    """Turn a scan response into upper-cased 'EXCHANGE:SYMBOL' -> Analysis.
+
+    Requested symbols missing from the response map to None.
+    """
+    return parse_scan_intervals(body, screener, [tv_interval], tv_symbols)[tv_interval]
+
+
+def parse_scan_intervals(
+    body: dict,
+    screener: str,
+    tv_intervals: list[str],
+    tv_symbols: list[str],
+) -> dict[str, dict]:
+    """Split a ``scan_payload_intervals`` response per interval.
+
+    Returns tv_interval -> (upper-cased 'EXCHANGE:SYMBOL' -> Analysis or None).
+    """
+    width = len(INDICATOR_KEYS)
+    results: dict[str, dict] = {tv_interval: {} for tv_interval in tv_intervals}
+    for row in body["data"]:
+        exchange, symbol = row["s"].split(":", 1)
+        for i, tv_interval in enumerate(tv_intervals):
+            indicators = dict(zip(INDICATOR_KEYS, row["d"][i * width:(i + 1) * width]))
+            results[tv_interval][row["s"]] = calculate(
+                indicators=indicators,
+                indicators_key=INDICATOR_KEYS,
+                screener=screener,
+                symbol=symbol,
+                exchange=exchange,
+                interval=tv_interval,
+            )
+    for by_symbol in results.values():
+        for tv_symbol in tv_symbols:
+            by_symbol.setdefault(tv_symbol.upper(), None)
+    return results
@@ -0,0 +1,117 @@
+"""Learned screener resolution for TradingView symbols.
+
+Remembers which screener actually serves each EXCHANGE:SYMBOL so the
+collector does not re-probe failing screeners on every request. The
+mapping is kept in memory and persisted to a small JSON file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenerMemo:
+    """In-memory + on-disk memo of working screeners per symbol.
+
+    Symbols that failed on every screener are negatively cached for
+    ``negative_ttl`` seconds and skipped entirely until then.
+    """
+
+    def __init__(self, path: str | None, negative_ttl: float = 900.0):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._screeners: dict[str, str] = {}
+        self._failed: dict[str, float] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+            self._screeners = dict(payload.get("screeners", {}))
+            self._failed = {k: float(v) for k, v in payload.get("failed", {}).items()}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable screener memo %s - %s", self.path, e)
+
+    def candidates(self, tv_symbol: str, primary: str, fallbacks: list[str]) -> list[str]:
+        """Screeners to try for ``tv_symbol``, known-good first.
+
+        Returns an empty list while the symbol is negatively cached.
+        """
+        key = tv_symbol.upper()
+        with self._lock:
+            failed_at = self._failed.get(key)
+            if failed_at is not None:
+                if time.time() - failed_at < self.negative_ttl:
+                    return []
+                del self._failed[key]
+                self._dirty = True
+            known = self._screeners.get(key)
+
+        ordered = [primary] + fallbacks
+        if known is None:
+            return ordered
+        return [known] + [s for s in ordered if s != known]
+
+    def resolve(self, tv_symbol: str, primary: str) -> str | None:
+        """Best screener for a batch request, or None if negatively cached."""
+        key = tv_symbol.upper()
+        with self._lock:
+            failed_at = self._failed.get(key)
+            if failed_at is not None and time.time() - failed_at < self.negative_ttl:
+                return None
+            return self._screeners.get(key, primary)
+
+    def record_success(self, tv_symbol: str, screener: str) -> None:
+        key = tv_symbol.upper()
+        with self._lock:
+            if self._screeners.get(key) != screener or key in self._failed:
+                self._screeners[key] = screener
+                self._failed.pop(key, None)
+                self._dirty = True
+
+    def record_failure(self, tv_symbol: str) -> None:
+        """Mark a symbol as failing on every screener."""
+        key = tv_symbol.upper()
+        with self._lock:
+            self._failed[key] = time.time()
+            self._screeners.pop(key, None)
+            self._dirty = True
+
+    def flush(self, min_interval: float = 0.0) -> None:
+        """Persist pending changes to disk.
+
+        Args:
+            min_interval: Skip the write if the file was saved less than
+                this many seconds ago (changes stay pending).
+        """
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            if time.monotonic() - self._saved_at < min_interval:
+                return
+            payload = {"screeners": dict(self._screeners), "failed": dict(self._failed)}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save screener memo %s - %s", self.path, e)
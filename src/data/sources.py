@@ -0,0 +1,346 @@
+"""Pluggable sources of indicator data for the collector.
+
+The collector asks a ``DataSource`` for scan results and never talks to
+TradingView directly. Three sources ship with the program:
+
+  * ``TradingViewSource`` - live scanner requests (the default)
+  * ``ReplaySource`` - snapshots recorded in the history database,
+    replayed in order at full speed
+  * ``SyntheticSource`` - generated indicator sets for any number of
+    symbols, deterministic for a given seed
+
+Offline sources (``live = False``) bypass the rate limiter and are not
+recorded into the history store. Select one with the DATA_SOURCE
+setting or ``set_source``.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import zlib
+from typing import Protocol
+
+from tradingview_ta.main import Analysis, calculate
+
+from src.config import DATA_SOURCE, REPLAY_PATH, SYNTHETIC_SEED
+from src.data.scan import INDICATOR_KEYS
+
+
+class DataSource(Protocol):
+    """Where the collector gets indicator data from."""
+
+    name: str
+    # Network-backed: rate limited, and fetched snapshots go to history
+    live: bool
+
+    def scan(self, screener: str, tv_symbols: list[str], tv_interval: str) -> dict:
+        """Analyses for 'EXCHANGE:SYMBOL' tickers on one screener.
+
+        Returns upper-cased 'EXCHANGE:SYMBOL' -> tradingview_ta Analysis,
+        with None for unknown symbols. Raises if the request itself fails.
+        """
+        ...
+
+    def scan_intervals(self, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+        """Like ``scan`` for several intervals at once.
+
+        Returns tv_interval -> (upper-cased 'EXCHANGE:SYMBOL' -> Analysis
+        or None). Live sources answer with a single upstream request.
+        """
+        ...
+
+
+class TradingViewSource:
+    """Live TradingView scanner over the pooled transport."""
+
+    name = "tradingview"
+    live = True
+
+    def scan(self, screener: str, tv_symbols: list[str], tv_interval: str) -> dict:
+        from src.data.transport import get_transport
+
+        return get_transport().scan(screener, tv_symbols, tv_interval)
+
+    def scan_intervals(self, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+        from src.data.transport import get_transport
+
+        return get_transport().scan_intervals(screener, tv_symbols, tv_intervals)
+
+
+def _scan_each(source: DataSource, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+    """``scan_intervals`` for offline sources: one ``scan`` per interval."""
+    return {tv_interval: source.scan(screener, tv_symbols, tv_interval) for tv_interval in tv_intervals}
+
+
+class ReplaySource:
+    """Replays recorded history snapshots, oldest first, looping at the end.
+
+    Each scan returns the next recorded snapshot of every requested
+    symbol, so repeated refreshes walk through the recording. An
+    interval's snapshots are loaded into memory on first use.
+    """
+
+    name = "replay"
+    live = False
+
+    def __init__(self, path: str = REPLAY_PATH):
+        self.path = path
+        self._snapshots: dict[str, dict[str, list]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, interval: str) -> dict[str, list]:
+        from src.data.history import HistoryStore, get_history_store
+        from src.config import HISTORY_PATH
+
+        snapshots = self._snapshots.get(interval)
+        if snapshots is None:
+            store = get_history_store() if self.path == HISTORY_PATH else None
+            store = store or HistoryStore(self.path)
+            snapshots = {}
+            for tv_symbol, _ts, data in store.snapshots(interval):
+                snapshots.setdefault(tv_symbol.upper(), []).append(data)
+            self._snapshots[interval] = snapshots
+        return snapshots
+
+    def scan(self, screener: str, tv_symbols: list[str], tv_interval: str) -> dict:
+        results = {}
+        with self._lock:
+            snapshots = self._load(tv_interval)
+            for tv_symbol in tv_symbols:
+                tv_symbol = tv_symbol.upper()
+                recorded = snapshots.get(tv_symbol)
+                if not recorded:
+                    results[tv_symbol] = None
+                    continue
+                cursor = self._cursors.get((tv_symbol, tv_interval), 0)
+                self._cursors[(tv_symbol, tv_interval)] = (cursor + 1) % len(recorded)
+                results[tv_symbol] = _to_analysis(recorded[cursor], screener, tv_interval)
+        return results
+
+    def scan_intervals(self, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+        return _scan_each(self, screener, tv_symbols, tv_intervals)
+
+
+def _to_analysis(data, screener: str, tv_interval: str) -> Analysis:
+    """Wrap a recorded MarketData as the Analysis a scan would return."""
+    analysis = Analysis()
+    analysis.screener = screener
+    analysis.exchange = data.exchange
+    analysis.symbol = data.symbol
+    analysis.interval = tv_interval
+    analysis.indicators = dict(data.indicators)
+    analysis.oscillators = data.oscillators
+    analysis.moving_averages = data.moving_averages
+    analysis.summary = data.summary
+    return analysis
+
+
+class SyntheticSource:
+    """Generates plausible indicator sets for any symbol.
+
+    Each (symbol, interval) follows its own random walk with a slowly
+    drifting trend; oscillators, moving averages, pivots and bands are
+    derived from the trend so the recommendations tradingview_ta
+    computes from them are coherent. Every scan advances the walk by one
+    bar. Output depends only on ``seed`` and the sequence of scans.
+    """
+
+    name = "synthetic"
+    live = False
+
+    MA_PERIODS = (5, 10, 20, 30, 50, 100, 200)
+
+    def __init__(self, seed: int = SYNTHETIC_SEED):
+        self.seed = seed
+        # (tv_symbol, interval) -> [rng, price, trend, volatility]
+        self._walks: dict[tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def _step(self, tv_symbol: str, tv_interval: str) -> tuple[random.Random, float, float, float]:
+        walk = self._walks.get((tv_symbol, tv_interval))
+        if walk is None:
+            rng = random.Random(zlib.crc32(f"{self.seed}:{tv_symbol}:{tv_interval}".encode()))
+            price = 10 ** rng.uniform(0, 4.5)
+            walk = [rng, price, rng.gauss(0, 0.35), rng.uniform(0.004, 0.03)]
+            self._walks[(tv_symbol, tv_interval)] = walk
+        rng, price, trend, vol = walk
+        trend = max(-1.0, min(1.0, 0.9 * trend + rng.gauss(0, 0.15)))
+        price *= math.exp(vol * (0.3 * trend + rng.gauss(0, 1)))
+        walk[1], walk[2] = price, trend
+        return rng, price, trend, vol
+
+    def _indicators(self, tv_symbol: str, tv_interval: str) -> dict:
+        rng, close, trend, vol = self._step(tv_symbol, tv_interval)
+        gauss = rng.gauss
+
+        def clip(x: float, lo: float, hi: float) -> float:
+            return max(lo, min(hi, x))
+
+        def sign(x: float, band: float = 0.0) -> int:
+            return 1 if x > band else -1 if x < -band else 0
+
+        open_price = close / (1 + gauss(trend * vol * 0.3, vol))
+        high = max(open_price, close) * (1 + abs(gauss(0, vol / 2)))
+        low = min(open_price, close) * (1 - abs(gauss(0, vol / 2)))
+
+        mas = {}
+        for n in self.MA_PERIODS:
+            offset = trend * vol * math.sqrt(n) * 0.5
+            mas[f"EMA{n}"] = close * (1 - offset + gauss(0, vol * 0.6))
+            mas[f"SMA{n}"] = close * (1 - offset * 1.1 + gauss(0, vol * 0.6))
+
+        rsi = clip(50 + 25 * trend + gauss(0, 8), 1, 99)
+        stoch_k = clip(50 + 35 * trend + gauss(0, 12), 0, 100)
+        cci = 120 * trend + gauss(0, 40)
+        macd = close * vol * (trend + gauss(0, 0.2))
+        mom = close * vol * 3 * (trend + gauss(0, 0.3))
+        ao = close * vol * 2 * (trend + gauss(0, 0.3))
+        stoch_rsi = clip(50 + 40 * trend + gauss(0, 15), 0, 100)
+        wr = clip(-100 + stoch_k + gauss(0, 5), -100, 0)
+        uo = clip(50 + 20 * trend + gauss(0, 8), 0, 100)
+        bbp = close * vol * (trend + gauss(0, 0.3))
+
+        rec_stoch_rsi = 1 if stoch_rsi < 20 and trend > 0 else -1 if stoch_rsi > 80 and trend < 0 else 0
+        rec_wr = 1 if wr < -80 else -1 if wr > -20 else 0
+        rec_bbp = sign(bbp, close * vol * 0.2)
+        rec_uo = 1 if uo > 70 else -1 if uo < 30 else 0
+        oscillator_votes = [
+            1 if rsi < 30 else -1 if rsi > 70 else 0,
+            1 if stoch_k < 20 else -1 if stoch_k > 80 else 0,
+            1 if cci < -100 else -1 if cci > 100 else 0,
+            sign(macd), sign(mom), sign(ao), rec_stoch_rsi, rec_wr, rec_bbp, rec_uo,
+        ]
+
+        ichimoku = close * (1 - trend * vol + gauss(0, vol * 0.3))
+        vwma = close * (1 - trend * vol * 1.5 + gauss(0, vol * 0.3))
+        hull = close * (1 - trend * vol * 0.8 + gauss(0, vol * 0.3))
+        ma_votes = [sign(close - v) for v in (*mas.values(), ichimoku, vwma, hull)]
+
+        recommend_other = sum(oscillator_votes) / len(oscillator_votes)
+        recommend_ma = sum(ma_votes) / len(ma_votes)
+        pivot = close * (1 - trend * vol * 0.5)
+        sma20 = mas["SMA20"]
+
+        values = {
+            "Recommend.Other": recommend_other,
+            "Recommend.All": (recommend_other + recommend_ma) / 2,
+            "Recommend.MA": recommend_ma,
+            "RSI": rsi,
+            "RSI[1]": clip(rsi - gauss(trend * 2, 3), 1, 99),
+            "Stoch.K": stoch_k,
+            "Stoch.D": clip(stoch_k - gauss(trend * 3, 4), 0, 100),
+            "Stoch.K[1]": clip(stoch_k - gauss(trend * 4, 5), 0, 100),
+            "Stoch.D[1]": clip(stoch_k - gauss(trend * 6, 5), 0, 100),
+            "CCI20": cci,
+            "CCI20[1]": cci - gauss(trend * 10, 15),
+            "ADX": clip(15 + 25 * abs(trend) + gauss(0, 4), 5, 80),
+            "ADX+DI": clip(20 + 10 * trend + gauss(0, 3), 1, 60),
+            "ADX-DI": clip(20 - 10 * trend + gauss(0, 3), 1, 60),
+            "ADX+DI[1]": clip(20 + 9 * trend + gauss(0, 3), 1, 60),
+            "ADX-DI[1]": clip(20 - 9 * trend + gauss(0, 3), 1, 60),
+            "AO": ao,
+            "AO[1]": ao - close * vol * gauss(trend * 0.2, 0.2),
+            "Mom": mom,
+            "Mom[1]": mom - close * vol * gauss(trend * 0.3, 0.3),
+            "MACD.macd": macd,
+            "MACD.signal": macd - close * vol * gauss(trend * 0.2, 0.1),
+            "Rec.Stoch.RSI": rec_stoch_rsi,
+            "Stoch.RSI.K": stoch_rsi,
+            "Rec.WR": rec_wr,
+            "W.R": wr,
+            "Rec.BBPower": rec_bbp,
+            "BBPower": bbp,
+            "Rec.UO": rec_uo,
+            "UO": uo,
+            "close": close,
+            **mas,
+            "Rec.Ichimoku": sign(close - ichimoku),
+            "Ichimoku.BLine": ichimoku,
+            "Rec.VWMA": sign(close - vwma),
+            "VWMA": vwma,
+            "Rec.HullMA9": sign(close - hull),
+            "HullMA9": hull,
+            "open": open_price,
+            "P.SAR": close * (1 - (1 if trend >= 0 else -1) * vol * 2),
+            "BB.lower": sma20 * (1 - 4 * vol),
+            "BB.upper": sma20 * (1 + 4 * vol),
+            "volume": math.exp(rng.uniform(8, 18)),
+            "change": close - open_price,
+            "low": low,
+            "high": high,
+        }
+        for family, width in (("Classic", 2.0), ("Fibonacci", 1.6), ("Camarilla", 0.8), ("Woodie", 1.9)):
+            values[f"Pivot.M.{family}.Middle"] = pivot
+            for level in (1, 2, 3):
+                values[f"Pivot.M.{family}.R{level}"] = pivot * (1 + level * width * vol)
+                values[f"Pivot.M.{family}.S{level}"] = pivot * (1 - level * width * vol)
+        values["Pivot.M.Demark.Middle"] = pivot
+        values["Pivot.M.Demark.R1"] = pivot * (1 + 1.5 * vol)
+        values["Pivot.M.Demark.S1"] = pivot * (1 - 1.5 * vol)
+        values["AO[2]"] = ao - close * vol * gauss(trend * 0.4, 0.3)
+
+        # calculate() reads values by position, so keep the scanner's column order
+        return {key: values[key] for key in INDICATOR_KEYS}
+
+    def scan(self, screener: str, tv_symbols: list[str], tv_interval: str) -> dict:
+        results = {}
+        with self._lock:
+            for tv_symbol in tv_symbols:
+                tv_symbol = tv_symbol.upper()
+                exchange, _, symbol = tv_symbol.partition(":")
+                results[tv_symbol] = calculate(
+                    indicators=self._indicators(tv_symbol, tv_interval),
+                    indicators_key=INDICATOR_KEYS,
+                    screener=screener,
+                    symbol=symbol,
+                    exchange=exchange,
+                    interval=tv_interval,
+                )
+        return results
+
+    def scan_intervals(self, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict:
+        return _scan_each(self, screener, tv_symbols, tv_intervals)
+
+
+def synthetic_universe(count: int, exchange: str = "SYN") -> dict[str, tuple[str, str]]:
+    """``count`` made-up symbols in the collector's key -> (tv_symbol, name) form."""
+    width = len(str(max(count - 1, 0)))
+    symbols = {}
+    for i in range(count):
+        key = f"{exchange}{i:0{width}d}"
+        symbols[key] = (f"{exchange}:{key}", f"Synthetic {i}")
+    return symbols
+
+
+SOURCES = {
+    "tradingview": TradingViewSource,
+    "replay": ReplaySource,
+    "synthetic": SyntheticSource,
+}
+
+_source: DataSource | None = None
+_source_lock = threading.Lock()
+
+
+def get_source() -> DataSource:
+    """Process-wide data source chosen by DATA_SOURCE, created on first use."""
+    global _source
+    if _source is None:
+        with _source_lock:
+            if _source is None:
+                if DATA_SOURCE not in SOURCES:
+                    raise ValueError(
+                        f"Unknown DATA_SOURCE '{DATA_SOURCE}' (expected one of {', '.join(SOURCES)})"
+                    )
+                _source = SOURCES[DATA_SOURCE]()
+    return _source
+
+
+def set_source(source: DataSource | None) -> None:
+    """Replace the process-wide data source (None resets to DATA_SOURCE)."""
+    global _source
+    with _source_lock:
+        _source = source
@@ -0,0 +1,261 @@
+"""Symbol universe: which tickers the program tracks.
+
+By default the universe is the built-in ``SYMBOLS`` dict. Setting
+SYMBOLS_PATH loads it from one or more CSV, JSON or Parquet files
+instead. Each record has:
+
+  * ``tv_symbol`` - 'EXCHANGE:SYMBOL' (required)
+  * ``key`` - short unique key (default: the part after the exchange)
+  * ``name`` - display name (default: the key)
+  * ``category`` - dashboard category (default: "other")
+  * ``screener`` - screener to use instead of SCREENER_MAP (optional)
+  * ``tags`` - list, or a string separated by ``;`` or ``|`` (optional)
+
+CSV files need a header row, except for headerless lists of
+``EXCHANGE:SYMBOL[,name]`` lines. JSON files hold a list of records, or
+a ``SYMBOLS``-shaped {category: {key: [tv_symbol, name]}} object.
+Parquet files need pandas and pyarrow.
+
+``SymbolRegistry`` indexes the universe by key, TradingView symbol,
+exchange, category and tag, so lookups do not scan every category.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import itertools
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping
+
+from src.config import SYMBOLS, SYMBOLS_PATH
+
+DEFAULT_CATEGORY = "other"
+
+_TAG_SEPARATORS = re.compile(r"[;|]")
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolInfo:
+    """One tracked ticker."""
+
+    key: str
+    tv_symbol: str
+    name: str
+    category: str
+    exchange: str
+    screener: str | None = None
+    tags: tuple[str, ...] = ()
+
+
+def _to_info(record: Mapping) -> SymbolInfo:
+    """Normalize one file record into a SymbolInfo."""
+    tv_symbol = str(record.get("tv_symbol") or record.get("symbol") or "").strip()
+    if not tv_symbol:
+        raise ValueError(f"Symbol record without tv_symbol: {dict(record)!r}")
+    exchange, _, symbol = tv_symbol.rpartition(":")
+    key = str(record.get("key") or symbol).strip().upper()
+
+    tags = record.get("tags") or ()
+    if isinstance(tags, str):
+        tags = _TAG_SEPARATORS.split(tags)
+    return SymbolInfo(
+        key=key,
+        tv_symbol=tv_symbol,
+        name=str(record.get("name") or key).strip(),
+        category=str(record.get("category") or DEFAULT_CATEGORY).strip(),
+        exchange=exchange.upper(),
+        screener=str(record.get("screener") or "").strip() or None,
+        tags=tuple(tag.strip() for tag in tags if tag and str(tag).strip()),
+    )
+
+
+def _iter_csv(path: str) -> Iterator[SymbolInfo]:
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = (row for row in csv.reader(f) if row and row[0].strip() and not row[0].lstrip().startswith("#"))
+        first = next(rows, None)
+        if first is None:
+            return
+        if ":" in first[0]:
+            # Headerless EXCHANGE:SYMBOL[,name] list
+            for cells in itertools.chain([first], rows):
+                yield _to_info({"tv_symbol": cells[0], "name": cells[1] if len(cells) > 1 else ""})
+            return
+        header = [cell.strip().lower() for cell in first]
+        for row in rows:
+            yield _to_info(dict(zip(header, row)))
+
+
+def _iter_json(path: str) -> Iterator[SymbolInfo]:
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    if isinstance(payload, dict):
+        for category, symbols in payload.items():
+            for key, (tv_symbol, name) in symbols.items():
+                yield _to_info({"key": key, "tv_symbol": tv_symbol, "name": name, "category": category})
+    else:
+        for record in payload:
+            yield _to_info(record)
+
+
+def _iter_parquet(path: str) -> Iterator[SymbolInfo]:
+    import pandas as pd
+
+    frame = pd.read_parquet(path)
+    for record in frame.to_dict("records"):
+        # List columns arrive as numpy arrays, missing values as NaN/None
+        record = {k: v.tolist() if hasattr(v, "tolist") else v for k, v in record.items()}
+        yield _to_info({k: v for k, v in record.items() if not (isinstance(v, float) and v != v)})
+
+
+def iter_symbol_file(path: str) -> Iterator[SymbolInfo]:
+    """Stream the symbols in a CSV, JSON or Parquet file (by extension).
+
+    CSV files are read line by line; other formats are loaded whole.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        return _iter_json(path)
+    if ext in (".parquet", ".pq"):
+        return _iter_parquet(path)
+    return _iter_csv(path)
+
+
+class SymbolRegistry:
+    """Indexed, read-only symbol universe.
+
+    The ``symbols``-style views return the collector's key ->
+    (tv_symbol, display_name) dicts; they are built once and shared, so
+    callers must not modify them.
+    """
+
+    def __init__(self, infos: Iterable[SymbolInfo]):
+        self._by_key: dict[str, SymbolInfo] = {}
+        self._by_tv_symbol: dict[str, SymbolInfo] = {}
+        self._categories: dict[str, dict[str, tuple[str, str]]] = {}
+        self._exchanges: dict[str, dict[str, tuple[str, str]]] = {}
+        self._tags: dict[str, dict[str, tuple[str, str]]] = {}
+        self._all: dict[str, tuple[str, str]] = {}
+
+        for info in infos:
+            existing = self._by_key.get(info.key)
+            if existing is not None:
+                if existing.tv_symbol.upper() == info.tv_symbol.upper():
+                    continue
+                raise ValueError(
+                    f"Duplicate symbol key '{info.key}' for {existing.tv_symbol} and {info.tv_symbol}"
+                )
+            existing = self._by_tv_symbol.get(info.tv_symbol.upper())
+            if existing is not None:
+                raise ValueError(
+                    f"Duplicate symbol {info.tv_symbol} under keys '{existing.key}' and '{info.key}'"
+                )
+            entry = (info.tv_symbol, info.name)
+            self._by_key[info.key] = info
+            self._by_tv_symbol[info.tv_symbol.upper()] = info
+            self._all[info.key] = entry
+            self._categories.setdefault(info.category, {})[info.key] = entry
+            self._exchanges.setdefault(info.exchange, {})[info.key] = entry
+            for tag in info.tags:
+                self._tags.setdefault(tag.lower(), {})[info.key] = entry
+
+        # (lower-cased search term, key), sorted for prefix search by bisect
+        terms = set()
+        for info in self._by_key.values():
+            terms.add((info.key.lower(), info.key))
+            terms.add((info.tv_symbol.lower(), info.key))
+            terms.add((info.name.lower(), info.key))
+        self._terms = sorted(terms)
+
+    @classmethod
+    def from_config(cls, symbols: dict[str, dict[str, tuple[str, str]]]) -> "SymbolRegistry":
+        """Registry over a ``SYMBOLS``-shaped dict."""
+        return cls(
+            _to_info({"key": key, "tv_symbol": tv_symbol, "name": name, "category": category})
+            for category, cat_symbols in symbols.items()
+            for key, (tv_symbol, name) in cat_symbols.items()
+        )
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> "SymbolRegistry":
+        """Registry over the symbols of several files, in order."""
+        return cls(info for path in paths for info in iter_symbol_file(path))
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key.upper() in self._by_key
+
+    def __iter__(self) -> Iterator[SymbolInfo]:
+        return iter(self._by_key.values())
+
+    def get(self, key: str) -> SymbolInfo | None:
+        """Look up by key or by 'EXCHANGE:SYMBOL' (case-insensitive)."""
+        key = key.upper()
+        return self._by_key.get(key) or self._by_tv_symbol.get(key)
+
+    def by_tv_symbol(self, tv_symbol: str) -> SymbolInfo | None:
+        return self._by_tv_symbol.get(tv_symbol.upper())
+
+    @property
+    def categories(self) -> list[str]:
+        """Category names in first-seen order."""
+        return list(self._categories)
+
+    def symbols(self, category: str = "all") -> dict[str, tuple[str, str]]:
+        """Key -> (tv_symbol, name) for a category ("all" for everything)."""
+        if category == "all":
+            return self._all
+        return self._categories.get(category, {})
+
+    def by_category(self) -> dict[str, dict[str, tuple[str, str]]]:
+        """Category -> symbols, shaped like ``SYMBOLS``."""
+        return self._categories
+
+    def exchange(self, exchange: str) -> dict[str, tuple[str, str]]:
+        return self._exchanges.get(exchange.upper(), {})
+
+    def tagged(self, tag: str) -> dict[str, tuple[str, str]]:
+        return self._tags.get(tag.lower(), {})
+
+    def search(self, prefix: str, limit: int = 20) -> list[SymbolInfo]:
+        """Symbols whose key, 'EXCHANGE:SYMBOL' or name starts with ``prefix``."""
+        prefix = prefix.lower()
+        results: dict[str, SymbolInfo] = {}
+        for term, key in self._terms[bisect.bisect_left(self._terms, (prefix, "")):]:
+            if not term.startswith(prefix) or len(results) >= limit:
+                break
+            results.setdefault(key, self._by_key[key])
+        return list(results.values())
+
+
+_registry: SymbolRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SymbolRegistry:
+    """Process-wide registry: SYMBOLS_PATH files if set, else ``SYMBOLS``."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                paths = [p.strip() for p in SYMBOLS_PATH.split(",") if p.strip()]
+                _registry = SymbolRegistry.from_files(paths) if paths else SymbolRegistry.from_config(SYMBOLS)
+    return _registry
+
+
+def set_registry(registry: SymbolRegistry | None) -> None:
+    """Replace the process-wide registry (None reloads from settings)."""
+    global _registry
+    with _registry_lock:
+        _registry = registry
+
+
+def symbols_for_category(category: str) -> dict[str, tuple[str, str]]:
+    """Configured symbols for a category ("all" merges every category)."""
+    return get_registry().symbols(category)
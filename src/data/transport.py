@@ -0,0 +1,81 @@
+"""Pooled HTTP transport for TradingView scanner requests.
+
+tradingview_ta opens a new connection (and TLS handshake) for every
+request. The transport keeps one ``requests.Session`` for the process,
+so scan POSTs reuse keep-alive connections to the scanner host.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import FETCH_POOL_SIZE, FETCH_TIMEOUT
+from src.data.scan import (
+    SCAN_HEADERS,
+    parse_scan,
+    parse_scan_intervals,
+    scan_payload,
+    scan_payload_intervals,
+    scan_url,
+)
+
+
+class ScanTransport:
+    """Issues scanner requests over a shared connection pool.
+
+    At most ``pool_size`` connections are kept open per host; with
+    ``block`` set, extra concurrent requests wait for a free connection
+    instead of opening throwaway ones.
+    """
+
+    def __init__(self, pool_size: int = FETCH_POOL_SIZE, timeout: float = FETCH_TIMEOUT, block: bool = True):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(SCAN_HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def scan(self, screener: str, tv_symbols: list[str], tv_interval: str) -> dict:
+        """POST one scan request and parse it.
+
+        Returns upper-cased 'EXCHANGE:SYMBOL' -> Analysis (None for symbols
+        the screener does not know). Raises on HTTP or decoding errors.
+        """
+        response = self.session.post(
+            scan_url(screener),
+            json=scan_payload(tv_symbols, tv_interval),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return parse_scan(response.json(), screener, tv_interval, tv_symbols)
+
+    def scan_intervals(self, screener: str, tv_symbols: list[str], tv_intervals: list[str]) -> dict[str, dict]:
+        """POST one scan request for several intervals (see ``parse_scan_intervals``)."""
+        response = self.session.post(
+            scan_url(screener),
+            json=scan_payload_intervals(tv_symbols, tv_intervals),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return parse_scan_intervals(response.json(), screener, tv_intervals, tv_symbols)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_transport: ScanTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> ScanTransport:
+    """Process-wide scan transport, created on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = ScanTransport()
+    return _transport
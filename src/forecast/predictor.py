@@ -7,13 +7,15 @@ short-term price direction and generate forecast signals.
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass, field
 
 import numpy as np
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler
 
+from src import metrics
+from src.config import FORECAST_DAYS, FORECAST_MODE, MODEL_DIR
 from src.data.collector import MarketData
+from src.data.compact import indicator_matrix
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +34,62 @@ FEATURE_KEYS = [
     "Rec.WR", "Rec.Stoch.RSI",
 ]
 
+# Columns of the batch feature matrix: FEATURE_KEYS, Bollinger bands and
+# the close price (taken from MarketData.close, as the scalar rules do).
+BATCH_KEYS = FEATURE_KEYS + ["BB.upper", "BB.lower", "close"]
+_COL = {key: i for i, key in enumerate(BATCH_KEYS)}
 
-@dataclass
+# Price-level columns, scaled relative to close for the ML model
+_PRICE_LEVEL_COLS = [
+    i for i, key in enumerate(BATCH_KEYS)
+    if key.startswith(("EMA", "SMA", "BB.upper", "BB.lower"))
+]
+
+# Indicator columns read by the forecast rules (_rule_codes), besides close
+RULE_KEYS = [
+    "RSI", "MACD.macd", "MACD.signal", "EMA20", "EMA50", "Stoch.K", "Stoch.D",
+    "ADX", "ADX+DI", "ADX-DI", "CCI20", "BB.upper", "BB.lower",
+]
+
+TV_SUMMARY_SCORE = {"STRONG_BUY": 3, "BUY": 1, "NEUTRAL": 0, "SELL": -1, "STRONG_SELL": -3}
+MAX_RULE_SCORE = 16
+
+# Factor labels per rule outcome code (0 = rule did not fire). Each entry:
+# (factor name, column whose value is formatted into the label, labels).
+_RULE_FACTORS = [
+    ("RSI", "RSI", {
+        1: "{:.1f} (oversold - bullish)",
+        2: "{:.1f} (overbought - bearish)",
+        3: "{:.1f} (below midline)",
+        4: "{:.1f} (above midline)",
+    }),
+    ("MACD", None, {1: "bullish crossover", 2: "bearish crossover"}),
+    ("EMA20", None, {1: "price above EMA20", 2: "price below EMA20"}),
+    ("EMA50", None, {1: "price above EMA50", 2: "price below EMA50"}),
+    ("Stochastic", None, {1: "oversold with bullish cross", 2: "overbought with bearish cross"}),
+    ("ADX", "ADX", {1: "{:.1f} strong uptrend", 2: "{:.1f} strong downtrend"}),
+    ("CCI", "CCI20", {1: "{:.1f} (oversold)", 2: "{:.1f} (overbought)"}),
+    ("BB", None, {1: "at lower band (support)", 2: "at upper band (resistance)"}),
+]
+
+# Score contribution per outcome code, in the same order as _RULE_FACTORS
+_RULE_POINTS = [
+    np.array([0, 2, -2, -1, 1]),
+    np.array([0, 2, -2]),
+    np.array([0, 1, -1]),
+    np.array([0, 1, -1]),
+    np.array([0, 2, -2]),
+    np.array([0, 1, -1]),
+    np.array([0, 1, -1]),
+    np.array([0, 1, -1]),
+]
+
+
+DIRECTION_KR = {"UP": "상승", "DOWN": "하락", "NEUTRAL": "보합"}
+DIRECTION_EMOJI = {"UP": "▲", "DOWN": "▼", "NEUTRAL": "━"}
+
+
+@dataclass(slots=True)
 class ForecastResult:
     """Prediction result for a single symbol."""
 
@@ -47,15 +103,11 @@ class ForecastResult:
 
     @property
     def direction_kr(self) -> str:
-        return {"UP": "상승", "DOWN": "하락", "NEUTRAL": "보합"}.get(
-            self.direction, self.direction
-        )
+        return DIRECTION_KR.get(self.direction, self.direction)
 
     @property
     def direction_emoji(self) -> str:
-        return {"UP": "▲", "DOWN": "▼", "NEUTRAL": "━"}.get(
-            self.direction, "?"
-        )
+        return DIRECTION_EMOJI.get(self.direction, "?")
 
 
 def _extract_features(data: MarketData) -> np.ndarray | None:
@@ -70,6 +122,142 @@ def _extract_features(data: MarketData) -> np.ndarray | None:
     return np.array(features).reshape(1, -1)
 
 
+def _build_feature_matrix(items: list[MarketData]) -> np.ndarray:
+    """Stack indicators into an (n_symbols, len(BATCH_KEYS)) matrix, NaN for missing."""
+    X = np.empty((len(items), len(BATCH_KEYS)), dtype=np.float64)
+    X[:, :-1] = indicator_matrix([data.indicators for data in items], BATCH_KEYS[:-1])
+    X[:, -1] = [data.close for data in items]
+    return X
+
+
+def model_features(X: np.ndarray) -> np.ndarray:
+    """Turn a batch feature matrix into scale-free ML model inputs.
+
+    Moving averages and Bollinger bands become distances from close so
+    one model applies across symbols with very different price levels.
+    The close column itself is dropped and missing values become 0.
+    """
+    close = X[:, _COL["close"]]
+    F = X.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        F[:, _PRICE_LEVEL_COLS] = F[:, _PRICE_LEVEL_COLS] / close[:, None] - 1
+    F = np.delete(F, _COL["close"], axis=1)
+    return np.nan_to_num(F, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _rule_codes(X: np.ndarray) -> list[np.ndarray]:
+    """Evaluate every forecast rule over the feature matrix.
+
+    Returns one outcome-code array per entry of _RULE_FACTORS, mirroring
+    the branches of _rule_based_forecast.
+    """
+    def col(key: str) -> np.ndarray:
+        return X[:, _COL[key]]
+
+    def has(*keys: str) -> np.ndarray:
+        return ~np.isnan(X[:, [_COL[k] for k in keys]]).any(axis=1)
+
+    close = col("close")
+    price = close != 0
+    rsi, macd, macd_signal = col("RSI"), col("MACD.macd"), col("MACD.signal")
+    ema20, ema50 = col("EMA20"), col("EMA50")
+    stoch_k, stoch_d = col("Stoch.K"), col("Stoch.D")
+    adx, adx_plus, adx_minus = col("ADX"), col("ADX+DI"), col("ADX-DI")
+    cci, bb_upper, bb_lower = col("CCI20"), col("BB.upper"), col("BB.lower")
+
+    return [
+        np.select(
+            [~has("RSI"), rsi < 30, rsi > 70, rsi < 50], [0, 1, 2, 3], default=4
+        ),
+        np.where(has("MACD.macd", "MACD.signal"), np.where(macd > macd_signal, 1, 2), 0),
+        np.where(has("EMA20") & price, np.where(close > ema20, 1, 2), 0),
+        np.where(has("EMA50") & price, np.where(close > ema50, 1, 2), 0),
+        np.select(
+            [(stoch_k < 20) & (stoch_k > stoch_d), (stoch_k > 80) & (stoch_k < stoch_d)], [1, 2], default=0
+        ),
+        np.where(
+            has("ADX", "ADX+DI", "ADX-DI") & (adx > 25), np.where(adx_plus > adx_minus, 1, 2), 0
+        ),
+        np.select([cci < -100, cci > 100], [1, 2], default=0),
+        np.where(
+            has("BB.upper", "BB.lower") & price,
+            np.select([close <= bb_lower, close >= bb_upper], [1, 2], default=0),
+            0,
+        ),
+    ]
+
+
+def _summary_points(summaries) -> np.ndarray:
+    """TV_SUMMARY_SCORE points per TradingView summary label (0 if unknown)."""
+    labels = np.asarray(summaries, dtype=str)
+    points = np.zeros(len(labels), dtype=np.int64)
+    for label, value in TV_SUMMARY_SCORE.items():
+        points[labels == label] = value
+    return points
+
+
+def _rule_scores(X: np.ndarray, summaries) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Total rule score per row, plus the per-rule outcome codes.
+
+    ``summaries`` holds each row's TradingView summary label (a list or a
+    string array).
+    """
+    codes = _rule_codes(X)
+    score = _summary_points(summaries)
+    for rule_codes, points in zip(codes, _RULE_POINTS):
+        score += points[rule_codes]
+    return score, codes
+
+
+def _rule_outputs(score: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Direction, confidence and signal strength arrays for rule scores."""
+    direction = np.where(score >= 3, "UP", np.where(score <= -3, "DOWN", "NEUTRAL"))
+    confidence = np.minimum(np.abs(score) / MAX_RULE_SCORE, 1.0)
+    signal_strength = np.clip(score / MAX_RULE_SCORE * 100, -100, 100).astype(np.int64)
+    return direction, confidence, signal_strength
+
+
+def _rule_based_forecast_batch(items: list[MarketData]) -> list[ForecastResult]:
+    """Vectorized _rule_based_forecast over many symbols at once.
+
+    Produces ForecastResult objects identical to the per-symbol path.
+    """
+    if not items:
+        return []
+
+    X = _build_feature_matrix(items)
+    summaries = [data.summary.get("RECOMMENDATION", "NEUTRAL") for data in items]
+    score, codes = _rule_scores(X, summaries)
+    direction, confidence, signal_strength = _rule_outputs(score)
+
+    rules = [
+        (name, _COL[value_key] if value_key else None, labels, rule_codes.tolist())
+        for (name, value_key, labels), rule_codes in zip(_RULE_FACTORS, codes)
+    ]
+    values = X.tolist()
+
+    results = []
+    for i, data in enumerate(items):
+        factors = {}
+        for name, value_col, labels, rule_codes in rules:
+            code = rule_codes[i]
+            if code:
+                label = labels[code]
+                factors[name] = label.format(values[i][value_col]) if value_col is not None else label
+        factors["TV_Summary"] = summaries[i]
+
+        results.append(ForecastResult(
+            symbol=data.symbol,
+            name=data.name,
+            current_price=data.close,
+            direction=str(direction[i]),
+            confidence=round(float(confidence[i]), 3),
+            signal_strength=int(signal_strength[i]),
+            factors=factors,
+        ))
+    return results
+
+
 def _rule_based_forecast(data: MarketData) -> ForecastResult:
     """Generate a rule-based forecast when ML data is insufficient."""
     ind = data.indicators
@@ -169,12 +357,11 @@ def _rule_based_forecast(data: MarketData) -> ForecastResult:
 
     # TradingView summary
     summary = data.summary.get("RECOMMENDATION", "NEUTRAL")
-    tv_score = {"STRONG_BUY": 3, "BUY": 1, "NEUTRAL": 0, "SELL": -1, "STRONG_SELL": -3}
-    score += tv_score.get(summary, 0)
+    score += TV_SUMMARY_SCORE.get(summary, 0)
     factors["TV_Summary"] = summary
 
     # Determine direction
-    max_possible = 16
+    max_possible = MAX_RULE_SCORE
     signal_strength = int(np.clip(score / max_possible * 100, -100, 100))
 
     if score >= 3:
@@ -197,17 +384,118 @@ def _rule_based_forecast(data: MarketData) -> ForecastResult:
     )
 
 
-def predict(data: MarketData) -> ForecastResult:
+# Trained model bundle from the registry, loaded once by load_model()
+_model_bundle: dict | None = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def _load_bundle() -> dict | None:
+    from src.forecast.registry import load_model as load_from_registry
+
+    bundle = load_from_registry(MODEL_DIR)
+    if bundle is None:
+        return None
+    if bundle.get("feature_keys") != BATCH_KEYS:
+        logger.warning("Ignoring forecast model %s: feature schema changed", bundle.get("version"))
+        return None
+    if bundle.get("horizon_days") != FORECAST_DAYS:
+        logger.warning(
+            "Ignoring forecast model %s: trained for a %s-day horizon, FORECAST_DAYS is %d",
+            bundle.get("version"), bundle.get("horizon_days"), FORECAST_DAYS,
+        )
+        return None
+    logger.info("Loaded forecast model %s (%s bars)", bundle.get("version"), bundle.get("interval"))
+    return bundle
+
+
+def load_model(force: bool = False) -> dict | None:
+    """Load the latest trained model from MODEL_DIR (once per process).
+
+    Returns None, and forecasts stay rule-based, when FORECAST_MODE is
+    "rules" or no usable model has been trained yet. Concurrent first
+    calls wait for one load; a load that raises is retried next call.
+    """
+    global _model_bundle, _model_loaded
+    if _model_loaded and not force:
+        return _model_bundle
+    with _model_lock:
+        if _model_loaded and not force:
+            return _model_bundle
+        bundle = _load_bundle() if FORECAST_MODE != "rules" else None
+        _model_bundle = bundle
+        _model_loaded = True
+    return bundle
+
+
+def _model_for(interval: str) -> dict | None:
+    """The loaded model if it was trained on ``interval`` bars, else None."""
+    bundle = load_model()
+    if bundle is None or bundle.get("interval") != interval:
+        return None
+    return bundle
+
+
+def _model_forecast_batch(items: list[MarketData], bundle: dict) -> list[ForecastResult]:
+    """Score all symbols with one predict_proba call.
+
+    Rule factors are kept as the explanation; direction, confidence and
+    signal strength come from the model's class probabilities.
+    """
+    results = _rule_based_forecast_batch(items)
+    X = model_features(_build_feature_matrix(items))
+    proba = bundle["model"].predict_proba(bundle["scaler"].transform(X))
+    classes = list(bundle["model"].classes_)
+
+    best = proba.argmax(axis=1)
+    p_up = proba[:, classes.index("UP")] if "UP" in classes else np.zeros(len(items))
+    p_down = proba[:, classes.index("DOWN")] if "DOWN" in classes else np.zeros(len(items))
+    strength = np.clip((p_up - p_down) * 100, -100, 100).astype(np.int64)
+
+    for i, result in enumerate(results):
+        result.direction = str(classes[best[i]])
+        result.confidence = round(float(proba[i, best[i]]), 3)
+        result.signal_strength = int(strength[i])
+        result.factors["Model"] = str(bundle.get("version"))
+        result.factors["P(UP/DOWN)"] = f"{p_up[i]:.2f} / {p_down[i]:.2f}"
+    return results
+
+
+def predict(data: MarketData, interval: str = "1d") -> ForecastResult:
     """Generate a forecast for a single symbol.
 
-    Uses rule-based analysis combining multiple TradingView
+    Uses the trained model when one trained on ``interval`` bars is
+    loaded, otherwise rule-based analysis combining multiple TradingView
     indicators into a directional forecast.
     """
+    # Timed by the caller (see technical.analyze)
+    bundle = _model_for(interval)
+    if bundle is not None:
+        return _model_forecast_batch([data], bundle)[0]
     return _rule_based_forecast(data)
 
 
 def predict_multiple(
     market_data: dict[str, MarketData],
+    interval: str = "1d",
 ) -> dict[str, ForecastResult]:
-    """Generate forecasts for multiple symbols."""
-    return {key: predict(data) for key, data in market_data.items()}
+    """Generate forecasts for multiple symbols fetched on one interval.
+
+    Scores the whole universe at once, with the trained model when one
+    trained on ``interval`` bars is loaded and the vectorized rule engine
+    otherwise.
+    """
+    keys = list(market_data)
+    items = [market_data[key] for key in keys]
+    with metrics.stage("predict_multiple"):
+        bundle = _model_for(interval)
+        if bundle is not None and items:
+            forecasts = _model_forecast_batch(items, bundle)
+        else:
+            forecasts = _rule_based_forecast_batch(items)
+    return dict(zip(keys, forecasts))
+
+
+def predict_timeframes(data_by_interval: dict[str, MarketData]) -> dict[str, ForecastResult]:
+    """Forecast one symbol on several intervals, each with its own model choice."""
+    return {interval: predict(data, interval) for interval, data in data_by_interval.items()}
@@ -0,0 +1,78 @@
+"""On-disk registry of trained forecast models.
+
+Each trained model is saved as a versioned joblib artifact in
+``MODEL_DIR``; a ``LATEST`` file points at the version to serve.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "forecaster-"
+_SUFFIX = ".joblib"
+_LATEST = "LATEST"
+
+
+def _artifact_path(directory: str, version: str) -> str:
+    return os.path.join(directory, f"{_PREFIX}{version}{_SUFFIX}")
+
+
+def save_model(bundle: dict, directory: str) -> str:
+    """Save a model bundle as a new version and mark it latest.
+
+    Returns:
+        The version string assigned to the bundle.
+    """
+    import joblib
+
+    os.makedirs(directory, exist_ok=True)
+    version = time.strftime("%Y%m%dT%H%M%S")
+    if os.path.exists(_artifact_path(directory, version)):
+        version = f"{version}-{os.getpid()}"
+    bundle = {**bundle, "version": version}
+
+    joblib.dump(bundle, _artifact_path(directory, version))
+    tmp_path = os.path.join(directory, f"{_LATEST}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(directory, _LATEST))
+    logger.info("Saved forecast model %s to %s", version, directory)
+    return version
+
+
+def list_versions(directory: str) -> list[str]:
+    """All saved model versions, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        name[len(_PREFIX):-len(_SUFFIX)]
+        for name in os.listdir(directory)
+        if name.startswith(_PREFIX) and name.endswith(_SUFFIX)
+    )
+
+
+def load_model(directory: str, version: str | None = None) -> dict | None:
+    """Load a model bundle (the latest one by default), or None if absent."""
+    if version is None:
+        try:
+            with open(os.path.join(directory, _LATEST), encoding="utf-8") as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+
+    path = _artifact_path(directory, version)
+    if not os.path.exists(path):
+        logger.warning("Forecast model %s not found in %s", version, directory)
+        return None
+    # joblib (and the pickled sklearn classes) load only when a model exists
+    import joblib
+
+    try:
+        return joblib.load(path)
+    except Exception:
+        logger.exception("Failed to load forecast model %s", path)
+        return None
@@ -0,0 +1,129 @@
+"""Offline training of the GradientBoosting forecaster.
+
+Builds a labelled dataset from the local indicator history, fits a
+scaler + GradientBoostingClassifier and saves the result to the model
+registry. Run with ``python main.py --train``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.config import FORECAST_DAYS, MODEL_DIR
+from src.data.history import HistoryStore, get_history_store
+from src.forecast.predictor import BATCH_KEYS, _build_feature_matrix, model_features
+from src.forecast.registry import save_model
+
+logger = logging.getLogger(__name__)
+
+CLASSES = ["DOWN", "NEUTRAL", "UP"]
+
+
+def _daily_last(ts: np.ndarray) -> np.ndarray:
+    """Indices of the last snapshot of each UTC day in a sorted ``ts`` array."""
+    days = (ts // 86400).astype(np.int64)
+    return np.flatnonzero(np.append(days[1:] != days[:-1], True))
+
+
+def build_dataset(
+    store: HistoryStore,
+    interval: str = "1d",
+    horizon_days: int = FORECAST_DAYS,
+    neutral_band: float = 0.005,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Feature matrix and direction labels from stored snapshots.
+
+    Snapshots are reduced to one per symbol per day. Each is labelled by
+    the close-to-close return to the first snapshot at least
+    ``horizon_days`` later: UP / DOWN beyond ``neutral_band``, else NEUTRAL.
+    """
+    horizon = horizon_days * 86400
+    features, labels = [], []
+
+    for tv_symbol in store.symbols(interval):
+        rows = store.query(tv_symbol, interval)
+        if len(rows) < 2:
+            continue
+        ts = np.array([t for t, _ in rows])
+        keep = _daily_last(ts)
+        ts = ts[keep]
+        items = [rows[i][1] for i in keep]
+        X = _build_feature_matrix(items)
+        close = X[:, BATCH_KEYS.index("close")]
+
+        future = np.searchsorted(ts, ts + horizon)
+        valid = (future < len(ts)) & (close != 0)
+        if not valid.any():
+            continue
+        ret = np.full(len(ts), np.nan)
+        ret[valid] = close[future[valid]] / close[valid] - 1
+
+        y = np.where(ret > neutral_band, "UP", np.where(ret < -neutral_band, "DOWN", "NEUTRAL"))
+        features.append(model_features(X[valid]))
+        labels.append(y[valid])
+
+    if not features:
+        return np.empty((0, 0)), np.empty(0, dtype=str)
+    return np.vstack(features), np.concatenate(labels)
+
+
+def train(
+    interval: str = "1d",
+    horizon_days: int = FORECAST_DAYS,
+    min_samples: int = 200,
+    model_dir: str = MODEL_DIR,
+) -> dict:
+    """Train a new model from history and save it to the registry.
+
+    Returns:
+        The saved model bundle.
+
+    Raises:
+        ValueError: If history is disabled or there is too little data.
+    """
+    store = get_history_store()
+    if store is None:
+        raise ValueError("History store is disabled (HISTORY_ENABLED=false)")
+
+    X, y = build_dataset(store, interval, horizon_days)
+    if len(y) < min_samples:
+        raise ValueError(
+            f"Not enough labelled history to train: {len(y)} samples (need {min_samples})"
+        )
+
+    # Chronology is lost across symbols, so hold out a random 20% for a sanity score
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(y))
+    split = int(len(y) * 0.8)
+    train_idx, test_idx = order[:split], order[split:]
+
+    scaler = StandardScaler().fit(X[train_idx])
+    model = GradientBoostingClassifier(random_state=0)
+    model.fit(scaler.transform(X[train_idx]), y[train_idx])
+    accuracy = float(model.score(scaler.transform(X[test_idx]), y[test_idx])) if len(test_idx) else None
+
+    # Refit on everything for the served model
+    scaler = StandardScaler().fit(X)
+    model = GradientBoostingClassifier(random_state=0).fit(scaler.transform(X), y)
+
+    bundle = {
+        "model": model,
+        "scaler": scaler,
+        "feature_keys": list(BATCH_KEYS),
+        "interval": interval,
+        "horizon_days": horizon_days,
+        "trained_at": time.time(),
+        "samples": int(len(y)),
+        "holdout_accuracy": accuracy,
+    }
+    bundle["version"] = save_model(bundle, model_dir)
+    logger.info(
+        "Trained forecast model %s on %d samples (holdout accuracy %s)",
+        bundle["version"], len(y), f"{accuracy:.3f}" if accuracy is not None else "n/a",
+    )
+    return bundle
@@ -0,0 +1,224 @@
+"""In-process latency and counter metrics in Prometheus text format.
+
+Pipeline code wraps its stages in ``stage(name)``; each one is recorded
+in the ``tv_stage_seconds`` histogram and, when the current request
+opted in with ``start_trace``, in that request's trace so it can be
+returned as a ``Server-Timing`` header.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from cache hits to slow upstream requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_format(value)}" for key, value in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (seconds)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            series = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._series.items())
+        lines = []
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_format(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Metrics exposed together on /metrics."""
+
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        # Called at scrape time; each returns complete exposition lines
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics, collectors = list(self._metrics), list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def gauge_lines(name: str, help: str, value: float) -> list[str]:
+    """Exposition lines for a single unlabelled gauge (for collectors)."""
+    return [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_format(value)}"]
+
+
+STAGE_SECONDS = histogram(
+    "tv_stage_seconds", "Time spent in each fetch/analysis/serving stage", ["stage"]
+)
+
+# ── Per-request traces ──
+
+_trace: contextvars.ContextVar[list | None] = contextvars.ContextVar("tv_trace", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage into ``tv_stage_seconds`` and the active trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append((name, elapsed))
+
+
+def start_trace() -> contextvars.Token:
+    """Collect the stages run in the current context until ``end_trace``."""
+    return _trace.set([])
+
+
+def current_trace() -> list[tuple[str, float]] | None:
+    """The active trace's (stage, seconds) entries so far, or None."""
+    return _trace.get()
+
+
+def end_trace(token: contextvars.Token) -> list[tuple[str, float]]:
+    """Stop tracing and return the (stage, seconds) entries recorded."""
+    trace = _trace.get() or []
+    _trace.reset(token)
+    return trace
+
+
+def server_timing(trace: list[tuple[str, float]]) -> str:
+    """Format a trace as a Server-Timing header value (stages summed by name)."""
+    totals: dict[str, list] = {}
+    for name, elapsed in trace:
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+    parts = []
+    for name, (elapsed, calls) in totals.items():
+        part = f"{name};dur={elapsed * 1000:.2f}"
+        if calls > 1:
+            part += f';desc="{calls} calls"'
+        parts.append(part)
+    return ", ".join(parts)
@@ -0,0 +1,109 @@
+"""Multiprocess scan of large symbol universes for the CLI.
+
+The universe is read lazily (from a symbol file or the configured
+categories), cut into chunks and handed to a pool of worker processes.
+Each worker has its own fetch pool and caches, and a ``1/workers`` share
+of FETCH_RATE_LIMIT so the combined request rate stays the same as a
+single process. Results come back chunk by chunk, in completion order,
+with only a few chunks in flight, so the whole universe is never held
+in memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator
+
+from src.config import FETCH_RATE_LIMIT, FETCH_RATE_BURST
+from src.data.symbols import iter_symbol_file
+
+logger = logging.getLogger(__name__)
+
+# Symbols per task handed to a worker
+CHUNK_SIZE = 200
+
+
+def read_symbol_file(path: str) -> Iterator[tuple[str, tuple[str, str]]]:
+    """Stream (key, (tv_symbol, display_name)) pairs from a symbol file.
+
+    Accepts the CSV, JSON and Parquet formats of ``src.data.symbols``;
+    CSV files are read line by line.
+    """
+    for info in iter_symbol_file(path):
+        yield info.key, (info.tv_symbol, info.name)
+
+
+def _chunks(
+    symbols: Iterable[tuple[str, tuple[str, str]]],
+    size: int,
+) -> Iterator[dict[str, tuple[str, str]]]:
+    it = iter(symbols)
+    while chunk := dict(islice(it, size)):
+        yield chunk
+
+
+def _init_worker(workers: int) -> None:
+    """Per-process setup: rate limit share and forecast model."""
+    from src.data.collector import set_rate_limit
+    from src.forecast.predictor import load_model
+
+    set_rate_limit(FETCH_RATE_LIMIT / workers, max(1.0, FETCH_RATE_BURST / workers))
+    load_model()
+
+
+def _scan_chunk(symbols: dict[str, tuple[str, str]], interval: str) -> tuple[list[dict], list[str]]:
+    """Fetch, analyze and forecast one chunk in a worker.
+
+    Returns (overview rows, keys that could not be fetched).
+    """
+    from src.data.collector import fetch_multiple
+    from src.data.history import get_history_store
+    from src.service.universe import analyze_universe
+
+    market_data = fetch_multiple(symbols, interval)
+    universe = analyze_universe(symbols, market_data, interval)
+    # Workers can be stopped at any time once their result is returned
+    store = get_history_store()
+    if store is not None:
+        store.flush()
+    return universe.rows(), [key for key in symbols if key not in market_data]
+
+
+def scan_sharded(
+    symbols: Iterable[tuple[str, tuple[str, str]]],
+    interval: str,
+    workers: int,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[list[dict], list[str]]]:
+    """Scan a universe across ``workers`` processes.
+
+    Args:
+        symbols: (key, (tv_symbol, display_name)) pairs; consumed lazily.
+        interval: Time interval.
+        workers: Number of worker processes.
+        chunk_size: Symbols per worker task.
+
+    Yields:
+        (overview rows, failed keys) for each chunk as it completes.
+        Rows use the /api/overview format.
+    """
+    chunks = _chunks(symbols, chunk_size)
+    # spawn: workers must not inherit the parent's threads or locks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(workers,)
+    ) as pool:
+        pending: set[Future] = set()
+        # Two chunks per worker keeps every worker busy without reading ahead
+        for chunk in islice(chunks, 2 * workers):
+            pending.add(pool.submit(_scan_chunk, chunk, interval))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(_scan_chunk, chunk, interval))
+                yield future.result()
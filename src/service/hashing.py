@@ -0,0 +1,16 @@
+"""Stable content hashes for JSON-serializable data.
+
+Used for overview row hashes (``UniverseSnapshot.row_hashes``), response
+version tokens and ETags.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+
+def content_hash(obj) -> str:
+    """Stable short hash of a JSON-serializable object."""
+    encoded = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=10).hexdigest()
@@ -0,0 +1,135 @@
+"""Process-wide market overview results shared by dashboard sessions.
+
+The Streamlit dashboard runs every browser session in the same process.
+Overview results are cached here per (category, interval) rather than
+per session, so any number of analysts looking at the same category
+cause one TradingView sweep per TTL. The TTL follows the interval
+(``CACHE_TTL``); once it passes, readers keep getting the previous
+result while a background thread fetches the next one.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from src.config import CACHE_TTL
+from src.data.cache import MarketDataCache
+from src.data.collector import MarketData, fetch_multiple
+from src.data.symbols import symbols_for_category
+from src.service.universe import UniverseSnapshot, analyze_universe
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Overview:
+    """One category's fetched market data and its analyzed universe."""
+
+    category: str
+    interval: str
+    symbols: dict[str, tuple[str, str]]
+    market_data: dict[str, MarketData]
+    universe: UniverseSnapshot
+    updated_at: float
+
+    @property
+    def failed(self) -> list[str]:
+        """Keys of symbols that could not be fetched."""
+        return [key for key in self.symbols if key not in self.market_data]
+
+
+class OverviewCache:
+    """(category, interval) -> Overview, fresh for the interval's TTL.
+
+    ``get`` returns a fresh result when there is one, otherwise the last
+    result while it refreshes in the background; only the very first
+    request for a key waits for the fetch. Concurrent first requests
+    share one fetch.
+    """
+
+    def __init__(self, ttls: dict[str, float] | None = None, max_entries: int = 64):
+        # Keys are (category, interval); MarketDataCache takes the TTL from key[1]
+        self._fresh = MarketDataCache(max_entries=max_entries, ttls=ttls if ttls is not None else CACHE_TTL)
+        self._latest: dict[tuple[str, str], Overview] = {}
+        self._refreshing: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def _load(self, category: str, interval: str) -> Overview | None:
+        symbols = symbols_for_category(category)
+        market_data = fetch_multiple(symbols, interval) if symbols else {}
+        if not market_data:
+            return None
+        now = time.time()
+        overview = Overview(
+            category=category,
+            interval=interval,
+            symbols=symbols,
+            market_data=market_data,
+            universe=analyze_universe(symbols, market_data, interval, now),
+            updated_at=now,
+        )
+        with self._lock:
+            self._latest[(category, interval)] = overview
+        return overview
+
+    def get(self, category: str, interval: str) -> Overview | None:
+        """Overview for a category, or None if nothing could be fetched."""
+        key = (category, interval)
+        overview = self._fresh.get(key)
+        if overview is not None:
+            return overview
+        with self._lock:
+            stale = self._latest.get(key)
+        if stale is not None:
+            self._refresh_in_background(category, interval)
+            return stale
+        return self._fresh.get_or_load(key, lambda: self._load(category, interval))
+
+    def refresh(self, category: str, interval: str) -> Overview | None:
+        """Fetch a category now, replacing any cached result."""
+        overview = self._load(category, interval)
+        if overview is not None:
+            self._fresh.put((category, interval), overview)
+        return overview
+
+    def _refresh_in_background(self, category: str, interval: str) -> None:
+        key = (category, interval)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(category, interval)
+            except Exception:
+                logger.exception("Overview refresh failed for %s/%s", category, interval)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"overview-{category}-{interval}", daemon=True).start()
+
+    def market_data(self, interval: str, key: str) -> MarketData | None:
+        """A symbol's MarketData from any fresh overview for ``interval``.
+
+        Stale overviews are skipped, so callers fall back to a fetch that
+        honours CACHE_TTL.
+        """
+        with self._lock:
+            cached = [k for k in self._latest if k[1] == interval]
+        for cache_key in cached:
+            overview = self._fresh.get(cache_key)
+            if overview is None:
+                continue
+            data = overview.market_data.get(key)
+            if data is not None:
+                return data
+        return None
+
+
+# Process-wide cache shared by every dashboard session
+overview_cache = OverviewCache()
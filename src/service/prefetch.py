@@ -0,0 +1,234 @@
+"""Background prefetch scheduler.
+
+Keeps the configured symbol universe warm for the PREFETCH_INTERVALS
+(by default only DEFAULT_INTERVAL) so that web requests read precomputed
+results instead of hitting TradingView. Upstream load depends only on the
+universe, those intervals and their refresh cadence, not on how many
+dashboards are open. Other intervals are fetched on request and cached.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.config import DEFAULT_INTERVAL, PREFETCH_CADENCE, PREFETCH_INTERVALS
+from src.data.collector import MarketData, refresh_multiple
+from src.data.symbols import get_registry
+from src.analysis.technical import AnalysisResult, analyze_multiple
+from src.forecast.predictor import ForecastResult, predict_multiple
+from src.service.universe import UniverseSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SymbolSnapshot:
+    """Precomputed pipeline output for one symbol."""
+
+    key: str
+    tv_symbol: str
+    data: MarketData
+    analysis: AnalysisResult
+    forecast: ForecastResult
+
+
+@dataclass
+class IntervalSnapshot:
+    """Latest refresh of the whole universe for one interval.
+
+    ``universe`` holds the same results in columnar form for the
+    overview readers; it is built from ``entries`` when not given.
+    """
+
+    interval: str
+    updated_at: float
+    entries: dict[str, SymbolSnapshot] = field(default_factory=dict)
+    universe: UniverseSnapshot | None = None
+
+    def __post_init__(self):
+        if self.universe is None:
+            entries = self.entries.values()
+            self.universe = UniverseSnapshot.build(
+                {e.key: e.tv_symbol for e in entries},
+                {e.key: e.data for e in entries},
+                {e.key: e.analysis for e in entries},
+                {e.key: e.forecast for e in entries},
+                self.interval,
+                self.updated_at,
+            )
+
+
+def _fingerprint(entry: SymbolSnapshot) -> tuple:
+    """Fields whose change is worth pushing to dashboards."""
+    return (
+        entry.analysis.price,
+        entry.analysis.summary_recommendation,
+        entry.forecast.direction,
+        entry.forecast.confidence,
+        entry.forecast.signal_strength,
+    )
+
+
+# Called with (new snapshot, changed keys, removed keys) after each refresh
+ChangeListener = Callable[[IntervalSnapshot, list[str], list[str]], None]
+
+
+class SnapshotStore:
+    """Thread-safe holder of the latest IntervalSnapshot per interval.
+
+    Listeners are told which symbols changed price, recommendation or
+    forecast whenever a newer snapshot replaces the previous one.
+    """
+
+    def __init__(self):
+        self._snapshots: dict[str, IntervalSnapshot] = {}
+        self._by_tv_symbol: dict[str, dict[str, SymbolSnapshot]] = {}
+        self._listeners: list[ChangeListener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def put(self, snapshot: IntervalSnapshot) -> None:
+        index = {entry.tv_symbol.upper(): entry for entry in snapshot.entries.values()}
+        with self._lock:
+            previous = self._snapshots.get(snapshot.interval)
+            self._snapshots[snapshot.interval] = snapshot
+            self._by_tv_symbol[snapshot.interval] = index
+            listeners = list(self._listeners)
+
+        old = previous.entries if previous is not None else {}
+        changed = [
+            key for key, entry in snapshot.entries.items()
+            if key not in old or _fingerprint(old[key]) != _fingerprint(entry)
+        ]
+        removed = [key for key in old if key not in snapshot.entries]
+        if not changed and not removed:
+            return
+        for listener in listeners:
+            try:
+                listener(snapshot, changed, removed)
+            except Exception:
+                logger.exception("Snapshot listener failed for %s", snapshot.interval)
+
+    def get(self, interval: str) -> IntervalSnapshot | None:
+        with self._lock:
+            return self._snapshots.get(interval)
+
+    def lookup(self, interval: str, tv_symbol: str) -> SymbolSnapshot | None:
+        """Find one symbol in the latest snapshot by TradingView symbol."""
+        with self._lock:
+            return self._by_tv_symbol.get(interval, {}).get(tv_symbol.upper())
+
+
+class PrefetchScheduler:
+    """Refreshes every symbol for each of its intervals on a per-interval cadence."""
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        symbols: dict[str, tuple[str, str]] | None = None,
+        intervals: list[str] | None = None,
+        cadence: dict[str, float] | None = None,
+    ):
+        self.store = store
+        self.symbols = symbols if symbols is not None else get_registry().symbols()
+        self.intervals = list(intervals if intervals is not None else PREFETCH_INTERVALS)
+        self.cadence = cadence if cadence is not None else PREFETCH_CADENCE
+        # Refresh the default interval first so the dashboard warms up fastest
+        if DEFAULT_INTERVAL in self.intervals:
+            self.intervals.remove(DEFAULT_INTERVAL)
+            self.intervals.insert(0, DEFAULT_INTERVAL)
+        self._next_due = {interval: 0.0 for interval in self.intervals}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self, interval: str) -> IntervalSnapshot:
+        """Fetch, analyze and forecast the universe for one interval."""
+        started = time.monotonic()
+        market_data = refresh_multiple(self.symbols, interval)
+        analyses = analyze_multiple(market_data)
+        forecasts = predict_multiple(market_data, interval)
+
+        entries = {
+            key: SymbolSnapshot(
+                key=key,
+                tv_symbol=self.symbols[key][0],
+                data=data,
+                analysis=analyses[key],
+                forecast=forecasts[key],
+            )
+            for key, data in market_data.items()
+        }
+        snapshot = IntervalSnapshot(interval=interval, updated_at=time.time(), entries=entries)
+        # Sorted overview pages read these; build them here, off the request path
+        snapshot.universe.build_sort_indexes()
+        self.store.put(snapshot)
+        logger.info(
+            "Prefetched %d/%d symbols for %s in %.2fs",
+            len(entries), len(self.symbols), interval, time.monotonic() - started,
+        )
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for interval in self.intervals:
+                if self._stop.is_set():
+                    return
+                if self._next_due[interval] > now:
+                    continue
+                try:
+                    self.refresh(interval)
+                except Exception:
+                    logger.exception("Prefetch failed for interval %s", interval)
+                self._next_due[interval] = time.monotonic() + self.cadence.get(interval, 300)
+            wait = min(self._next_due.values()) - time.monotonic()
+            self._stop.wait(max(wait, 1.0))
+
+    def start(self) -> None:
+        """Start the refresh loop in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# Process-wide store read by the web handlers
+store = SnapshotStore()
+_scheduler: PrefetchScheduler | None = None
+
+
+def is_running(interval: str | None = None) -> bool:
+    """Whether the process-wide prefetch scheduler is refreshing snapshots.
+
+    With ``interval``, only if that interval is one it refreshes.
+    """
+    if _scheduler is None or not _scheduler.running:
+        return False
+    return interval is None or interval in _scheduler.intervals
+
+
+def start_scheduler() -> PrefetchScheduler:
+    """Start the process-wide prefetch scheduler (idempotent)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = PrefetchScheduler(store)
+    _scheduler.start()
+    return _scheduler
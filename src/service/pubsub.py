@@ -0,0 +1,129 @@
+"""Minimal in-process publish/subscribe broker for server push.
+
+Messages are published once per topic and fanned out to bounded
+per-subscriber queues, so the cost of producing an update does not grow
+with the number of connected clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from typing import Any
+
+
+class Subscription:
+    """One subscriber's bounded message queue."""
+
+    def __init__(self, broker: "Broker", topic: str, maxsize: int):
+        self.broker = broker
+        self.topic = topic
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        # Set when messages were dropped; the consumer should resync
+        self.overflowed = False
+
+    def offer(self, message: Any) -> None:
+        """Queue ``message`` without blocking (called by the broker)."""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Next message, or None if ``timeout`` expires first."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class AsyncSubscription(Subscription):
+    """Subscription consumed from an asyncio event loop.
+
+    Publishers may run on any thread; messages are handed to the loop, so
+    a waiting subscriber costs a coroutine rather than a thread.
+    """
+
+    def __init__(self, broker: "Broker", topic: str, maxsize: int):
+        self.broker = broker
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def _put(self, message: Any) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def offer(self, message: Any) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop already closed; the subscriber is gone
+            self.broker.unsubscribe(self)
+
+    async def get(self, timeout: float | None = None) -> Any:
+        """Next message, or None if ``timeout`` expires first."""
+        if timeout == 0:
+            try:
+                return self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """Topic-based fan-out to subscriber queues."""
+
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self._topics: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(self, topic, self.maxsize)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def subscribe_async(self, topic: str) -> AsyncSubscription:
+        """Subscribe from a coroutine; the subscription's ``get`` is awaitable."""
+        subscription = AsyncSubscription(self, topic, self.maxsize)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[subscription.topic]
+
+    def publish(self, topic: str, message: Any) -> int:
+        """Deliver ``message`` to every subscriber of ``topic``.
+
+        Returns the number of subscribers reached. Subscribers whose
+        queue is full miss the message and are flagged as overflowed.
+        """
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        for subscription in subscribers:
+            subscription.offer(message)
+        return len(subscribers)
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        with self._lock:
+            if topic is not None:
+                return len(self._topics.get(topic, ()))
+            return sum(len(s) for s in self._topics.values())
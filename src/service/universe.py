@@ -0,0 +1,364 @@
+"""Columnar snapshot of a symbol universe: one row per symbol.
+
+Prices, indicators, analysis and forecast results for a whole universe
+are held in one set of column arrays, built once per fetch or prefetch
+refresh. Consumers read what they need from it: overview rows for the
+JSON API (built once and reused), a pandas DataFrame for the Streamlit
+dashboard, or an Arrow table / IPC stream. pandas and pyarrow are only
+imported when those conversions are asked for.
+
+Sorted and filtered views (``select``) read per-column sort indexes,
+also built once per snapshot, so paging through a large universe costs
+a mask and a slice per request rather than a sort.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from src.analysis.technical import RECOMMENDATION_KR, AnalysisResult, analyze_multiple
+from src.data.collector import MarketData
+from src.data.compact import indicator_matrix
+from src.forecast.predictor import DIRECTION_EMOJI, DIRECTION_KR, ForecastResult, predict_multiple
+from src.service.hashing import content_hash
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+# Column name -> dtype; object columns hold Python strings
+COLUMNS = {
+    "tv_symbol": object,
+    "symbol": object,
+    "exchange": object,
+    "name": object,
+    "price": np.float64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "volume": np.float64,
+    "change": np.float64,
+    "change_pct": np.float64,
+    "summary": object,
+    "summary_score": np.int64,
+    "oscillator": object,
+    "oscillator_buy": np.int64,
+    "oscillator_sell": np.int64,
+    "oscillator_neutral": np.int64,
+    "ma": object,
+    "ma_buy": np.int64,
+    "ma_sell": np.int64,
+    "ma_neutral": np.int64,
+    "trend": object,
+    "direction": object,
+    "confidence": np.float64,
+    "signal_strength": np.int64,
+}
+
+# Columns ``select`` can sort by; text columns sort case-insensitively
+SORT_COLUMNS = ("symbol", "name", "price", "change_pct", "summary_score", "confidence", "signal_strength")
+
+
+def _column_values(tv_symbol: str, d: MarketData, a: AnalysisResult, f: ForecastResult) -> tuple:
+    """One symbol's values in ``COLUMNS`` order."""
+    return (
+        tv_symbol, a.symbol, d.exchange, a.name,
+        a.price, d.open_price, d.high, d.low, d.volume, d.change, a.change_pct,
+        a.summary_recommendation, a.summary_score,
+        a.oscillator_recommendation, a.oscillator_buy, a.oscillator_sell, a.oscillator_neutral,
+        a.ma_recommendation, a.ma_buy, a.ma_sell, a.ma_neutral,
+        a.trend,
+        f.direction, f.confidence, f.signal_strength,
+    )
+
+
+class UniverseSnapshot:
+    """Pipeline results for a universe as column arrays, one row per key.
+
+    Attributes:
+        interval: Interval the data was fetched for.
+        keys: Symbol keys in row order.
+        index: Key -> row number.
+        columns: Column name -> 1-D array (see ``COLUMNS``).
+        indicator_keys: Indicator names, in ``indicators`` column order.
+        indicators: (rows, indicators) float64 matrix, NaN for missing.
+        updated_at: Unix time of the refresh, or None for a live fetch.
+    """
+
+    def __init__(
+        self,
+        interval: str,
+        keys: list[str],
+        columns: dict[str, np.ndarray],
+        indicator_keys: list[str],
+        indicators: np.ndarray,
+        updated_at: float | None = None,
+    ):
+        self.interval = interval
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.columns = columns
+        self.indicator_keys = indicator_keys
+        self.indicators = indicators
+        self.updated_at = updated_at
+        # Built on first use and shared by every reader of this snapshot
+        self._rows: list[dict | None] | None = None
+        self._row_hashes: list[str | None] | None = None
+        self._sort_indexes: dict[tuple[str, bool], np.ndarray] = {}
+
+    @classmethod
+    def build(
+        cls,
+        tv_symbols: dict[str, str],
+        market_data: dict[str, MarketData],
+        analyses: dict[str, AnalysisResult],
+        forecasts: dict[str, ForecastResult],
+        interval: str = "",
+        updated_at: float | None = None,
+    ) -> "UniverseSnapshot":
+        """Assemble a snapshot from per-symbol pipeline results.
+
+        Args:
+            tv_symbols: Key -> 'EXCHANGE:SYMBOL'.
+            market_data: Key -> MarketData; its order is the row order.
+            analyses: Key -> AnalysisResult.
+            forecasts: Key -> ForecastResult.
+            interval: Interval the data was fetched for.
+            updated_at: Unix time of the refresh, if any.
+        """
+        keys = [key for key in market_data if key in analyses and key in forecasts]
+        values = [
+            _column_values(tv_symbols[key], market_data[key], analyses[key], forecasts[key])
+            for key in keys
+        ]
+        transposed = zip(*values) if values else ([] for _ in COLUMNS)
+        columns = {
+            name: np.array(column, dtype=dtype)
+            for (name, dtype), column in zip(COLUMNS.items(), transposed)
+        }
+
+        items = [market_data[key].indicators for key in keys]
+        indicator_keys = list(items[0]) if items else []
+        indicators = indicator_matrix(items, indicator_keys)
+        return cls(interval, keys, columns, indicator_keys, indicators, updated_at)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def _positions(self, keys: Iterable[str] | None) -> list[int]:
+        if keys is None:
+            return list(range(len(self.keys)))
+        return [self.index[key] for key in keys if key in self.index]
+
+    # ── JSON ──
+
+    def _build_rows(self, positions: list[int]) -> list[dict]:
+        c = self.columns
+        return [
+            {
+                "key": key,
+                "tv_symbol": tv_symbol,
+                "symbol": symbol,
+                "name": name,
+                "price": price,
+                "change_pct": round(change_pct, 2),
+                "summary": summary,
+                "summary_kr": RECOMMENDATION_KR.get(summary, summary),
+                "trend": trend,
+                "direction": direction,
+                "direction_kr": DIRECTION_KR.get(direction, direction),
+                "direction_emoji": DIRECTION_EMOJI.get(direction, "?"),
+                "confidence": confidence,
+                "signal_strength": signal_strength,
+            }
+            for key, tv_symbol, symbol, name, price, change_pct, summary, trend, direction, confidence, signal_strength
+            in zip(
+                [self.keys[i] for i in positions], c["tv_symbol"][positions], c["symbol"][positions],
+                c["name"][positions], c["price"][positions].tolist(), c["change_pct"][positions].tolist(),
+                c["summary"][positions], c["trend"][positions], c["direction"][positions],
+                c["confidence"][positions].tolist(), c["signal_strength"][positions].tolist(),
+            )
+        ]
+
+    def _rows_at(self, positions: list[int]) -> list[dict]:
+        # Rows are built per position as they are first asked for, so a
+        # page of a large universe only builds that page
+        if self._rows is None:
+            self._rows = [None] * len(self.keys)
+        cache = self._rows
+        missing = [i for i in positions if cache[i] is None]
+        if missing:
+            for i, row in zip(missing, self._build_rows(missing)):
+                cache[i] = row
+        return [cache[i] for i in positions]
+
+    def rows(self, keys: Iterable[str] | None = None) -> list[dict]:
+        """Overview rows (the /api/overview format) for ``keys``, or all rows.
+
+        Rows are built once per snapshot and shared; do not modify them.
+        Keys missing from the snapshot are skipped.
+        """
+        return self._rows_at(self._positions(keys))
+
+    def row_hashes(self, keys: Iterable[str] | None = None) -> dict[str, str]:
+        """Key -> content hash of each overview row (see ``src.service.hashing``)."""
+        if self._row_hashes is None:
+            self._row_hashes = [None] * len(self.keys)
+        cache = self._row_hashes
+        positions = self._positions(keys)
+        missing = [i for i in positions if cache[i] is None]
+        for i, row in zip(missing, self._rows_at(missing)):
+            cache[i] = content_hash(row)
+        return {self.keys[i]: cache[i] for i in positions}
+
+    # ── Sorted / filtered views ──
+
+    def sort_index(self, column: str, descending: bool = False) -> np.ndarray:
+        """Row numbers ordered by ``column`` (one of ``SORT_COLUMNS``).
+
+        Built once per snapshot, column and order. Ties keep row order;
+        NaN sorts last either way.
+        """
+        order = self._sort_indexes.get((column, descending))
+        if order is None:
+            values = self.columns[column]
+            if values.dtype == object:
+                # Sort text by the rank of its case-folded value, like numbers
+                _, values = np.unique([str(v).casefold() for v in values], return_inverse=True)
+            order = np.argsort(-values if descending else values, kind="stable")
+            self._sort_indexes[(column, descending)] = order
+        return order
+
+    def build_sort_indexes(self) -> None:
+        """Build every ``SORT_COLUMNS`` index ahead of the first request."""
+        for column in SORT_COLUMNS:
+            self.sort_index(column)
+            self.sort_index(column, descending=True)
+
+    def select(
+        self,
+        keys: Iterable[str] | None = None,
+        sort: str | None = None,
+        descending: bool = False,
+        trends: Iterable[str] | None = None,
+        directions: Iterable[str] | None = None,
+        min_confidence: float | None = None,
+    ) -> np.ndarray:
+        """Row numbers of ``keys`` (or all rows) that pass the filters.
+
+        Args:
+            keys: Rows to consider; their order is kept when ``sort`` is None.
+            sort: Column to order by (one of ``SORT_COLUMNS``).
+            descending: Sort largest first.
+            trends: Keep only these ``trend`` values.
+            directions: Keep only these forecast ``direction`` values.
+            min_confidence: Keep only forecasts at least this confident (0..1).
+
+        Returns:
+            Row numbers in result order; ``keys_at`` maps them to keys.
+        """
+        c = self.columns
+        order = np.arange(len(self.keys)) if keys is None else np.array(self._positions(keys), dtype=np.intp)
+        conditions = []
+        if trends is not None:
+            conditions.append(np.isin(c["trend"], list(trends)))
+        if directions is not None:
+            conditions.append(np.isin(c["direction"], list(directions)))
+        if min_confidence is not None:
+            conditions.append(c["confidence"] >= min_confidence)
+
+        if sort is None:
+            for condition in conditions:
+                order = order[condition[order]]
+            return order
+        member = np.zeros(len(self.keys), dtype=bool)
+        member[order] = True
+        for condition in conditions:
+            member &= condition
+        index = self.sort_index(sort, descending)
+        return index[member[index]]
+
+    def keys_at(self, positions: Iterable[int]) -> list[str]:
+        """Symbol keys of row numbers, e.g. a slice of ``select``."""
+        return [self.keys[i] for i in positions]
+
+    def direction_counts(self, positions: np.ndarray) -> dict[str, int]:
+        """Forecast direction -> number of rows among ``positions``."""
+        values, counts = np.unique(self.columns["direction"][positions].astype(str), return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    # ── pandas / Arrow ──
+
+    def to_pandas(self, keys: Iterable[str] | None = None, indicators: bool = False) -> "pd.DataFrame":
+        """DataFrame indexed by key, optionally with one column per indicator.
+
+        Indicators named like a price column (``open``, ``volume``, ...)
+        get an ``_indicator`` suffix.
+        """
+        import pandas as pd
+
+        positions = self._positions(keys)
+        index = pd.Index([self.keys[i] for i in positions], name="key")
+        frame = pd.DataFrame({name: column[positions] for name, column in self.columns.items()}, index=index)
+        if indicators:
+            frame = frame.join(pd.DataFrame(
+                self.indicators[positions], columns=self.indicator_keys, index=index
+            ), rsuffix="_indicator")
+        return frame
+
+    def to_arrow(self, keys: Iterable[str] | None = None, indicators: bool = False) -> "pa.Table":
+        """Arrow table with a ``key`` column first, laid out like ``to_pandas``. Requires pyarrow."""
+        import pyarrow as pa
+
+        positions = self._positions(keys)
+        arrays = {"key": pa.array([self.keys[i] for i in positions], pa.string())}
+        for name, column in self.columns.items():
+            values = column[positions]
+            arrays[name] = pa.array(values.tolist(), pa.string()) if column.dtype == object else pa.array(values)
+        if indicators:
+            for j, name in enumerate(self.indicator_keys):
+                column = name if name not in arrays else f"{name}_indicator"
+                arrays[column] = pa.array(self.indicators[positions, j])
+        return pa.table(arrays)
+
+    def to_arrow_ipc(self, keys: Iterable[str] | None = None, indicators: bool = False) -> bytes:
+        """Arrow IPC stream bytes (``ARROW_MIMETYPE``). Requires pyarrow."""
+        import pyarrow as pa
+
+        table = self.to_arrow(keys, indicators)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+
+def analyze_universe(
+    symbols: dict[str, tuple[str, str]],
+    market_data: dict[str, MarketData],
+    interval: str = "",
+    updated_at: float | None = None,
+) -> UniverseSnapshot:
+    """Analyze and forecast fetched market data into a ``UniverseSnapshot``.
+
+    Args:
+        symbols: Mapping of key -> (tv_symbol, display_name).
+        market_data: Key -> MarketData, as returned by ``fetch_multiple``.
+        interval: Interval the data was fetched for.
+        updated_at: Unix time of the refresh, if any.
+    """
+    return UniverseSnapshot.build(
+        {key: tv_symbol for key, (tv_symbol, _) in symbols.items()},
+        market_data,
+        analyze_multiple(market_data),
+        predict_multiple(market_data, interval),
+        interval,
+        updated_at,
+    )
@@ -2,17 +2,53 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Mapping
 
-from flask import Flask, render_template, jsonify, request
+import numpy as np
+from flask import Flask, Response, g, render_template, jsonify, request, stream_with_context
 
-from src.config import SYMBOLS, INTERVALS, DEFAULT_INTERVAL
-from src.data.collector import fetch_analysis, fetch_multiple
-from src.analysis.technical import analyze, analyze_multiple
-from src.forecast.predictor import predict, predict_multiple
+from src import metrics
+from src.config import INTERVALS, DEFAULT_INTERVAL
+from src.data.symbols import get_registry, symbols_for_category
+from src.data.collector import fetch_analysis, fetch_intervals, fetch_multiple, iter_multiple, cache_stats
+from src.analysis.technical import analyze, analyze_timeframes
+from src.forecast.predictor import predict, predict_timeframes
+from src.service import prefetch
+from src.service.hashing import content_hash
+from src.service.pubsub import Broker
+from src.service.universe import ARROW_MIMETYPE, SORT_COLUMNS, UniverseSnapshot, analyze_universe
+from src.web.delta import OverviewVersions
 
 logger = logging.getLogger(__name__)
 
+# Seconds between keep-alive comments on idle push streams
+UPDATES_HEARTBEAT = 15.0
+
+# Change notifications from the prefetch scheduler, serialized once per
+# refresh and fanned out to every /api/updates subscriber
+updates = Broker()
+
+# Recently served overview row sets, so polling clients can ask for a delta
+overview_versions = OverviewVersions()
+
+# Largest page /api/overview serves when a ``limit`` is given
+OVERVIEW_MAX_LIMIT = 1000
+
+# Requests sending this header (any value but "0") get a Server-Timing
+# response header with the time spent in each pipeline stage
+TRACE_HEADER = "X-Trace"
+
+http_request_seconds = metrics.histogram(
+    "tv_http_request_seconds",
+    "Time to produce a response (headers only for streams), by route",
+    ["endpoint", "method", "status"],
+)
+
 app = Flask(
     __name__,
     template_folder="templates",
@@ -20,27 +56,214 @@ app = Flask(
 )
 
 
-@app.route("/")
-def index():
-    """Main dashboard page."""
-    return render_template("index.html", symbols=SYMBOLS, intervals=INTERVALS)
+@dataclass(slots=True)
+class OverviewQuery:
+    """Paging, sorting and filtering parameters of an /api/overview request."""
 
+    sort: str | None = None
+    descending: bool = False
+    trends: list[str] | None = None
+    directions: list[str] | None = None
+    min_confidence: float | None = None
+    offset: int = 0
+    limit: int | None = None
+    cursor: str | None = None
 
-@app.route("/api/analyze", methods=["GET"])
-def api_analyze():
-    """Analyze a single symbol."""
-    tv_symbol = request.args.get("symbol", "SP:SPX")
-    interval = request.args.get("interval", DEFAULT_INTERVAL)
-    name = request.args.get("name", "")
+    @property
+    def filtered(self) -> bool:
+        """Whether the result depends on more than the category order."""
+        return not (self.sort is None and self.trends is None and self.directions is None
+                    and self.min_confidence is None)
 
-    data = fetch_analysis(tv_symbol, interval, name)
-    if data is None:
-        return jsonify({"error": f"Failed to fetch data for {tv_symbol}"}), 400
+    @property
+    def paged(self) -> bool:
+        return self.limit is not None or self.offset > 0 or self.cursor is not None
+
+    @property
+    def shaped(self) -> bool:
+        """Whether any paging, sorting or filtering parameter was given.
+
+        Plain category requests keep the unpaged response shape, without
+        the paging fields.
+        """
+        return self.filtered or self.paged
+
+    def scope(self, interval: str, category: str) -> str:
+        """Version scope of the view: category plus every shaping parameter."""
+        base = f"{interval}:{category}"
+        if not self.shaped:
+            return base
+        return f"{base}:{content_hash([getattr(self, name) for name in self.__slots__])}"
+
+
+def _list_param(raw: str | None) -> list[str] | None:
+    """Comma-separated parameter -> upper-cased values (None when empty)."""
+    values = [value.strip().upper() for value in (raw or "").split(",") if value.strip()]
+    return values or None
+
+
+def _parse_overview_query(args: Mapping[str, str]) -> OverviewQuery:
+    """Read ``sort``, ``trend``, ``direction``, ``min_confidence``,
+    ``offset``, ``limit`` and ``cursor`` from request arguments.
+
+    ``sort`` is a column of ``SORT_COLUMNS``, ``-`` prefixed for
+    descending order. ``trend`` and ``direction`` take comma-separated
+    values.
+
+    Raises:
+        ValueError: With a message for the client, on invalid values.
+    """
+    sort = args.get("sort") or None
+    descending = False
+    if sort is not None and sort.startswith("-"):
+        sort, descending = sort[1:], True
+    if sort is not None and sort not in SORT_COLUMNS:
+        raise ValueError(f"Unknown sort column '{sort}' (one of {', '.join(SORT_COLUMNS)})")
+    try:
+        min_confidence = float(args["min_confidence"]) if args.get("min_confidence") else None
+        offset = int(args.get("offset") or 0)
+        limit = int(args["limit"]) if args.get("limit") else None
+    except ValueError:
+        raise ValueError("offset, limit and min_confidence must be numbers") from None
+    if offset < 0 or (limit is not None and not 0 < limit <= OVERVIEW_MAX_LIMIT):
+        raise ValueError(f"offset must be >= 0 and limit between 1 and {OVERVIEW_MAX_LIMIT}")
+    return OverviewQuery(
+        sort=sort,
+        descending=descending,
+        trends=_list_param(args.get("trend")),
+        directions=_list_param(args.get("direction")),
+        min_confidence=min_confidence,
+        offset=offset,
+        limit=limit,
+        cursor=args.get("cursor") or None,
+    )
+
+
+def _page_range(query: OverviewQuery, total: int, cursor_at: int | None) -> tuple[int, int]:
+    """[start, end) of the requested page in a result of ``total`` rows.
+
+    ``cursor_at`` is the position of the ``cursor`` key in the result;
+    a cursor whose row is gone falls back to ``offset``.
+    """
+    start = cursor_at + 1 if cursor_at is not None else min(query.offset, total)
+    end = total if query.limit is None else min(start + query.limit, total)
+    return start, end
+
+
+def _live_symbols(
+    all_symbols: dict[str, tuple[str, str]],
+    query: OverviewQuery,
+) -> tuple[dict[str, tuple[str, str]], int | None]:
+    """Symbols to fetch when there is no prefetched snapshot.
 
-    analysis = analyze(data)
-    forecast = predict(data)
+    Sorting and filtering need the whole category; plain paging fetches
+    only the page. Returns (symbols, offset of the page in the category),
+    the offset being None when the whole category is fetched.
+    """
+    if query.filtered or not query.paged:
+        return all_symbols, None
+    keys = list(all_symbols)
+    cursor_at = keys.index(query.cursor) if query.cursor in all_symbols else None
+    start, end = _page_range(query, len(keys), cursor_at)
+    return {key: all_symbols[key] for key in keys[start:end]}, start
 
-    return jsonify({
+
+def _select_overview(
+    universe: UniverseSnapshot,
+    all_symbols: dict[str, tuple[str, str]],
+    query: OverviewQuery,
+    window: int | None = None,
+) -> tuple[list[str], dict]:
+    """Keys of the requested page and the paging fields of the response.
+
+    ``window`` is the offset from ``_live_symbols`` when ``universe``
+    holds only the requested page of the category; ``counts`` then
+    covers that page only.
+    """
+    if window is not None:
+        keys = [key for key in all_symbols if key in universe]
+        order = universe.select(keys)
+        total = len(all_symbols)
+        start, end = window, window + len(universe)
+        page = universe.keys_at(order)
+    else:
+        order = universe.select(
+            all_symbols, query.sort, query.descending, query.trends, query.directions, query.min_confidence
+        )
+        cursor_at = None
+        if query.cursor is not None and query.cursor in universe:
+            hits = np.flatnonzero(order == universe.index[query.cursor])
+            cursor_at = int(hits[0]) if hits.size else None
+        total = len(order)
+        start, end = _page_range(query, total, cursor_at)
+        page = universe.keys_at(order[start:end])
+    return page, {
+        "total": total,
+        "offset": start,
+        "limit": query.limit,
+        "next_cursor": page[-1] if page and end < total else None,
+        "counts": universe.direction_counts(order),
+    }
+
+
+def _parse_stream_query(args: Mapping[str, str]) -> OverviewQuery:
+    """``_parse_overview_query`` for /api/overview/stream: paging only.
+
+    Raises:
+        ValueError: On invalid values, or sorting and filtering parameters.
+    """
+    query = _parse_overview_query(args)
+    if query.filtered:
+        raise ValueError("Sorted or filtered overviews are not streamed; use /api/overview")
+    return query
+
+
+def _snapshot_stream(snapshot, all_symbols: dict[str, tuple[str, str]], query: OverviewQuery, scope: str) -> Iterator[str]:
+    """/api/overview/stream events for a page of a prefetched snapshot."""
+    universe = snapshot.universe
+    keys, page = _select_overview(universe, all_symbols, query)
+    yield _sse("start", {"total": page["total"], "offset": page["offset"]})
+    rows = universe.rows(keys)
+    for row in rows:
+        yield _sse("row", row)
+    version, _ = overview_versions.record(scope, rows, universe.row_hashes(keys))
+    yield _sse("done", {
+        "version": version,
+        "keys": keys,
+        "count": len(keys),
+        "total": page["total"],
+        "counts": page["counts"],
+        "updated_at": snapshot.updated_at,
+    })
+
+
+def _stream_done(
+    scope: str,
+    symbols: dict[str, tuple[str, str]],
+    rows: dict[str, dict],
+    row_hashes: dict[str, str],
+    total: int,
+) -> dict:
+    """``done`` event of a live /api/overview/stream page.
+
+    Rows were streamed as their fetches finished; the version is taken
+    over them in category order, as ``/api/overview`` serves the page.
+    """
+    keys = [key for key in symbols if key in rows]
+    version, _ = overview_versions.record(scope, [rows[key] for key in keys], {key: row_hashes[key] for key in keys})
+    return {
+        "version": version,
+        "keys": keys,
+        "count": len(keys),
+        "total": total,
+        "counts": dict(Counter(rows[key]["direction"] for key in keys)),
+        "updated_at": None,
+    }
+
+
+def _analyze_payload(analysis, forecast) -> dict:
+    """/api/analyze response body."""
+    return {
         "analysis": {
             "symbol": analysis.symbol,
             "name": analysis.name,
@@ -77,47 +300,382 @@ def api_analyze():
             "signal_strength": forecast.signal_strength,
             "factors": forecast.factors,
         },
-    })
+    }
+
+
+def _parse_intervals(raw: str | None) -> list[str]:
+    """Comma-separated ``intervals`` parameter -> known intervals (all when empty)."""
+    if not raw:
+        return list(INTERVALS)
+    requested = [interval.strip() for interval in raw.split(",")]
+    return [interval for interval in dict.fromkeys(requested) if interval in INTERVALS]
+
+
+def _prefetched_intervals(tv_symbol: str, intervals: list[str]) -> dict:
+    """Interval -> prefetched SymbolSnapshot for the intervals the store has."""
+    entries = {}
+    for interval in intervals:
+        entry = prefetch.store.lookup(interval, tv_symbol)
+        if entry is not None:
+            entries[interval] = entry
+    return entries
+
+
+def _timeframes_payload(consensus, forecasts: dict, intervals: list[str]) -> dict:
+    """/api/analyze/multi response body."""
+    return {
+        "symbol": consensus.symbol,
+        "name": consensus.name,
+        "consensus": {
+            "score": consensus.score,
+            "recommendation": consensus.recommendation,
+            "recommendation_kr": consensus.recommendation_kr,
+            "trend_score": consensus.trend_score,
+            "trend": consensus.trend,
+            "agreement": consensus.agreement,
+        },
+        # Analysed intervals in request order (JSON object keys may be re-sorted)
+        "intervals": list(consensus.analyses),
+        "timeframes": {
+            interval: _analyze_payload(analysis, forecasts[interval])
+            for interval, analysis in consensus.analyses.items()
+        },
+        "failed": [interval for interval in intervals if interval not in consensus.analyses],
+    }
+
+
+def _overview_payload(
+    scope: str,
+    results: list[dict],
+    updated_at: float | None,
+    since: str | None,
+    row_hashes: dict[str, str] | None = None,
+    page: dict | None = None,
+) -> tuple[dict | None, str]:
+    """/api/overview response body and version token.
+
+    The version token doubles as the ETag; it covers the rows only, so a
+    refresh that changed nothing still revalidates as 304. The body is
+    None when ``since`` already is the current version. ``page`` holds
+    the paging fields from ``_select_overview``.
+    """
+    version, row_hashes = overview_versions.record(scope, results, row_hashes)
+    if since == version:
+        return None, version
+    if since and (delta := overview_versions.delta(scope, since, results, row_hashes)) is not None:
+        changed, removed = delta
+        return {
+            "delta": True,
+            "since": since,
+            "version": version,
+            "changed": changed,
+            "removed": removed,
+            "count": len(results),
+            "updated_at": updated_at,
+            **(page or {}),
+        }, version
+    return {
+        "delta": False,
+        "version": version,
+        "results": results,
+        "count": len(results),
+        "updated_at": updated_at,
+        **(page or {}),
+    }, version
+
+
+def _sse(event: str, payload: dict) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _publish_changes(snapshot, changed: list[str], removed: list[str]) -> None:
+    """Push changed overview rows to subscribers of each affected category."""
+    # Only the categories of the symbols that changed, not every category
+    registry = get_registry()
+    by_category: dict[str, tuple[list[str], list[str]]] = {"all": (changed, removed)}
+    for keys, slot in ((changed, 0), (removed, 1)):
+        for key in keys:
+            info = registry.get(key)
+            if info is not None:
+                by_category.setdefault(info.category, ([], []))[slot].append(key)
+    for category, (keys, gone) in by_category.items():
+        topic = f"{snapshot.interval}:{category}"
+        if not updates.subscriber_count(topic):
+            continue
+        rows = snapshot.universe.rows(keys)
+        if rows or gone:
+            updates.publish(topic, _sse("update", {
+                "interval": snapshot.interval,
+                "category": category,
+                "updated_at": snapshot.updated_at,
+                "changed": rows,
+                "removed": gone,
+            }))
+
+
+prefetch.store.subscribe(_publish_changes)
+
+
+def _runtime_metrics() -> list[str]:
+    """Cache counters and push subscribers, read at scrape time for /metrics."""
+    stats = cache_stats()
+    lines = []
+    for name in ("hits", "misses", "coalesced", "evictions"):
+        metric = f"tv_cache_{name}_total"
+        lines += [f"# HELP {metric} Market data cache {name}", f"# TYPE {metric} counter", f"{metric} {stats[name]}"]
+    lines += metrics.gauge_lines("tv_cache_entries", "Market data cache entries", stats["size"])
+    lines += metrics.gauge_lines("tv_updates_subscribers", "Open /api/updates streams", updates.subscriber_count())
+    return lines
+
+
+metrics.REGISTRY.add_collector(_runtime_metrics)
+
+
+def _trace_requested() -> bool:
+    value = request.headers.get(TRACE_HEADER)
+    return value is not None and value != "0"
+
+
+@app.before_request
+def _start_timing():
+    g.request_start = time.perf_counter()
+    g.trace_token = metrics.start_trace() if _trace_requested() else None
+
+
+@app.after_request
+def _finish_timing(response: Response) -> Response:
+    elapsed = time.perf_counter() - g.request_start
+    endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    http_request_seconds.observe(
+        elapsed, endpoint=endpoint, method=request.method, status=response.status_code
+    )
+    if g.trace_token is not None:
+        trace = metrics.end_trace(g.trace_token)
+        g.trace_token = None
+        trace.append(("total", elapsed))
+        response.headers["Server-Timing"] = metrics.server_timing(trace)
+    return response
+
+
+@app.route("/")
+def index():
+    """Main dashboard page."""
+    return render_template("index.html", symbols=get_registry().by_category(), intervals=INTERVALS)
+
+
+@app.route("/api/analyze", methods=["GET"])
+def api_analyze():
+    """Analyze a single symbol."""
+    tv_symbol = request.args.get("symbol", "SP:SPX")
+    interval = request.args.get("interval", DEFAULT_INTERVAL)
+    name = request.args.get("name", "")
+
+    # Serve from the prefetched snapshot when available
+    entry = prefetch.store.lookup(interval, tv_symbol)
+    if entry is not None:
+        analysis, forecast = entry.analysis, entry.forecast
+    else:
+        data = fetch_analysis(tv_symbol, interval, name)
+        if data is None:
+            return jsonify({"error": f"Failed to fetch data for {tv_symbol}"}), 400
+        with metrics.stage("analyze"):
+            analysis = analyze(data)
+        with metrics.stage("predict"):
+            forecast = predict(data, interval)
+
+    payload = _analyze_payload(analysis, forecast)
+    with metrics.stage("json"):
+        response = jsonify(payload)
+    response.set_etag(content_hash(payload))
+    return response.make_conditional(request)
+
+
+@app.route("/api/analyze/multi", methods=["GET"])
+def api_analyze_multi():
+    """Analyze a single symbol on several intervals with a weighted consensus.
+
+    Intervals missing from the prefetched snapshots are fetched together
+    (one scan request per screener), not one request per interval.
+    """
+    tv_symbol = request.args.get("symbol", "SP:SPX")
+    name = request.args.get("name", "")
+    intervals = _parse_intervals(request.args.get("intervals"))
+    if not intervals:
+        return jsonify({"error": "No valid intervals"}), 400
+
+    entries = _prefetched_intervals(tv_symbol, intervals)
+    data = {interval: entry.data for interval, entry in entries.items()}
+    forecasts = {interval: entry.forecast for interval, entry in entries.items()}
+    missing = [interval for interval in intervals if interval not in entries]
+    if missing:
+        fetched = fetch_intervals(tv_symbol, missing, name)
+        data.update(fetched)
+        forecasts.update(predict_timeframes(fetched))
+
+    consensus = analyze_timeframes({interval: data[interval] for interval in intervals if interval in data})
+    if consensus is None:
+        return jsonify({"error": f"Failed to fetch data for {tv_symbol}"}), 400
+
+    payload = _timeframes_payload(consensus, forecasts, intervals)
+    with metrics.stage("json"):
+        response = jsonify(payload)
+    response.set_etag(content_hash(payload))
+    return response.make_conditional(request)
 
 
 @app.route("/api/overview", methods=["GET"])
 def api_overview():
-    """Get overview for all configured symbols."""
+    """Get overview for all configured symbols.
+
+    Responses carry an ETag equal to their version token. Passing a
+    previous token as ``since`` returns only the rows changed since then
+    (``"delta": true``); an unknown token falls back to the full list.
+    ``format=arrow`` returns the overview columns as an Arrow IPC stream
+    instead (requires pyarrow).
+
+    ``sort``, ``trend``, ``direction`` and ``min_confidence`` sort and
+    filter the rows, and ``limit`` with ``offset`` or ``cursor`` (the
+    ``next_cursor`` of the previous page) select one page of them (see
+    ``_parse_overview_query``). Only then does the response carry the
+    paging fields; ``total`` and ``counts`` describe the whole filtered
+    result, not just the page.
+    """
     interval = request.args.get("interval", DEFAULT_INTERVAL)
     category = request.args.get("category", "all")
+    all_symbols = symbols_for_category(category)
+    try:
+        query = _parse_overview_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if category == "all":
-        all_symbols = {}
-        for cat_symbols in SYMBOLS.values():
-            all_symbols.update(cat_symbols)
+    snapshot = prefetch.store.get(interval)
+    window = None
+    if snapshot is not None:
+        # Read precomputed results; never block on TradingView
+        universe = snapshot.universe
     else:
-        all_symbols = SYMBOLS.get(category, {})
-
-    market_data = fetch_multiple(all_symbols, interval)
-    analyses = analyze_multiple(market_data)
-    forecasts = predict_multiple(market_data)
-
-    results = []
-    for key in analyses:
-        a = analyses[key]
-        f = forecasts[key]
-        results.append({
-            "key": key,
-            "symbol": a.symbol,
-            "name": a.name,
-            "price": a.price,
-            "change_pct": round(a.change_pct, 2),
-            "summary": a.summary_recommendation,
-            "summary_kr": a.summary_kr,
-            "trend": a.trend,
-            "direction": f.direction,
-            "direction_kr": f.direction_kr,
-            "direction_emoji": f.direction_emoji,
-            "confidence": f.confidence,
-            "signal_strength": f.signal_strength,
-        })
-
-    return jsonify({"results": results, "count": len(results)})
+        symbols, window = _live_symbols(all_symbols, query)
+        universe = analyze_universe(symbols, fetch_multiple(symbols, interval), interval)
+
+    keys, page = _select_overview(universe, all_symbols, query, window)
+    results = universe.rows(keys)
+    scope = query.scope(interval, category)
+
+    if request.args.get("format") == "arrow":
+        version, _ = overview_versions.record(scope, results, universe.row_hashes(keys))
+        try:
+            with metrics.stage("arrow"):
+                response = Response(universe.to_arrow_ipc(keys), mimetype=ARROW_MIMETYPE)
+        except ImportError:
+            return jsonify({"error": "Arrow output requires pyarrow"}), 400
+        response.set_etag(version)
+        return response.make_conditional(request)
+
+    payload, version = _overview_payload(
+        scope, results, universe.updated_at, request.args.get("since"), universe.row_hashes(keys),
+        page if query.shaped else None,
+    )
+    with metrics.stage("json"):
+        response = jsonify(payload) if payload is not None else Response(status=304)
+    response.set_etag(version)
+    return response.make_conditional(request)
+
+
+@app.route("/api/overview/stream", methods=["GET"])
+def api_overview_stream():
+    """Stream overview rows as Server-Sent Events, one per symbol.
+
+    Takes the paging parameters of ``/api/overview`` but not sorting or
+    filtering. A ``start`` event reports the result ``total`` and the
+    page ``offset``; a ``row`` event follows as soon as each symbol's
+    fetch completes. The final ``done`` event lists the row ``keys`` in
+    ``/api/overview`` order and the version token to pass as ``since``
+    on later polls of the same page.
+    """
+    interval = request.args.get("interval", DEFAULT_INTERVAL)
+    category = request.args.get("category", "all")
+    all_symbols = symbols_for_category(category)
+    try:
+        query = _parse_stream_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    scope = query.scope(interval, category)
+
+    def generate():
+        snapshot = prefetch.store.get(interval)
+        if snapshot is not None:
+            yield from _snapshot_stream(snapshot, all_symbols, query, scope)
+            return
+        symbols, offset = _live_symbols(all_symbols, query)
+        yield _sse("start", {"total": len(all_symbols), "offset": offset or 0})
+        rows, row_hashes = {}, {}
+        for key, data in iter_multiple(symbols, interval):
+            universe = analyze_universe({key: symbols[key]}, {key: data}, interval)
+            row_hashes.update(universe.row_hashes())
+            for row in universe.rows():
+                rows[row["key"]] = row
+                yield _sse("row", row)
+        yield _sse("done", _stream_done(scope, symbols, rows, row_hashes, len(all_symbols)))
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/updates", methods=["GET"])
+def api_updates():
+    """Long-lived SSE stream of overview rows whose data changed.
+
+    All subscribers share the prefetch scheduler's refresh loop; nothing
+    is fetched per connection. The first ``hello`` event reports whether
+    the scheduler is running (``live``); if not, the stream ends and the
+    client should fall back to polling. A ``resync`` event asks the
+    client to reload the full overview after it fell behind.
+    """
+    interval = request.args.get("interval", DEFAULT_INTERVAL)
+    category = request.args.get("category", "all")
+    live = prefetch.is_running(interval)
+    subscription = updates.subscribe(f"{interval}:{category}") if live else None
+
+    def generate():
+        yield _sse("hello", {"live": live, "interval": interval, "category": category})
+        if subscription is None:
+            return
+        try:
+            while True:
+                message = subscription.get(timeout=UPDATES_HEARTBEAT)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while subscription.get(timeout=0) is not None:
+                        pass
+                    yield _sse("resync", {})
+                elif message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield message
+        finally:
+            subscription.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def api_cache_stats():
+    """Market data cache hit/miss counters."""
+    return jsonify(cache_stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def api_metrics():
+    """Stage latencies, scan/screener counters and cache stats for Prometheus."""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
 
 
 def create_app() -> Flask:
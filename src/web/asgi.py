@@ -0,0 +1,318 @@
+"""ASGI variant of the web dashboard (``python main.py --server asgi``).
+
+Serves the same page and API as ``src.web.app`` with async handlers on
+``src.data.async_collector``, so a slow TradingView fetch does not hold
+a worker thread and idle SSE subscribers cost a coroutine each. Payload
+building, version tracking and the update broker are shared with the
+Flask app. Requires starlette, uvicorn and httpx.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from flask import render_template
+from starlette.applications import Starlette
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import metrics
+from src.config import INTERVALS, DEFAULT_INTERVAL
+from src.data import async_collector
+from src.data.collector import cache_stats
+from src.data.symbols import get_registry, symbols_for_category
+from src.analysis.technical import analyze, analyze_timeframes
+from src.forecast.predictor import predict, predict_timeframes
+from src.service import prefetch
+from src.service.hashing import content_hash
+from src.service.universe import ARROW_MIMETYPE, analyze_universe
+from src.web.app import (
+    TRACE_HEADER,
+    UPDATES_HEARTBEAT,
+    app as flask_app,
+    http_request_seconds,
+    updates,
+    overview_versions,
+    _analyze_payload,
+    _overview_payload,
+    _live_symbols,
+    _parse_intervals,
+    _parse_overview_query,
+    _parse_stream_query,
+    _prefetched_intervals,
+    _select_overview,
+    _snapshot_stream,
+    _sse,
+    _stream_done,
+    _timeframes_payload,
+)
+from src.web.delta import etag_matches
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_index_html: str | None = None
+
+
+def _json(request: Request, payload: dict | None, etag: str, status_code: int = 200) -> Response:
+    """JSON response with an ETag; 304 if the client already has it."""
+    headers = {"ETag": f'"{etag}"'}
+    if payload is None or etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, status_code=status_code, headers=headers)
+
+
+async def index(request: Request) -> Response:
+    """Main dashboard page, rendered once from the Flask template."""
+    global _index_html
+    if _index_html is None:
+        with flask_app.test_request_context("/"):
+            _index_html = render_template("index.html", symbols=get_registry().by_category(), intervals=INTERVALS)
+    return HTMLResponse(_index_html)
+
+
+async def api_analyze(request: Request) -> Response:
+    """Analyze a single symbol."""
+    tv_symbol = request.query_params.get("symbol", "SP:SPX")
+    interval = request.query_params.get("interval", DEFAULT_INTERVAL)
+    name = request.query_params.get("name", "")
+
+    entry = prefetch.store.lookup(interval, tv_symbol)
+    if entry is not None:
+        analysis, forecast = entry.analysis, entry.forecast
+    else:
+        data = await async_collector.fetch_analysis(tv_symbol, interval, name)
+        if data is None:
+            return JSONResponse({"error": f"Failed to fetch data for {tv_symbol}"}, status_code=400)
+        with metrics.stage("analyze"):
+            analysis = analyze(data)
+        with metrics.stage("predict"):
+            forecast = predict(data, interval)
+
+    payload = _analyze_payload(analysis, forecast)
+    return _json(request, payload, content_hash(payload))
+
+
+async def api_analyze_multi(request: Request) -> Response:
+    """Analyze a single symbol on several intervals (see ``app.api_analyze_multi``)."""
+    tv_symbol = request.query_params.get("symbol", "SP:SPX")
+    name = request.query_params.get("name", "")
+    intervals = _parse_intervals(request.query_params.get("intervals"))
+    if not intervals:
+        return JSONResponse({"error": "No valid intervals"}, status_code=400)
+
+    entries = _prefetched_intervals(tv_symbol, intervals)
+    data = {interval: entry.data for interval, entry in entries.items()}
+    forecasts = {interval: entry.forecast for interval, entry in entries.items()}
+    missing = [interval for interval in intervals if interval not in entries]
+    if missing:
+        fetched = await async_collector.fetch_intervals(tv_symbol, missing, name)
+        data.update(fetched)
+        forecasts.update(predict_timeframes(fetched))
+
+    consensus = analyze_timeframes({interval: data[interval] for interval in intervals if interval in data})
+    if consensus is None:
+        return JSONResponse({"error": f"Failed to fetch data for {tv_symbol}"}, status_code=400)
+
+    payload = _timeframes_payload(consensus, forecasts, intervals)
+    return _json(request, payload, content_hash(payload))
+
+
+async def api_overview(request: Request) -> Response:
+    """Get overview for all configured symbols (see ``app.api_overview``)."""
+    interval = request.query_params.get("interval", DEFAULT_INTERVAL)
+    category = request.query_params.get("category", "all")
+    all_symbols = symbols_for_category(category)
+    try:
+        query = _parse_overview_query(request.query_params)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    snapshot = prefetch.store.get(interval)
+    window = None
+    if snapshot is not None:
+        universe = snapshot.universe
+    else:
+        symbols, window = _live_symbols(all_symbols, query)
+        market_data = await async_collector.fetch_multiple(symbols, interval)
+        universe = analyze_universe(symbols, market_data, interval)
+
+    keys, page = _select_overview(universe, all_symbols, query, window)
+    results = universe.rows(keys)
+    scope = query.scope(interval, category)
+
+    if request.query_params.get("format") == "arrow":
+        version, _ = overview_versions.record(scope, results, universe.row_hashes(keys))
+        if etag_matches(request.headers.get("if-none-match"), version):
+            return Response(status_code=304, headers={"ETag": f'"{version}"'})
+        try:
+            body = universe.to_arrow_ipc(keys)
+        except ImportError:
+            return JSONResponse({"error": "Arrow output requires pyarrow"}, status_code=400)
+        return Response(body, media_type=ARROW_MIMETYPE, headers={"ETag": f'"{version}"'})
+
+    payload, version = _overview_payload(
+        scope, results, universe.updated_at, request.query_params.get("since"), universe.row_hashes(keys),
+        page if query.shaped else None,
+    )
+    return _json(request, payload, version)
+
+
+async def api_overview_stream(request: Request) -> Response:
+    """Stream overview rows as Server-Sent Events (see ``app.api_overview_stream``)."""
+    interval = request.query_params.get("interval", DEFAULT_INTERVAL)
+    category = request.query_params.get("category", "all")
+    all_symbols = symbols_for_category(category)
+    try:
+        query = _parse_stream_query(request.query_params)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    scope = query.scope(interval, category)
+
+    async def generate():
+        snapshot = prefetch.store.get(interval)
+        if snapshot is not None:
+            for message in _snapshot_stream(snapshot, all_symbols, query, scope):
+                yield message
+            return
+        symbols, offset = _live_symbols(all_symbols, query)
+        yield _sse("start", {"total": len(all_symbols), "offset": offset or 0})
+        rows, row_hashes = {}, {}
+        async for key, data in async_collector.iter_multiple(symbols, interval):
+            universe = analyze_universe({key: symbols[key]}, {key: data}, interval)
+            row_hashes.update(universe.row_hashes())
+            for row in universe.rows():
+                rows[row["key"]] = row
+                yield _sse("row", row)
+        yield _sse("done", _stream_done(scope, symbols, rows, row_hashes, len(all_symbols)))
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def api_updates(request: Request) -> Response:
+    """Long-lived SSE stream of changed overview rows (see ``app.api_updates``)."""
+    interval = request.query_params.get("interval", DEFAULT_INTERVAL)
+    category = request.query_params.get("category", "all")
+    live = prefetch.is_running(interval)
+    subscription = updates.subscribe_async(f"{interval}:{category}") if live else None
+
+    async def generate():
+        yield _sse("hello", {"live": live, "interval": interval, "category": category})
+        if subscription is None:
+            return
+        try:
+            while True:
+                message = await subscription.get(timeout=UPDATES_HEARTBEAT)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while await subscription.get(timeout=0) is not None:
+                        pass
+                    yield _sse("resync", {})
+                elif message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield message
+        finally:
+            subscription.close()
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def api_cache_stats(request: Request) -> Response:
+    """Market data cache hit/miss counters."""
+    return JSONResponse(cache_stats())
+
+
+async def api_metrics(request: Request) -> Response:
+    """Stage latencies, scan/screener counters and cache stats for Prometheus."""
+    return Response(metrics.REGISTRY.render(), headers={"Content-Type": metrics.CONTENT_TYPE})
+
+
+def _endpoint(path: str) -> str:
+    """Route label for a request path, named like Flask's URL rules."""
+    if path in _ROUTE_PATHS:
+        return path
+    if path.startswith("/static/"):
+        return "/static/<path:filename>"
+    return "unmatched"
+
+
+class _TimingMiddleware:
+    """Record request latency and answer opted-in requests with Server-Timing.
+
+    Mirrors the Flask app's before/after request hooks. A plain ASGI
+    middleware that only watches ``http.response.start``, so streamed
+    (SSE) responses pass through unbuffered and cancellation reaches the
+    route. Latency is time to headers, as in Flask.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        trace_value = Headers(scope=scope).get(TRACE_HEADER)
+        token = metrics.start_trace() if trace_value is not None and trace_value != "0" else None
+        trace = metrics.current_trace()
+
+        async def send_timed(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                http_request_seconds.observe(
+                    elapsed, endpoint=_endpoint(scope["path"]), method=scope["method"], status=message["status"]
+                )
+                if token is not None:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", metrics.server_timing([*trace, ("total", elapsed)])
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            if token is not None:
+                metrics.end_trace(token)
+
+
+@asynccontextmanager
+async def _lifespan(app: Starlette):
+    yield
+    await async_collector.aclose()
+
+
+_ROUTES = [
+    Route("/", index),
+    Route("/api/analyze", api_analyze),
+    Route("/api/analyze/multi", api_analyze_multi),
+    Route("/api/overview", api_overview),
+    Route("/api/overview/stream", api_overview_stream),
+    Route("/api/updates", api_updates),
+    Route("/api/cache/stats", api_cache_stats),
+    Route("/metrics", api_metrics),
+]
+_ROUTE_PATHS = frozenset(route.path for route in _ROUTES)
+
+
+def create_asgi_app() -> Starlette:
+    """Application factory for the ASGI server."""
+    logging.basicConfig(level=logging.INFO)
+    return Starlette(
+        routes=[
+            *_ROUTES,
+            Mount("/static", app=StaticFiles(directory=flask_app.static_folder), name="static"),
+        ],
+        middleware=[Middleware(_TimingMiddleware)],
+        lifespan=_lifespan,
+    )
@@ -0,0 +1,85 @@
+"""Content hashing and delta encoding for JSON API responses.
+
+Overview responses carry a version token (also used as the ETag) derived
+from the hashes of their rows. Clients that send a previous token get
+only the rows that changed since that version.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from src.service.hashing import content_hash
+
+
+class OverviewVersions:
+    """Recent row-hash sets per scope, used to answer delta requests.
+
+    A scope is one (interval, category) view of the overview. Only the
+    most recent ``max_versions`` versions across all scopes are kept;
+    requests against an evicted version get a full response.
+    """
+
+    def __init__(self, max_versions: int = 256):
+        self.max_versions = max_versions
+        self._versions: OrderedDict[tuple[str, str], dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        scope: str,
+        rows: list[dict],
+        row_hashes: dict[str, str] | None = None,
+    ) -> tuple[str, dict[str, str]]:
+        """Hash ``rows`` and remember them. Returns (version, row hashes).
+
+        ``row_hashes`` skips the hashing when the caller already has the
+        key -> ``content_hash(row)`` map (e.g. from a ``UniverseSnapshot``).
+        """
+        if row_hashes is None:
+            row_hashes = {row["key"]: content_hash(row) for row in rows}
+        version = content_hash(list(row_hashes.items()))
+        with self._lock:
+            self._versions[(scope, version)] = row_hashes
+            self._versions.move_to_end((scope, version))
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+        return version, row_hashes
+
+    def delta(
+        self,
+        scope: str,
+        since: str,
+        rows: list[dict],
+        row_hashes: dict[str, str],
+    ) -> tuple[list[dict], list[str]] | None:
+        """Rows changed and keys removed since version ``since``.
+
+        Returns None when ``since`` is unknown for this scope.
+        """
+        with self._lock:
+            previous = self._versions.get((scope, since))
+        if previous is None:
+            return None
+        changed = [row for row in rows if previous.get(row["key"]) != row_hashes[row["key"]]]
+        removed = [key for key in previous if key not in row_hashes]
+        return changed, removed
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches unquoted ``etag``.
+
+    Uses weak comparison, as HTTP specifies for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
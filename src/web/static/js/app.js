@@ -14,8 +14,17 @@ document.addEventListener("DOMContentLoaded", () => {
 // ── State ──
 let currentCategory = "all";
 let autoRefreshInterval = null;
+let updatesStream = null;
+// The overview on screen: its query, total row count, the pages fetched
+// so far (page number -> { version, rows }) and the first page's stream
+let overviewView = null;
 let tvWidget = null;
 
+// Rows per /api/overview page request
+const OVERVIEW_PAGE_SIZE = 60;
+// Card rows rendered above and below the visible part of the grid
+const OVERVIEW_OVERSCAN_ROWS = 2;
+
 // ── Clock ──
 function initClock() {
   const el = document.getElementById("current-time");
@@ -45,24 +54,118 @@ function initCategoryTabs() {
       tabs.forEach((t) => t.classList.remove("active"));
       tab.classList.add("active");
       currentCategory = tab.dataset.category;
+      if (updatesStream) subscribeUpdates();
     });
   });
+
+  const intervalSelect = document.getElementById("interval-select");
+  if (intervalSelect) {
+    intervalSelect.addEventListener("change", () => {
+      if (updatesStream) subscribeUpdates();
+    });
+  }
+
+  // Sorting and filtering are done by the server; reload from the top
+  document.querySelectorAll("#overview-filters select").forEach((select) => {
+    select.addEventListener("change", () => {
+      if (overviewView) loadOverview();
+    });
+  });
+
+  const viewport = document.getElementById("cards-viewport");
+  if (viewport) {
+    let frame = null;
+    const schedule = () => {
+      if (frame === null) {
+        frame = requestAnimationFrame(() => {
+          frame = null;
+          renderVisibleCards();
+        });
+      }
+    };
+    viewport.addEventListener("scroll", schedule, { passive: true });
+    window.addEventListener("resize", () => {
+      if (overviewView) overviewView.rowHeight = null;
+      schedule();
+    });
+  }
 }
 
 // ── Auto Refresh ──
+// Subscribes to server-pushed changes; falls back to 60s polling when the
+// server has no background refresh loop or the browser lacks EventSource.
 function toggleAutoRefresh() {
   const btn = document.getElementById("auto-refresh-btn");
-  if (autoRefreshInterval) {
-    clearInterval(autoRefreshInterval);
-    autoRefreshInterval = null;
+  if (autoRefreshInterval || updatesStream) {
+    stopAutoRefresh();
     btn.classList.remove("active");
   } else {
     loadOverview();
-    autoRefreshInterval = setInterval(loadOverview, 60000);
+    subscribeUpdates();
     btn.classList.add("active");
   }
 }
 
+function stopAutoRefresh() {
+  if (autoRefreshInterval) {
+    clearInterval(autoRefreshInterval);
+    autoRefreshInterval = null;
+  }
+  if (updatesStream) {
+    updatesStream.close();
+    updatesStream = null;
+  }
+}
+
+function startPolling() {
+  if (!autoRefreshInterval) {
+    autoRefreshInterval = setInterval(loadOverview, 60000);
+  }
+}
+
+function subscribeUpdates() {
+  stopAutoRefresh();
+  if (typeof EventSource === "undefined") {
+    startPolling();
+    return;
+  }
+
+  const interval = document.getElementById("interval-select").value;
+  const source = new EventSource(
+    `/api/updates?category=${encodeURIComponent(currentCategory)}&interval=${encodeURIComponent(interval)}`
+  );
+  updatesStream = source;
+
+  source.addEventListener("hello", (e) => {
+    if (!JSON.parse(e.data).live) {
+      source.close();
+      updatesStream = null;
+      startPolling();
+    }
+  });
+  source.addEventListener("update", (e) => applyOverviewUpdate(JSON.parse(e.data), interval));
+  source.addEventListener("resync", () => loadOverview());
+}
+
+// Pushed changes: patch rows already on screen in place. Sorted or
+// filtered views, and removals, can move rows between pages, so those
+// re-check the pages in view instead.
+function applyOverviewUpdate(update, interval) {
+  const view = overviewView;
+  if (!view || view.interval !== interval || view.total === null) return;
+
+  if (view.query || update.removed.length > 0) {
+    refreshOverview();
+    return;
+  }
+  const changed = new Map(update.changed.map((item) => [item.key, item]));
+  view.pages.forEach((page) => {
+    page.rows = page.rows.map((item) => changed.get(item.key) || item);
+  });
+  renderVisibleCards(true);
+  updateLastUpdate();
+}
+
 // ── TradingView Chart Widget ──
 function initTradingViewChart() {
   const symbolSelect = document.getElementById("chart-symbol-select");
@@ -224,73 +327,320 @@ function initEconomicCalendarWidget() {
 // API Calls
 // ═══════════════════════════════════════════════════════════
 
-async function loadOverview() {
+// Query string of the sort and filter controls ("" when all are unset)
+function overviewQuery() {
+  const params = new URLSearchParams();
+  const controls = {
+    sort: "overview-sort",
+    direction: "overview-direction",
+    trend: "overview-trend",
+    min_confidence: "overview-confidence",
+  };
+  Object.entries(controls).forEach(([param, id]) => {
+    const el = document.getElementById(id);
+    if (el && el.value) params.set(param, el.value);
+  });
+  return params.toString();
+}
+
+function overviewPageUrl(view, page, since = null, path = "/api/overview") {
+  const params = new URLSearchParams(view.query);
+  params.set("category", view.category);
+  params.set("interval", view.interval);
+  params.set("limit", OVERVIEW_PAGE_SIZE);
+  params.set("offset", page * OVERVIEW_PAGE_SIZE);
+  if (since) params.set("since", since);
+  return `${path}?${params}`;
+}
+
+// Start a new overview: only the pages that scroll into view are fetched
+function loadOverview() {
   const interval = document.getElementById("interval-select").value;
+  const query = overviewQuery();
+  const scope = `${interval}:${currentCategory}:${query}`;
+
+  // Same view already on screen: re-check the pages in view
+  if (overviewView && overviewView.scope === scope && overviewView.total !== null) {
+    return refreshOverview();
+  }
+
   const loading = document.getElementById("loading");
   const grid = document.getElementById("market-grid");
-  const cardsGrid = document.getElementById("cards-grid");
   const summaryCards = document.getElementById("summary-cards");
 
+  if (overviewView && overviewView.stream) overviewView.stream.close();
+  overviewView = {
+    scope,
+    interval,
+    category: currentCategory,
+    query,
+    total: null,
+    pages: new Map(),
+    pending: new Set(),
+    rowHeight: null,
+    rendered: null,
+    stream: null,
+  };
+  document.getElementById("cards-viewport").scrollTop = 0;
+
   loading.style.display = "flex";
   grid.style.display = "none";
   summaryCards.style.display = "none";
+  if (query || typeof EventSource === "undefined") {
+    return fetchOverviewPage(overviewView, 0);
+  }
+  return streamOverviewPage(overviewView, 0);
+}
 
-  try {
-    const resp = await fetch(
-      `/api/overview?category=${encodeURIComponent(currentCategory)}&interval=${encodeURIComponent(interval)}`
-    );
-    const data = await resp.json();
+// Plain category view: render each card of the page as the server
+// streams its row, then put the page in /api/overview order
+function streamOverviewPage(view, page) {
+  view.pending.add(page);
+  const source = new EventSource(overviewPageUrl(view, page, null, "/api/overview/stream"));
+  view.stream = source;
+  const streamed = { version: null, rows: [] };
+  const counts = { UP: 0, NEUTRAL: 0, DOWN: 0 };
+  let renderQueued = false;
+
+  function finish() {
+    source.close();
+    if (view.stream === source) view.stream = null;
+    view.pending.delete(page);
+    if (view === overviewView) document.getElementById("loading").style.display = "none";
+  }
 
-    if (!resp.ok) {
-      throw new Error(data.error || "Failed to load data");
-    }
+  source.addEventListener("start", (e) => {
+    if (view !== overviewView) return finish();
+    view.total = JSON.parse(e.data).total;
+    view.pages.set(page, streamed);
+    document.getElementById("loading").style.display = "none";
+    document.getElementById("market-grid").style.display = "block";
+    showOverviewSummary(counts, view.total);
+    renderVisibleCards(true);
+  });
 
-    if (data.results.length === 0) {
-      cardsGrid.innerHTML = `<div class="loading-content"><p class="loading-text">데이터가 없습니다.</p></div>`;
-      grid.style.display = "block";
-      return;
+  source.addEventListener("row", (e) => {
+    if (view !== overviewView) return finish();
+    const item = JSON.parse(e.data);
+    streamed.rows.push(item);
+    counts[item.direction in counts ? item.direction : "NEUTRAL"]++;
+    // One render per frame however fast rows arrive
+    if (!renderQueued) {
+      renderQueued = true;
+      requestAnimationFrame(() => {
+        renderQueued = false;
+        if (view !== overviewView) return;
+        showOverviewSummary(counts, view.total);
+        renderVisibleCards(true);
+      });
     }
+  });
 
-    // Update summary counts
-    let bullish = 0,
-      bearish = 0,
-      neutral = 0;
-    data.results.forEach((item) => {
-      if (item.direction === "UP") bullish++;
-      else if (item.direction === "DOWN") bearish++;
-      else neutral++;
-    });
+  source.addEventListener("done", (e) => {
+    finish();
+    if (view !== overviewView) return;
+    const done = JSON.parse(e.data);
+    const byKey = new Map(streamed.rows.map((item) => [item.key, item]));
+    streamed.rows = done.keys.map((key) => byKey.get(key)).filter(Boolean);
+    streamed.version = done.version;
+    view.total = done.total;
+    showOverviewSummary(done.counts, done.total);
+    renderVisibleCards(true);
+    updateLastUpdate();
+  });
 
-    document.getElementById("bullish-count").textContent = bullish;
-    document.getElementById("neutral-count").textContent = neutral;
-    document.getElementById("bearish-count").textContent = bearish;
-    document.getElementById("total-count").textContent = data.results.length;
-    summaryCards.style.display = "grid";
+  // Refused or cut off: load the page the plain way
+  source.onerror = () => {
+    finish();
+    if (view !== overviewView) return;
+    view.pages.delete(page);
+    fetchOverviewPage(view, page);
+  };
+}
 
-    // Update last update time
-    const now = new Date();
-    document.getElementById("last-update").textContent =
-      `마지막 업데이트: ${now.toLocaleTimeString("ko-KR")}`;
+// Patch a page with a ``since`` delta. False when rows joined or left
+// the page, which a delta cannot place.
+function patchOverviewPage(known, delta) {
+  const index = new Map(known.rows.map((item, i) => [item.key, i]));
+  if (delta.removed.length > 0 || delta.changed.some((item) => !index.has(item.key))) {
+    return false;
+  }
+  delta.changed.forEach((item) => {
+    known.rows[index.get(item.key)] = item;
+  });
+  known.version = delta.version;
+  return true;
+}
 
-    // Render market cards
-    cardsGrid.innerHTML = data.results.map((item) => renderMarketCard(item)).join("");
+// One /api/overview page request; null when the server answers 304
+async function requestOverviewPage(view, page, known) {
+  const options = { cache: "no-store" };
+  let since = null;
+  if (known && known.version) {
+    options.headers = { "If-None-Match": `"${known.version}"` };
+    // Sorted or filtered pages can reorder, so only plain pages take deltas
+    if (!view.query) since = known.version;
+  }
+  const resp = await fetch(overviewPageUrl(view, page, since), options);
+  if (resp.status === 304) return null;
+  const data = await resp.json();
+  if (!resp.ok) {
+    throw new Error(data.error || "Failed to load data");
+  }
+  return data;
+}
 
-    grid.style.display = "block";
+// Fetch one page; with ``revalidate`` the server answers 304 if it is
+// unchanged, or only the rows that changed since the version we have
+async function fetchOverviewPage(view, page, revalidate = false) {
+  if (view.pending.has(page)) return;
+  view.pending.add(page);
+  const known = revalidate ? view.pages.get(page) : null;
 
-    // Add click handlers
-    cardsGrid.querySelectorAll(".market-card").forEach((card) => {
-      card.addEventListener("click", () => {
-        const symbol = card.dataset.symbol;
-        const name = card.dataset.name;
-        openDetailModal(symbol, name, interval);
+  try {
+    let data = await requestOverviewPage(view, page, known);
+    if (view !== overviewView) return;
+    if (data === null) {
+      updateLastUpdate();
+      return;
+    }
+    if (data.delta && !patchOverviewPage(known, data)) {
+      data = await requestOverviewPage(view, page, null);
+      if (view !== overviewView) return;
+    }
+
+    if (!data.delta) view.pages.set(page, { version: data.version, rows: data.results });
+    const first = view.total === null;
+    if (view.total !== data.total) {
+      // The result grew or shrank: pages past this one are out of step
+      view.pages.forEach((_, p) => {
+        if (p > page) view.pages.delete(p);
       });
-    });
+      view.total = data.total;
+    }
+    showOverviewSummary(data.counts, data.total);
+    if (first) document.getElementById("market-grid").style.display = "block";
+    renderVisibleCards(true);
+    updateLastUpdate();
   } catch (err) {
-    cardsGrid.innerHTML = `<div class="loading-content"><p class="loading-text text-red">오류: ${escapeHtml(err.message)}</p></div>`;
-    grid.style.display = "block";
+    if (view !== overviewView) return;
+    if (view.total === null) {
+      const cardsGrid = document.getElementById("cards-grid");
+      cardsGrid.style.padding = "";
+      cardsGrid.innerHTML = `<div class="loading-content"><p class="loading-text text-red">오류: ${escapeHtml(err.message)}</p></div>`;
+      document.getElementById("market-grid").style.display = "block";
+    }
   } finally {
-    loading.style.display = "none";
+    view.pending.delete(page);
+    if (view === overviewView) document.getElementById("loading").style.display = "none";
+  }
+}
+
+// Re-check the pages in view; pages scrolled out of view are dropped and
+// fetched again when they come back
+function refreshOverview() {
+  const view = overviewView;
+  if (!view || view.total === null) return loadOverview();
+  const [start, end] = visibleRange(view);
+  const first = Math.floor(start / OVERVIEW_PAGE_SIZE);
+  const last = Math.max(first, Math.ceil(end / OVERVIEW_PAGE_SIZE) - 1);
+  view.pages.forEach((_, page) => {
+    if (page < first || page > last) view.pages.delete(page);
+  });
+  const requests = [];
+  for (let page = first; page <= last; page++) requests.push(fetchOverviewPage(view, page, true));
+  return Promise.all(requests);
+}
+
+function showOverviewSummary(counts, total) {
+  counts = counts || {};
+  updateSummaryCounts(counts.UP || 0, counts.NEUTRAL || 0, counts.DOWN || 0, total);
+  document.getElementById("summary-cards").style.display = "grid";
+}
+
+function gridColumnCount(cardsGrid) {
+  const columns = getComputedStyle(cardsGrid).gridTemplateColumns;
+  return Math.max(1, columns && columns !== "none" ? columns.split(" ").length : 1);
+}
+
+// [start, end) of the row indexes that should be in the DOM
+function visibleRange(view) {
+  const viewport = document.getElementById("cards-viewport");
+  const cardsGrid = document.getElementById("cards-grid");
+  const columns = gridColumnCount(cardsGrid);
+  const rowHeight = view.rowHeight || 180;
+  const firstRow = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - OVERVIEW_OVERSCAN_ROWS);
+  const lastRow = Math.ceil((viewport.scrollTop + viewport.clientHeight) / rowHeight) + OVERVIEW_OVERSCAN_ROWS;
+  return [firstRow * columns, Math.min(view.total || 0, lastRow * columns), columns, rowHeight];
+}
+
+// Render only the cards in (and just around) the viewport; padding on the
+// grid stands in for the rest so the scrollbar covers the whole result
+function renderVisibleCards(force = false) {
+  const view = overviewView;
+  if (!view || view.total === null) return;
+  const cardsGrid = document.getElementById("cards-grid");
+
+  if (view.total === 0) {
+    cardsGrid.style.padding = "";
+    cardsGrid.innerHTML = `<div class="loading-content"><p class="loading-text">데이터가 없습니다.</p></div>`;
+    view.rendered = null;
+    return;
+  }
+
+  const [start, end, columns, rowHeight] = visibleRange(view);
+  const key = `${start}:${end}:${columns}`;
+  if (!force && view.rendered === key) return;
+  view.rendered = key;
+
+  const missing = new Set();
+  let html = "";
+  for (let i = start; i < end; i++) {
+    const page = Math.floor(i / OVERVIEW_PAGE_SIZE);
+    const rows = view.pages.get(page);
+    const item = rows && rows.rows[i - page * OVERVIEW_PAGE_SIZE];
+    if (item) {
+      html += renderMarketCard(item);
+    } else {
+      if (!rows) missing.add(page);
+      html += renderPlaceholderCard();
+    }
+  }
+
+  const totalRows = Math.ceil(view.total / columns);
+  cardsGrid.style.paddingTop = `${(start / columns) * rowHeight}px`;
+  cardsGrid.style.paddingBottom = `${Math.max(0, totalRows - Math.ceil(end / columns)) * rowHeight}px`;
+  cardsGrid.innerHTML = html;
+  cardsGrid.querySelectorAll(".market-card:not(.card-placeholder)").forEach((card) => bindCardClick(card, view.interval));
+
+  // Row height (card plus gap) is measured once per view and resize
+  const measured = cardsGrid.querySelector(".market-card:not(.card-placeholder)");
+  if (!view.rowHeight && measured) {
+    const gap = parseFloat(getComputedStyle(cardsGrid).rowGap) || 0;
+    view.rowHeight = measured.offsetHeight + gap;
+    if (view.rowHeight !== rowHeight) renderVisibleCards(true);
   }
+
+  missing.forEach((page) => fetchOverviewPage(view, page));
+}
+
+function updateSummaryCounts(bullish, neutral, bearish, total) {
+  document.getElementById("bullish-count").textContent = bullish;
+  document.getElementById("neutral-count").textContent = neutral;
+  document.getElementById("bearish-count").textContent = bearish;
+  document.getElementById("total-count").textContent = total;
+}
+
+function updateLastUpdate() {
+  const now = new Date();
+  document.getElementById("last-update").textContent =
+    `마지막 업데이트: ${now.toLocaleTimeString("ko-KR")}`;
+}
+
+function bindCardClick(card, interval) {
+  card.addEventListener("click", () => {
+    openDetailModal(card.dataset.symbol, card.dataset.name, interval);
+  });
 }
 
 async function analyzeSymbol() {
@@ -332,15 +682,18 @@ async function openDetailModal(tvSymbol, name, interval) {
   modal.style.display = "flex";
 
   try {
+    // Every timeframe in one request; the selected one fills the detail view
     const resp = await fetch(
-      `/api/analyze?symbol=${encodeURIComponent(tvSymbol)}&interval=${encodeURIComponent(interval)}&name=${encodeURIComponent(name)}`
+      `/api/analyze/multi?symbol=${encodeURIComponent(tvSymbol)}&name=${encodeURIComponent(name)}`
     );
-    const data = await resp.json();
+    const multi = await resp.json();
 
-    if (!resp.ok) throw new Error(data.error || "Analysis failed");
+    if (!resp.ok) throw new Error(multi.error || "Analysis failed");
+    const data = multi.timeframes[interval];
+    if (!data) throw new Error(`${interval} 데이터를 가져오지 못했습니다`);
 
     title.textContent = `${data.analysis.name} (${data.analysis.symbol})`;
-    body.innerHTML = renderModalContent(data);
+    body.innerHTML = renderModalContent(data) + renderTimeframeSection(multi, interval);
   } catch (err) {
     body.innerHTML = `<p class="text-red" style="padding:2rem;text-align:center">분석 실패: ${escapeHtml(err.message)}</p>`;
   }
@@ -387,7 +740,7 @@ function renderMarketCard(item) {
   const trendText = getTrendText(item.trend);
 
   return `
-    <div class="market-card ${cardCls}" data-symbol="${escapeAttr(item.symbol)}" data-name="${escapeAttr(item.name)}">
+    <div class="market-card ${cardCls}" data-key="${escapeAttr(item.key)}" data-symbol="${escapeAttr(item.symbol)}" data-name="${escapeAttr(item.name)}">
       <div class="card-top-row">
         <div class="card-symbol-info">
           <span class="card-symbol">${escapeHtml(item.key)}</span>
@@ -419,6 +772,27 @@ function renderMarketCard(item) {
     </div>`;
 }
 
+// Stand-in for a card whose page is still loading, sized like a real card
+function renderPlaceholderCard() {
+  return `
+    <div class="market-card card-flat card-placeholder">
+      <div class="card-top-row">
+        <div class="card-symbol-info">
+          <span class="card-symbol">···</span>
+          <span class="card-name">&nbsp;</span>
+        </div>
+      </div>
+      <div class="card-middle-row">
+        <span class="card-price">—</span>
+      </div>
+      <div class="card-bottom-row">
+        <div class="card-metric"><span class="metric-label">&nbsp;</span></div>
+        <div class="card-metric"><span class="metric-label">&nbsp;</span></div>
+        <div class="card-metric"><span class="metric-label">&nbsp;</span></div>
+      </div>
+    </div>`;
+}
+
 function renderModalContent(data) {
   const { analysis: a, forecast: f } = data;
   const changeCls = a.change_pct >= 0 ? "text-green" : "text-red";
@@ -536,6 +910,35 @@ function renderModalContent(data) {
   return html;
 }
 
+function renderTimeframeSection(multi, current) {
+  const c = multi.consensus;
+  let html = `
+    <div class="modal-section">
+      <div class="modal-section-title">시간대별 분석</div>
+      <div class="modal-row">
+        <span class="modal-label">종합 (가중)</span>
+        <span class="modal-value">${getSummaryBadge(c.recommendation)} ${c.score.toFixed(2)} · 일치 ${(c.agreement * 100).toFixed(0)}%</span>
+      </div>
+      <div class="modal-row">
+        <span class="modal-label">추세 (가중)</span>
+        <span class="modal-value">${getTrendText(c.trend)}</span>
+      </div>`;
+  for (const interval of multi.intervals) {
+    const { analysis: a, forecast: f } = multi.timeframes[interval];
+    const label = interval === current ? `<strong>${escapeHtml(interval)}</strong>` : escapeHtml(interval);
+    html += `
+      <div class="modal-row">
+        <span class="modal-label">${label}</span>
+        <span class="modal-value">${getSummaryBadge(a.summary)} ${getTrendText(a.trend)} ${f.direction_emoji}</span>
+      </div>`;
+  }
+  if (multi.failed.length > 0) {
+    html += `<div class="modal-row"><span class="modal-label">실패</span><span class="modal-value text-muted">${escapeHtml(multi.failed.join(", "))}</span></div>`;
+  }
+  html += `</div>`;
+  return html;
+}
+
 function renderAnalysisDetail(data) {
   const { analysis: a, forecast: f } = data;
 
@@ -4,13 +4,17 @@ Streamlit Cloud 배포용 엔트리포인트.
 실행: streamlit run streamlit_app.py
 """
 
+import time
+
 import streamlit as st
 import pandas as pd
 
-from src.config import SYMBOLS, INTERVALS, DEFAULT_INTERVAL
-from src.data.collector import fetch_analysis, fetch_multiple
-from src.analysis.technical import analyze, analyze_multiple
-from src.forecast.predictor import predict, predict_multiple
+from src.config import INTERVALS, DEFAULT_INTERVAL
+from src.data.collector import fetch_analysis
+from src.data.symbols import get_registry, symbols_for_category
+from src.analysis.technical import analyze
+from src.forecast.predictor import predict
+from src.service.overview import overview_cache
 
 # ─── 페이지 설정 ───
 st.set_page_config(
@@ -291,15 +295,6 @@ def confidence_bar(confidence):
     '''
 
 
-def get_symbols_for_category(category):
-    if category == "all":
-        all_syms = {}
-        for cat_syms in SYMBOLS.values():
-            all_syms.update(cat_syms)
-        return all_syms
-    return SYMBOLS.get(category, {})
-
-
 # ─── 사이드바 ───
 
 with st.sidebar:
@@ -310,8 +305,8 @@ with st.sidebar:
 
     category = st.selectbox(
         "카테고리",
-        options=list(CATEGORY_LABELS.keys()),
-        format_func=lambda x: CATEGORY_LABELS[x],
+        options=["all", *get_registry().categories],
+        format_func=lambda x: CATEGORY_LABELS.get(x, x),
         index=0,
     )
 
@@ -330,9 +325,7 @@ with st.sidebar:
 
     # 개별 종목 분석
     st.markdown("#### 개별 종목 분석")
-    all_symbols_flat = {}
-    for cat_syms in SYMBOLS.values():
-        all_symbols_flat.update(cat_syms)
+    all_symbols_flat = get_registry().symbols()
 
     symbol_options = {f"{name} ({key})": key for key, (_, name) in all_symbols_flat.items()}
     selected_label = st.selectbox("종목 선택", options=list(symbol_options.keys()))
@@ -360,58 +353,45 @@ st.markdown("""
 
 # ─── 시장 개요 분석 ───
 
+# 결과는 세션이 아니라 프로세스 전체 캐시(카테고리·시간대별)에 보관하고,
+# 세션에는 어떤 카테고리/시간대를 보고 있는지만 저장한다
 if analyze_btn:
-    symbols = get_symbols_for_category(category)
-
-    if not symbols:
+    if not symbols_for_category(category):
         st.warning("해당 카테고리에 종목이 없습니다.")
     else:
-        progress_bar = st.progress(0, text="시장 데이터를 수집하고 있습니다...")
-
-        try:
-            # 데이터 수집
-            market_data = fetch_multiple(symbols, interval)
-            progress_bar.progress(40, text="기술적 분석 중...")
-
-            if not market_data:
-                progress_bar.empty()
-                st.error("데이터를 가져올 수 없습니다. 네트워크 연결을 확인하세요.")
-            else:
-                # 실패한 종목 알림
-                failed = set(symbols.keys()) - set(market_data.keys())
-                if failed:
-                    st.warning(f"일부 종목 데이터 수집 실패: {', '.join(failed)}")
-
-                # 분석
-                analyses = analyze_multiple(market_data)
-                progress_bar.progress(70, text="예측 생성 중...")
-
-                # 예측
-                forecasts = predict_multiple(market_data)
-                progress_bar.progress(100, text="완료!")
-                progress_bar.empty()
-
-                # 결과를 세션에 저장
-                st.session_state["results"] = {
-                    "analyses": analyses,
-                    "forecasts": forecasts,
-                    "category": category,
-                    "interval": interval,
-                }
-        except Exception as e:
-            progress_bar.empty()
-            st.error(f"분석 중 오류가 발생했습니다: {e}")
+        st.session_state["results"] = {"category": category, "interval": interval}
 
+overview = None
 if "results" in st.session_state:
     res = st.session_state["results"]
-    analyses = res["analyses"]
-    forecasts = res["forecasts"]
+    try:
+        with st.spinner("시장 데이터를 수집하고 있습니다..."):
+            overview = overview_cache.get(res["category"], res["interval"])
+    except Exception as e:
+        st.error(f"분석 중 오류가 발생했습니다: {e}")
+    else:
+        if overview is None:
+            st.error("데이터를 가져올 수 없습니다. 네트워크 연결을 확인하세요.")
+
+if overview is not None:
+    universe = overview.universe
+    rows = universe.rows()
+
+    # 실패한 종목 알림
+    if overview.failed:
+        st.warning(f"일부 종목 데이터 수집 실패: {', '.join(overview.failed)}")
+    st.caption(
+        f"{CATEGORY_LABELS.get(overview.category, overview.category)} · "
+        f"{INTERVAL_LABELS.get(overview.interval, overview.interval)} · "
+        f"업데이트 {time.strftime('%H:%M:%S', time.localtime(overview.updated_at))}"
+    )
 
     # ── 요약 카드 ──
-    bullish = sum(1 for f in forecasts.values() if f.direction == "UP")
-    bearish = sum(1 for f in forecasts.values() if f.direction == "DOWN")
-    neutral = sum(1 for f in forecasts.values() if f.direction == "NEUTRAL")
-    total = len(forecasts)
+    directions = universe.columns["direction"]
+    bullish = int((directions == "UP").sum())
+    bearish = int((directions == "DOWN").sum())
+    neutral = int((directions == "NEUTRAL").sum())
+    total = len(universe)
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("상승 예측", f"{bullish}개", delta=f"{bullish/total*100:.0f}%" if total else "0%")
@@ -426,28 +406,27 @@ if "results" in st.session_state:
 
     with tab_cards:
         cols = st.columns(3)
-        for i, key in enumerate(analyses):
-            a = analyses[key]
-            f = forecasts[key]
-            change_cls = "text-green" if a.change_pct >= 0 else "text-red"
-            change_prefix = "+" if a.change_pct >= 0 else ""
-            dir_badge = direction_badge(f.direction, f.direction_kr, f.direction_emoji)
-            sum_badge = summary_badge(a.summary_recommendation)
-            conf_bar = confidence_bar(f.confidence)
-            trend_text = TREND_KR.get(a.trend, a.trend)
+        for i, row in enumerate(rows):
+            key = row["key"]
+            change_cls = "text-green" if row["change_pct"] >= 0 else "text-red"
+            change_prefix = "+" if row["change_pct"] >= 0 else ""
+            dir_badge = direction_badge(row["direction"], row["direction_kr"], row["direction_emoji"])
+            sum_badge = summary_badge(row["summary"])
+            conf_bar = confidence_bar(row["confidence"])
+            trend_text = TREND_KR.get(row["trend"], row["trend"])
 
             card_html = f'''
             <div class="eco-card">
                 <div class="eco-card-header">
                     <div>
                         <div class="eco-card-symbol">{key}</div>
-                        <div class="eco-card-name">{a.name}</div>
+                        <div class="eco-card-name">{row["name"]}</div>
                     </div>
                     {dir_badge}
                 </div>
-                <div class="eco-card-price">{fmt_number(a.price)}</div>
+                <div class="eco-card-price">{fmt_number(row["price"])}</div>
                 <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.8rem">
-                    <span class="{change_cls}" style="font-weight:600">{change_prefix}{a.change_pct:.2f}%</span>
+                    <span class="{change_cls}" style="font-weight:600">{change_prefix}{row["change_pct"]:.2f}%</span>
                     {sum_badge}
                 </div>
                 <hr class="eco-divider">
@@ -462,7 +441,7 @@ if "results" in st.session_state:
                     </div>
                     <div style="flex:1">
                         <div style="font-size:0.7rem;color:#64748b;text-transform:uppercase;letter-spacing:0.05em">시그널</div>
-                        <div style="font-size:0.85rem;font-weight:600;margin-top:0.3rem">{f.signal_strength}</div>
+                        <div style="font-size:0.85rem;font-weight:600;margin-top:0.3rem">{row["signal_strength"]}</div>
                     </div>
                 </div>
             </div>
@@ -470,22 +449,18 @@ if "results" in st.session_state:
             cols[i % 3].markdown(card_html, unsafe_allow_html=True)
 
     with tab_table:
-        table_data = []
-        for key in analyses:
-            a = analyses[key]
-            f = forecasts[key]
-            table_data.append({
-                "종목": key,
-                "이름": a.name,
-                "가격": fmt_number(a.price),
-                "변동률": f"{a.change_pct:+.2f}%",
-                "분석": RECOMMENDATION_KR.get(a.summary_recommendation, a.summary_recommendation),
-                "추세": TREND_KR.get(a.trend, a.trend),
-                "예측": f"{f.direction_emoji} {f.direction_kr}",
-                "신뢰도": f"{f.confidence*100:.0f}%",
-                "시그널": f.signal_strength,
-            })
-        df = pd.DataFrame(table_data)
+        frame = universe.to_pandas()
+        df = pd.DataFrame({
+            "종목": frame.index,
+            "이름": frame["name"].to_numpy(),
+            "가격": frame["price"].map(fmt_number).to_numpy(),
+            "변동률": frame["change_pct"].map("{:+.2f}%".format).to_numpy(),
+            "분석": frame["summary"].map(lambda rec: RECOMMENDATION_KR.get(rec, rec)).to_numpy(),
+            "추세": frame["trend"].map(lambda trend: TREND_KR.get(trend, trend)).to_numpy(),
+            "예측": [f"{row['direction_emoji']} {row['direction_kr']}" for row in rows],
+            "신뢰도": (frame["confidence"] * 100).map("{:.0f}%".format).to_numpy(),
+            "시그널": frame["signal_strength"].to_numpy(),
+        })
         st.dataframe(df, use_container_width=True, hide_index=True)
 
 
@@ -494,18 +469,21 @@ if "results" in st.session_state:
 if detail_btn and selected_key:
     tv_symbol, display_name = all_symbols_flat[selected_key]
 
-    try:
-        with st.spinner(f"{display_name} 분석 중..."):
-            data = fetch_analysis(tv_symbol, interval, display_name)
-    except Exception as e:
-        st.error(f"{display_name} 데이터 수집 실패: {e}")
-        data = None
+    # 시장 개요에서 TTL 이내에 수집한 데이터가 있으면 다시 요청하지 않는다
+    data = overview_cache.market_data(interval, selected_key)
+    if data is None:
+        try:
+            with st.spinner(f"{display_name} 분석 중..."):
+                data = fetch_analysis(tv_symbol, interval, display_name)
+        except Exception as e:
+            st.error(f"{display_name} 데이터 수집 실패: {e}")
+            data = None
 
     if data is None:
         st.error(f"{display_name} 데이터를 가져올 수 없습니다. 종목/시간대를 변경해 보세요.")
     else:
         a = analyze(data)
-        f = predict(data)
+        f = predict(data, interval)
 
         st.markdown("---")
         st.markdown(f"## 📊 {a.name} ({a.symbol}) 상세 분석")
@@ -585,10 +563,7 @@ tv_tab1, tv_tab2, tv_tab3 = st.tabs(["📈 실시간 차트", "🌍 글로벌 
 
 with tv_tab1:
     # 차트 종목 선택
-    chart_options = {}
-    for cat_syms in SYMBOLS.values():
-        for key, (tv_sym, name) in cat_syms.items():
-            chart_options[f"{name} ({key})"] = tv_sym
+    chart_options = {f"{name} ({key})": tv_sym for key, (tv_sym, name) in get_registry().symbols().items()}
 
     chart_label = st.selectbox("차트 종목", list(chart_options.keys()), key="chart_select")
     chart_symbol = chart_options[chart_label]